@@ -3,23 +3,315 @@ Quick analysis of evaluation results to help with manual scoring.
 
 Shows key insights about similarity scores, chunk sizes, and document relevance.
 
+Parsed statistics are cached next to the results file (<file>.stats.pkl) and
+reused while the results file is unchanged.
+
+If the JSON Lines copy of the results (<file>.ndjson, written by
+evaluate_queries.py) exists, results are streamed from it line by line.
+
 Usage:
     python scripts/analyze_results.py evaluation/results_20251020_232926.json
+    python scripts/analyze_results.py evaluation/results_20251020_232926.ndjson
+    python scripts/analyze_results.py evaluation/results_20251020_232926.json --no-cache
 """
 
 import sys
+import os
 import json
-from collections import defaultdict
+import heapq
+import pickle
+import argparse
+from collections import Counter
 from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
+import numpy as np
+
+# Try to import ijson for streaming parsing (falls back to json.load)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Try to import orjson for faster whole-file parsing (falls back to json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Bump when the structure of the cached statistics changes
+CACHE_VERSION = 3
+
+# Bucket lower bounds for summarize_values()
+# Similarity: weak (<0.4) | moderate (0.4-0.6) | good (0.6-0.8) | excellent (>0.8)
+SIMILARITY_EDGES = (0.4, 0.6, float(np.nextafter(0.8, 1.0)))
+# Chunk length: very short (<100) | short (100-300) | medium (300-600) | long (600+)
+CHUNK_LENGTH_EDGES = (100, 300, 600)
 
-def analyze_results(results_file: str):
-    """Analyze evaluation results and print insights"""
+
+def _load_json(results_file: str) -> Dict[str, Any]:
+    """Parse a whole results file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        with open(results_file, 'rb') as f:
+            return orjson.loads(f.read())
 
     with open(results_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        return json.load(f)
+
+
+def load_report_header(results_file: str) -> Dict[str, Any]:
+    """
+    Load the small top-level sections of a results file.
+
+    The report written by evaluate_queries.py places 'summary' and
+    'by_category' before the (large) 'results' array, so with ijson only
+    the beginning of the file is parsed.
+
+    Args:
+        results_file: Path to results JSON file
+
+    Returns:
+        Dict with 'summary' and 'by_category'
+    """
+    if not IJSON_AVAILABLE:
+        data = _load_json(results_file)
+        return {'summary': data['summary'], 'by_category': data['by_category']}
+
+    header = {}
+    for key in ('summary', 'by_category'):
+        with open(results_file, 'rb') as f:
+            header[key] = next(ijson.items(f, key, use_float=True))
+    return header
+
+
+def _loads_line(line: bytes) -> Dict[str, Any]:
+    """Parse one JSON Lines record, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def resolve_report_files(path: str) -> Tuple[str, str]:
+    """
+    Find the report and the file to read results from.
+
+    Args:
+        path: Path to a results JSON file or its .ndjson copy
+
+    Returns:
+        Tuple of (report JSON path, results path); the results path is the
+        .ndjson copy when it exists, otherwise the report itself
+    """
+    report_file = str(Path(path).with_suffix('.json'))
+    lines_file = str(Path(path).with_suffix('.ndjson'))
+    return report_file, lines_file if os.path.exists(lines_file) else report_file
+
+
+def iter_results(results_file: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield query results one at a time.
+
+    .ndjson files are read line by line; for JSON reports ijson is used.
+    Either way only one result object is held in memory at a time.
+
+    Args:
+        results_file: Path to results JSON or JSON Lines file
+
+    Yields:
+        Result dicts from the report's 'results' array
+    """
+    if results_file.endswith('.ndjson'):
+        with open(results_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield _loads_line(line)
+        return
+
+    if not IJSON_AVAILABLE:
+        data = _load_json(results_file)
+        yield from data['results']
+        return
 
-    results = data['results']
+    with open(results_file, 'rb') as f:
+        yield from ijson.items(f, 'results.item', use_float=True)
+
+
+def _push_bounded(heap: List[tuple], item: tuple, k: int) -> None:
+    """Push item onto a min-heap holding at most k items (keeps the k largest)"""
+    if len(heap) < k:
+        heapq.heappush(heap, item)
+    else:
+        heapq.heappushpop(heap, item)
+
+
+def collect_statistics(results_file: str, review_count: int = 5) -> Dict[str, Any]:
+    """
+    Stream the results and collect the values needed for analysis.
+
+    Every accumulator is updated in one traversal of the results. Only the
+    compact per-result values (similarities, chunk lengths, document names)
+    are kept; chunk text is dropped as soon as it is measured.
+
+    Args:
+        results_file: Path to results JSON file
+        review_count: Number of lowest/highest similarity queries to keep
+
+    Returns:
+        Dict with similarity lists, chunk lengths, document counts and
+        low/high similarity query lists
+    """
+    all_similarities = []
+    top1_similarities = []
+    chunk_lengths = []
+    doc_counts = Counter()
+
+    # Bounded heaps; the sequence number keeps ties in file order
+    low_heap = []   # (-sim, -seq, query_id, query): keeps the lowest sims
+    high_heap = []  # (sim, -seq, query_id, query): keeps the highest sims
+
+    for seq, result in enumerate(iter_results(results_file)):
+        if result['status'] != 'success':
+            continue
+
+        for i, res in enumerate(result['results']):
+            sim = res['similarity']
+            all_similarities.append(sim)
+            chunk_lengths.append(len(res['text']))
+            doc_counts[res['document_name']] += 1
+
+            if i == 0:
+                top1_similarities.append(sim)
+                if sim < 0.5:
+                    _push_bounded(low_heap, (-sim, -seq, result['query_id'], result['query']), review_count)
+                if sim > 0.7:
+                    _push_bounded(high_heap, (sim, -seq, result['query_id'], result['query']), review_count)
+
+    return {
+        'all_similarities': all_similarities,
+        'top1_similarities': top1_similarities,
+        'chunk_lengths': chunk_lengths,
+        'doc_counts': doc_counts,
+        'low_sim_queries': [
+            (qid, query, -neg_sim)
+            for neg_sim, _, qid, query in sorted(low_heap, reverse=True)
+        ],
+        'high_sim_queries': [
+            (qid, query, sim)
+            for sim, _, qid, query in sorted(high_heap, reverse=True)
+        ]
+    }
+
+
+def _cache_path(results_file: str) -> str:
+    """Path of the statistics cache for a results file"""
+    return results_file + '.stats.pkl'
+
+
+def _cache_key(report_file: str, lines_file: str) -> Tuple:
+    """Cache key: cache format version, plus path, modification time and size of each file read"""
+    return (CACHE_VERSION,) + tuple(
+        (path, os.path.getmtime(path), os.path.getsize(path))
+        for path in (report_file, lines_file)
+    )
+
+
+def load_cached_statistics(report_file: str, lines_file: str) -> Optional[Dict[str, Any]]:
+    """
+    Load cached header and statistics if the files they were read from are unchanged.
+
+    Args:
+        report_file: Path to results JSON file (header)
+        lines_file: Path the per-query results are read from (the .ndjson copy,
+                    or report_file itself)
+
+    Returns:
+        Dict with 'header' and 'collected', or None if no valid cache exists
+    """
+    try:
+        with open(_cache_path(report_file), 'rb') as f:
+            key, cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+
+    if key != _cache_key(report_file, lines_file):
+        return None
+
+    return cached
+
+
+def save_cached_statistics(report_file: str, lines_file: str, cached: Dict[str, Any]) -> None:
+    """
+    Save header and statistics for reuse by later runs.
+
+    Failure to write the cache is not an error (e.g. read-only directory).
+
+    Args:
+        report_file: Path to results JSON file (header)
+        lines_file: Path the per-query results were read from
+        cached: Dict with 'header' and 'collected'
+    """
+    try:
+        with open(_cache_path(report_file), 'wb') as f:
+            pickle.dump((_cache_key(report_file, lines_file), cached), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+
+def summarize_values(values: List[float], edges: Tuple[float, ...]) -> Dict[str, Any]:
+    """
+    Compute count, min, max, average and bucket counts with NumPy.
+
+    Buckets are assigned with a single searchsorted pass: a value falls in
+    bucket i when it is >= edges[i-1] and < edges[i].
+
+    Args:
+        values: Values to summarize
+        edges: Sorted lower bounds of buckets 1..n (bucket 0 is below edges[0])
+
+    Returns:
+        Dict with count, min, max, avg and buckets
+    """
+    arr = np.asarray(values)
+    n_buckets = len(edges) + 1
+
+    if arr.size == 0:
+        return {'count': 0, 'min': None, 'max': None, 'avg': 0, 'buckets': [0] * n_buckets}
+
+    bucket_ids = np.searchsorted(edges, arr, side='right')
+
+    return {
+        'count': arr.size,
+        'min': arr.min().item(),
+        'max': arr.max().item(),
+        'avg': arr.mean().item(),
+        'buckets': np.bincount(bucket_ids, minlength=n_buckets).tolist()
+    }
+
+
+def analyze_results(results_file: str, use_cache: bool = True):
+    """Analyze evaluation results and print insights"""
+
+    report_file, lines_file = resolve_report_files(results_file)
+
+    cached = load_cached_statistics(report_file, lines_file) if use_cache else None
+
+    if cached is None:
+        cached = {
+            'header': load_report_header(report_file),
+            'collected': collect_statistics(lines_file)
+        }
+        if use_cache:
+            save_cached_statistics(report_file, lines_file, cached)
+
+    data = cached['header']
+    collected = cached['collected']
+
+    sim_stats = summarize_values(collected['all_similarities'], SIMILARITY_EDGES)
+    top1_stats = summarize_values(collected['top1_similarities'], SIMILARITY_EDGES)
+    length_stats = summarize_values(collected['chunk_lengths'], CHUNK_LENGTH_EDGES)
+    doc_counts = collected['doc_counts']
 
     print("\n" + "="*80)
     print("EVALUATION RESULTS ANALYSIS")
@@ -35,95 +327,69 @@ def analyze_results(results_file: str):
     print("SIMILARITY SCORE ANALYSIS")
     print("-"*80)
 
-    all_similarities = []
-    top1_similarities = []
-
-    for result in results:
-        if result['status'] == 'success':
-            for i, res in enumerate(result['results']):
-                all_similarities.append(res['similarity'])
-                if i == 0:
-                    top1_similarities.append(res['similarity'])
-
-    if all_similarities:
-        print(f"\nAll Results:")
-        print(f"  Min: {min(all_similarities):.3f}")
-        print(f"  Max: {max(all_similarities):.3f}")
-        print(f"  Avg: {sum(all_similarities)/len(all_similarities):.3f}")
-
-        # Distribution
-        excellent = len([s for s in all_similarities if s > 0.8])
-        good = len([s for s in all_similarities if 0.6 <= s <= 0.8])
-        moderate = len([s for s in all_similarities if 0.4 <= s < 0.6])
-        weak = len([s for s in all_similarities if s < 0.4])
-
-        print(f"\n  Distribution:")
-        print(f"    Excellent (>0.8): {excellent} ({excellent/len(all_similarities)*100:.1f}%)")
-        print(f"    Good (0.6-0.8):   {good} ({good/len(all_similarities)*100:.1f}%)")
-        print(f"    Moderate (0.4-0.6): {moderate} ({moderate/len(all_similarities)*100:.1f}%)")
-        print(f"    Weak (<0.4):      {weak} ({weak/len(all_similarities)*100:.1f}%)")
-
-    if top1_similarities:
+    if sim_stats['count']:
+        inv = 100.0 / sim_stats['count']
+        weak, moderate, good, excellent = sim_stats['buckets']
+
+        print("\n".join([
+            f"\nAll Results:",
+            f"  Min: {sim_stats['min']:.3f}",
+            f"  Max: {sim_stats['max']:.3f}",
+            f"  Avg: {sim_stats['avg']:.3f}",
+            f"\n  Distribution:",
+            f"    Excellent (>0.8): {excellent} ({excellent*inv:.1f}%)",
+            f"    Good (0.6-0.8):   {good} ({good*inv:.1f}%)",
+            f"    Moderate (0.4-0.6): {moderate} ({moderate*inv:.1f}%)",
+            f"    Weak (<0.4):      {weak} ({weak*inv:.1f}%)",
+        ]))
+
+    if top1_stats['count']:
         print(f"\nTop-1 Results Only:")
-        print(f"  Avg: {sum(top1_similarities)/len(top1_similarities):.3f}")
-        excellent_top1 = len([s for s in top1_similarities if s > 0.8])
-        print(f"  Excellent (>0.8): {excellent_top1}/{len(top1_similarities)}")
+        print(f"  Avg: {top1_stats['avg']:.3f}")
+        print(f"  Excellent (>0.8): {top1_stats['buckets'][3]}/{top1_stats['count']}")
 
     # Chunk size analysis
     print("\n" + "-"*80)
     print("CHUNK SIZE ANALYSIS")
     print("-"*80)
 
-    chunk_lengths = []
-    for result in results:
-        if result['status'] == 'success':
-            for res in result['results']:
-                chunk_lengths.append(len(res['text']))
-
-    if chunk_lengths:
-        print(f"\nChunk Lengths (characters):")
-        print(f"  Min: {min(chunk_lengths)}")
-        print(f"  Max: {max(chunk_lengths)}")
-        print(f"  Avg: {sum(chunk_lengths)/len(chunk_lengths):.0f}")
-
-        # Show distribution
-        very_short = len([l for l in chunk_lengths if l < 100])
-        short = len([l for l in chunk_lengths if 100 <= l < 300])
-        medium = len([l for l in chunk_lengths if 300 <= l < 600])
-        long = len([l for l in chunk_lengths if l >= 600])
-
-        print(f"\n  Distribution:")
-        print(f"    Very Short (<100 chars): {very_short} ({very_short/len(chunk_lengths)*100:.1f}%)")
-        print(f"    Short (100-300 chars):   {short} ({short/len(chunk_lengths)*100:.1f}%)")
-        print(f"    Medium (300-600 chars):  {medium} ({medium/len(chunk_lengths)*100:.1f}%)")
-        print(f"    Long (600+ chars):       {long} ({long/len(chunk_lengths)*100:.1f}%)")
+    if length_stats['count']:
+        inv = 100.0 / length_stats['count']
+        very_short, short, medium, long = length_stats['buckets']
+
+        print("\n".join([
+            f"\nChunk Lengths (characters):",
+            f"  Min: {length_stats['min']}",
+            f"  Max: {length_stats['max']}",
+            f"  Avg: {length_stats['avg']:.0f}",
+            f"\n  Distribution:",
+            f"    Very Short (<100 chars): {very_short} ({very_short*inv:.1f}%)",
+            f"    Short (100-300 chars):   {short} ({short*inv:.1f}%)",
+            f"    Medium (300-600 chars):  {medium} ({medium*inv:.1f}%)",
+            f"    Long (600+ chars):       {long} ({long*inv:.1f}%)",
+        ]))
 
     # Document frequency
     print("\n" + "-"*80)
     print("MOST FREQUENTLY RETRIEVED DOCUMENTS")
     print("-"*80)
 
-    doc_counts = defaultdict(int)
-    for result in results:
-        if result['status'] == 'success':
-            for res in result['results']:
-                doc_counts[res['document_name']] += 1
-
     # Top 10 documents
-    sorted_docs = sorted(doc_counts.items(), key=lambda x: x[1], reverse=True)[:10]
     print("\nTop 10 documents appearing in results:")
-    for doc, count in sorted_docs:
-        print(f"  {count:2d}x - {doc}")
+    top_docs = doc_counts.most_common(10)
+    if top_docs:
+        print("\n".join(f"  {count:2d}x - {doc}" for doc, count in top_docs))
 
     # Category analysis
     print("\n" + "-"*80)
     print("BY CATEGORY")
     print("-"*80)
 
-    for category, stats in data['by_category'].items():
-        print(f"\n{category}:")
-        print(f"  Queries: {stats['total']}")
-        print(f"  Successful: {stats['successful']}")
+    if data['by_category']:
+        print("\n".join(
+            f"\n{category}:\n  Queries: {stats['total']}\n  Successful: {stats['successful']}"
+            for category, stats in data['by_category'].items()
+        ))
 
     # Flag potential issues
     print("\n" + "-"*80)
@@ -133,14 +399,14 @@ def analyze_results(results_file: str):
     issues = []
 
     # Low similarity scores
-    if top1_similarities:
-        avg_top1 = sum(top1_similarities) / len(top1_similarities)
+    if top1_stats['count']:
+        avg_top1 = top1_stats['avg']
         if avg_top1 < 0.6:
             issues.append(f"[WARNING] Low top-1 similarity avg ({avg_top1:.3f}) - embeddings may not be capturing semantics well")
 
     # Small chunks
-    if chunk_lengths:
-        avg_chunk = sum(chunk_lengths) / len(chunk_lengths)
+    if length_stats['count']:
+        avg_chunk = length_stats['avg']
         if avg_chunk < 200:
             issues.append(f"[WARNING] Very small chunks (avg {avg_chunk:.0f} chars) - answers likely incomplete")
 
@@ -149,8 +415,7 @@ def analyze_results(results_file: str):
         issues.append(f"[WARNING] Slow search ({data['summary']['avg_search_time_ms']:.0f}ms) - target <500ms")
 
     # No high-confidence results
-    high_conf = len([s for s in top1_similarities if s > 0.8])
-    if high_conf == 0:
+    if top1_stats['buckets'][3] == 0:
         issues.append(f"[WARNING] No top-1 results with >0.8 similarity - may need better chunking or embeddings")
 
     if issues:
@@ -164,31 +429,14 @@ def analyze_results(results_file: str):
     print("QUERIES TO REVIEW MANUALLY")
     print("-"*80)
 
-    print("\nHigh Priority (Low Similarity):")
-    low_sim_queries = []
-    for result in results:
-        if result['status'] == 'success' and result['results']:
-            top_sim = result['results'][0]['similarity']
-            if top_sim < 0.5:
-                low_sim_queries.append((result['query_id'], result['query'], top_sim))
-
-    low_sim_queries.sort(key=lambda x: x[2])
-    for qid, query, sim in low_sim_queries[:5]:
-        print(f"\n  Query {qid} (sim: {sim:.3f}):")
-        print(f"  {query[:70]}...")
-
-    print("\n\nHigh Priority (High Similarity - Should be Good):")
-    high_sim_queries = []
-    for result in results:
-        if result['status'] == 'success' and result['results']:
-            top_sim = result['results'][0]['similarity']
-            if top_sim > 0.7:
-                high_sim_queries.append((result['query_id'], result['query'], top_sim))
-
-    high_sim_queries.sort(key=lambda x: x[2], reverse=True)
-    for qid, query, sim in high_sim_queries[:5]:
-        print(f"\n  Query {qid} (sim: {sim:.3f}):")
-        print(f"  {query[:70]}...")
+    lines = ["\nHigh Priority (Low Similarity):"]
+    for qid, query, sim in collected['low_sim_queries']:
+        lines.append(f"\n  Query {qid} (sim: {sim:.3f}):\n  {query[:70]}...")
+
+    lines.append("\n\nHigh Priority (High Similarity - Should be Good):")
+    for qid, query, sim in collected['high_sim_queries']:
+        lines.append(f"\n  Query {qid} (sim: {sim:.3f}):\n  {query[:70]}...")
+    print("\n".join(lines))
 
     print("\n" + "="*80)
     print("\nNext Steps:")
@@ -201,13 +449,25 @@ def analyze_results(results_file: str):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/analyze_results.py <results_file.json>")
-        sys.exit(1)
-
-    results_file = sys.argv[1]
-    if not Path(results_file).exists():
-        print(f"Error: File not found: {results_file}")
-        sys.exit(1)
-
-    analyze_results(results_file)
+    parser = argparse.ArgumentParser(
+        description="Analyze evaluation results to help with manual scoring"
+    )
+    parser.add_argument(
+        'results_file',
+        help='Path to results JSON file (or its .ndjson copy)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not write the cached statistics'
+    )
+
+    args = parser.parse_args()
+
+    results_file = args.results_file
+    for path in (results_file, resolve_report_files(results_file)[0]):
+        if not Path(path).exists():
+            print(f"Error: File not found: {path}")
+            sys.exit(1)
+
+    analyze_results(results_file, use_cache=not args.no_cache)
@@ -15,30 +15,131 @@ import sys
 import os
 from pathlib import Path
 
-# Add src to path
-src_path = Path(__file__).parent.parent / "src"
-sys.path.insert(0, str(src_path))
-
 import json
+import mmap
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 import argparse
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Try to import orjson for faster JSON encoding/decoding (falls back to json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_loads(data):
+    """Parse JSON from str/bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_indented(obj) -> str:
+    """Serialize to indented (2 spaces), non-ASCII-escaped JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def _json_dumps_line(obj) -> bytes:
+    """Serialize to a single compact JSON line (newline-terminated)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj) + b'\n'
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def ndjson_path(output_file: str) -> str:
+    """Path of the JSON Lines copy of the results written next to a report"""
+    return str(Path(output_file).with_suffix('.ndjson'))
+
+
+class RateLimiter:
+    """Thread-safe token bucket capping requests per second"""
+
+    def __init__(self, rps: float):
+        self.rate = rps
+        self.capacity = max(1.0, rps)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # Reserve the token now; a negative balance is the wait for it
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
 
 
 class QueryEvaluator:
     """Evaluates RAG queries and generates reports"""
 
-    def __init__(self, api_url: str = "http://localhost:8000"):
+    MAX_RETRIES = 3  # Retries on HTTP 429 / connection errors
+
+    def __init__(self, api_url: str = "http://localhost:8000", pool_size: int = 16,
+                 rps: Optional[float] = None):
         self.api_url = api_url
+        self.rate_limiter = RateLimiter(rps) if rps else None
         self.results = []
+        self._last_report = None  # Report for the current self.results
+        self.query_metadata = {}  # query_id -> expected_docs / why_important
+        self._batch_supported = True  # Cleared if the API has no batch endpoint
+
+        # Persistent session: keep-alive connections are reused across queries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def load_queries(self, filepath: str) -> Dict:
         """Load M&A test queries from JSON file"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if not ORJSON_AVAILABLE:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        # Parse straight from a read-only memory map (no intermediate read copy)
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+
+    def _post(self, path: str, payload: Dict, timeout: float):
+        """
+        POST to the API, backing off on HTTP 429 or connection errors
+
+        Returns:
+            Tuple of (response, elapsed_ms) for the final attempt
+        """
+        for attempt in range(self.MAX_RETRIES + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            try:
+                start_time = time.time()
+                response = self.session.post(f"{self.api_url}{path}", json=payload, timeout=timeout)
+                elapsed_ms = (time.time() - start_time) * 1000
+            except requests.exceptions.ConnectionError:
+                if attempt == self.MAX_RETRIES:
+                    raise
+            else:
+                if response.status_code != 429 or attempt == self.MAX_RETRIES:
+                    return response, elapsed_ms
+
+            time.sleep(min(2 ** attempt, 5))
 
     def test_query(self, query_data: Dict, top_k: int = 5) -> Dict:
         """
@@ -54,79 +155,149 @@ class QueryEvaluator:
         query_text = query_data['query']
 
         try:
-            start_time = time.time()
-
-            response = requests.post(
-                f"{self.api_url}/api/v1/search",
-                json={
+            response, elapsed_ms = self._post(
+                "/api/v1/search",
+                {
                     "query": query_text,
                     "top_k": top_k
                 },
                 timeout=30
             )
 
-            elapsed_ms = (time.time() - start_time) * 1000
+            if response.status_code == 200:
+                return self._success_result(query_data, _json_loads(response.content), elapsed_ms)
+            else:
+                return self._error_result(query_data, f"HTTP {response.status_code}: {response.text}")
+
+        except Exception as e:
+            return self._error_result(query_data, str(e))
+
+    def test_query_batch(self, batch: List[Dict], top_k: int = 5) -> Optional[List[Dict]]:
+        """
+        Execute several queries with one request to the batch search endpoint
+
+        Args:
+            batch: Query objects from ma_test_queries.json
+            top_k: Number of results to retrieve per query
+
+        Returns:
+            One result dict per query (same shape as test_query), or None if
+            the API has no batch endpoint (HTTP 404)
+        """
+        try:
+            response, elapsed_ms = self._post(
+                "/api/v1/search/batch",
+                {
+                    "queries": [q['query'] for q in batch],
+                    "top_k": top_k
+                },
+                timeout=30 * len(batch)
+            )
+
+            # Latency is amortized over the queries in the batch
+            elapsed_ms /= len(batch)
+
+            if response.status_code == 404:
+                return None
 
             if response.status_code == 200:
-                data = response.json()
-                return {
-                    'query_id': query_data['id'],
-                    'category': query_data['category'],
-                    'priority': query_data['priority'],
-                    'query': query_text,
-                    'results': data['results'],
-                    'total_results': data['total_results'],
-                    'search_time_ms': elapsed_ms,
-                    'status': 'success',
-                    'expected_docs': query_data.get('expected_docs', []),
-                    'why_important': query_data.get('why_important', ''),
-                    'score': None  # To be filled in during evaluation
-                }
+                data = _json_loads(response.content)
+                # Results are matched to queries by position, so a short or
+                # long response can't be attributed - fail the whole batch
+                if len(data['results']) == len(batch):
+                    return [
+                        self._success_result(query_data, query_response, elapsed_ms)
+                        for query_data, query_response in zip(batch, data['results'])
+                    ]
+                error = f"Batch response has {len(data['results'])} results for {len(batch)} queries"
             else:
-                return {
-                    'query_id': query_data['id'],
-                    'category': query_data['category'],
-                    'query': query_text,
-                    'status': 'error',
-                    'error': f"HTTP {response.status_code}: {response.text}",
-                    'score': 0
-                }
+                error = f"HTTP {response.status_code}: {response.text}"
 
         except Exception as e:
-            return {
-                'query_id': query_data['id'],
-                'category': query_data['category'],
-                'query': query_text,
-                'status': 'error',
-                'error': str(e),
-                'score': 0
-            }
+            error = str(e)
+
+        return [self._error_result(query_data, error) for query_data in batch]
+
+    def _success_result(self, query_data: Dict, data: Dict, elapsed_ms: float) -> Dict:
+        """Build the result dict for a successful search response"""
+        return {
+            'query_id': query_data['id'],
+            'category': query_data['category'],
+            'priority': query_data['priority'],
+            'query': query_data['query'],
+            'results': data['results'],
+            'total_results': data['total_results'],
+            'search_time_ms': elapsed_ms,
+            'status': 'success',
+            'score': None  # To be filled in during evaluation
+        }
+
+    def _error_result(self, query_data: Dict, error: str) -> Dict:
+        """Build the result dict for a failed query"""
+        return {
+            'query_id': query_data['id'],
+            'category': query_data['category'],
+            'priority': query_data['priority'],
+            'query': query_data['query'],
+            'status': 'error',
+            'error': error,
+            'score': 0
+        }
+
+    def _run_batch(self, batch: List[Dict], top_k: int) -> List[Dict]:
+        """Run a group of queries, using the batch endpoint when available"""
+        if len(batch) > 1 and self._batch_supported:
+            results = self.test_query_batch(batch, top_k=top_k)
+            if results is not None:
+                return results
+
+            # Older API without /search/batch - use per-query requests from now on
+            self._batch_supported = False
+
+        return [self.test_query(query_data, top_k=top_k) for query_data in batch]
 
     def run_evaluation(self, queries: List[Dict], top_k: int = 5,
                       category_filter: Optional[str] = None,
                       priority_filter: Optional[str] = None,
-                      interactive: bool = False) -> List[Dict]:
+                      interactive: bool = False,
+                      max_workers: int = 8,
+                      batch_size: int = 1) -> List[Dict]:
         """
         Run evaluation on all queries
 
+        Queries are sent concurrently from a thread pool; results are printed
+        (and scored, in interactive mode) in the original query order.
+
         Args:
             queries: List of query objects
             top_k: Number of results per query
             category_filter: Only test queries in this category
             priority_filter: Only test queries with this priority
             interactive: If True, prompt user to score each result
+            max_workers: Maximum number of concurrent API requests
+            batch_size: Queries per request; above 1 the /search/batch
+                        endpoint is used (falls back to per-query requests)
 
         Returns:
             List of results
         """
-        # Filter queries
-        filtered_queries = queries
-        if category_filter:
-            filtered_queries = [q for q in filtered_queries
-                              if category_filter.lower() in q['category'].lower()]
-        if priority_filter:
-            filtered_queries = [q for q in filtered_queries
-                              if q['priority'].lower() == priority_filter.lower()]
+        # Filter queries (filter strings are lower-cased once, in a single pass)
+        category_lc = category_filter.lower() if category_filter else None
+        priority_lc = priority_filter.lower() if priority_filter else None
+        filtered_queries = [
+            q for q in queries
+            if (category_lc is None or category_lc in q['category'].lower())
+            and (priority_lc is None or q['priority'].lower() == priority_lc)
+        ]
+
+        # Kept once per query; attached to results only when writing the report
+        self.query_metadata = {
+            q['id']: {
+                'expected_docs': q.get('expected_docs', []),
+                'why_important': q.get('why_important', '')
+            }
+            for q in filtered_queries
+        }
 
         print(f"\n{'='*80}")
         print(f"Running evaluation on {len(filtered_queries)} queries")
@@ -134,38 +305,53 @@ class QueryEvaluator:
 
         results = []
 
-        for i, query_data in enumerate(filtered_queries, 1):
-            print(f"\n[{i}/{len(filtered_queries)}] Testing query {query_data['id']}: {query_data['category']}")
-            print(f"Query: {query_data['query']}")
-            print(f"Priority: {query_data['priority']}")
-
-            result = self.test_query(query_data, top_k=top_k)
+        batch_size = max(1, batch_size)
+        batches = [
+            filtered_queries[i:i + batch_size]
+            for i in range(0, len(filtered_queries), batch_size)
+        ]
 
-            if result['status'] == 'success':
-                print(f"[OK] Found {result['total_results']} results in {result['search_time_ms']:.0f}ms")
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [executor.submit(self._run_batch, batch, top_k) for batch in batches]
 
-                # Show top results
-                for j, res in enumerate(result['results'][:3], 1):
-                    print(f"\n  Result {j} (similarity: {res['similarity']:.3f}):")
-                    print(f"  Document: {res['document_name']}")
-                    print(f"  Chunk Index: {res.get('chunk_index', 'N/A')}")
-                    print(f"  Text: {res['text'][:150]}...")
+            position = 0
+            for batch, future in zip(batches, futures):
+                for query_data, result in zip(batch, future.result()):
+                    position += 1
+                    self._print_result(position, len(filtered_queries), query_data, result)
 
-                # Interactive scoring
-                if interactive:
-                    result['score'] = self._interactive_score(result)
-                else:
-                    result['score'] = None  # Manual scoring needed
-
-            else:
-                print(f"[ERROR] {result['error']}")
+                    # Interactive scoring
+                    if result['status'] == 'success':
+                        if interactive:
+                            result['score'] = self._interactive_score(result)
+                        else:
+                            result['score'] = None  # Manual scoring needed
 
-            results.append(result)
-            time.sleep(0.5)  # Be nice to the API
+                    results.append(result)
 
         self.results = results
+        self._last_report = None
         return results
 
+    def _print_result(self, position: int, total: int, query_data: Dict, result: Dict):
+        """Print a single query result to the console"""
+        print(f"\n[{position}/{total}] Testing query {query_data['id']}: {query_data['category']}")
+        print(f"Query: {query_data['query']}")
+        print(f"Priority: {query_data['priority']}")
+
+        if result['status'] == 'success':
+            print(f"[OK] Found {result['total_results']} results in {result['search_time_ms']:.0f}ms")
+
+            # Show top results
+            for j, res in enumerate(result['results'][:3], 1):
+                print(f"\n  Result {j} (similarity: {res['similarity']:.3f}):")
+                print(f"  Document: {res['document_name']}")
+                print(f"  Chunk Index: {res.get('chunk_index', 'N/A')}")
+                print(f"  Text: {res['text'][:150]}...")
+
+        else:
+            print(f"[ERROR] {result['error']}")
+
     def _interactive_score(self, result: Dict) -> int:
         """Prompt user to score a result interactively"""
         print("\n" + "="*60)
@@ -197,7 +383,8 @@ class QueryEvaluator:
             output_file: Optional path to save JSON report
 
         Returns:
-            Report dictionary
+            Report dictionary (per-query results are only written to the
+            file; they remain available in self.results)
         """
         if not self.results:
             print("No results to report")
@@ -231,8 +418,7 @@ class QueryEvaluator:
                 'avg_results_per_query': sum(r.get('total_results', 0) for r in successful) / len(successful) if successful else 0,
             },
             'by_category': {},
-            'by_priority': {},
-            'results': self.results
+            'by_priority': {}
         }
 
         # Category breakdown
@@ -274,19 +460,50 @@ class QueryEvaluator:
 
         # Save to file
         if output_file:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            self._write_report(report, output_file)
             print(f"\nReport saved to: {output_file}")
+            print(f"Results (JSON Lines) saved to: {ndjson_path(output_file)}")
 
+        self._last_report = report
         return report
 
+    def _write_report(self, report: Dict, output_file: str):
+        """
+        Write the report as JSON, streaming the results array.
+
+        The aggregate sections are serialized first, then each result is
+        written one at a time instead of building one large JSON string.
+        The results are also written to a sibling .ndjson file (one result
+        per line) so they can be re-read line by line.
+
+        Args:
+            report: Report dictionary without 'results'
+            output_file: Path to save JSON report
+        """
+        with open(output_file, 'w', encoding='utf-8') as f, \
+                open(ndjson_path(output_file), 'wb') as lines:
+            header = _json_dumps_indented(report)
+            f.write(header[:-2])  # Drop the closing "\n}"
+            f.write(',\n  "results": [')
+
+            for i, result in enumerate(self.results):
+                if result['status'] == 'success' and result['query_id'] in self.query_metadata:
+                    result = {**result, **self.query_metadata[result['query_id']]}
+                item = _json_dumps_indented(result)
+                f.write(',\n    ' if i else '\n    ')
+                f.write(item.replace('\n', '\n    '))
+                lines.write(_json_dumps_line(result))
+
+            f.write('\n  ]\n}' if self.results else ']\n}')
+
     def print_summary(self):
         """Print a human-readable summary to console"""
         if not self.results:
             print("No results to summarize")
             return
 
-        report = self.generate_report()
+        # Reuse the report from generate_report() if one was already built
+        report = self._last_report or self.generate_report()
 
         print("\n" + "="*80)
         print("EVALUATION SUMMARY")
@@ -388,14 +605,35 @@ def main():
         '--output',
         help='Output JSON report file path'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Number of queries to run concurrently (default: 8)'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='Queries per request via /api/v1/search/batch (default: 1, no batching)'
+    )
+    parser.add_argument(
+        '--rps',
+        type=float,
+        help='Cap the request rate (requests per second, default: unlimited)'
+    )
 
     args = parser.parse_args()
 
     # Check if API is running
-    evaluator = QueryEvaluator(api_url=args.api_url)
+    evaluator = QueryEvaluator(
+        api_url=args.api_url,
+        pool_size=max(16, args.concurrency),
+        rps=args.rps
+    )
 
     try:
-        response = requests.get(f"{args.api_url}/api/v1/health", timeout=5)
+        response = evaluator.session.get(f"{args.api_url}/api/v1/health", timeout=5)
         if response.status_code != 200:
             print(f"ERROR: API health check failed. Is the server running at {args.api_url}?")
             print("Start the API with: python run_api.py")
@@ -423,7 +661,9 @@ def main():
         top_k=args.top_k,
         category_filter=args.category,
         priority_filter=args.priority,
-        interactive=args.interactive
+        interactive=args.interactive,
+        max_workers=args.concurrency,
+        batch_size=args.batch_size
     )
 
     # Generate report
@@ -10,11 +10,14 @@ Requirements:
 - Database connection configured in .env
 """
 
+import importlib.util
 import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Use the installed package (pip install -e .); fall back to the source tree
+SRC_DIR = Path(__file__).parent.parent / "src"
+if importlib.util.find_spec("vector_store") is None:
+    sys.path.append(str(SRC_DIR))
 
 from vector_store.pgvector_client import PgVectorStore
 from config.settings import settings
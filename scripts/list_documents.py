@@ -14,17 +14,59 @@ Requirements:
     - DATABASE_URL configured in .env
 """
 
+import importlib.util
 import sys
 import argparse
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, Optional
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Use the installed package (pip install -e .); fall back to the source tree
+SRC_DIR = Path(__file__).parent.parent / "src"
+if importlib.util.find_spec("vector_store") is None:
+    sys.path.append(str(SRC_DIR))
 
-from vector_store.pgvector_client import PgVectorStore
 from config.settings import settings
 
+if TYPE_CHECKING:
+    from vector_store.pgvector_client import PgVectorStore
+
+# Settings used by this script, read once at import
+DB_URL = settings.database_url
+EMBED_DIM = settings.embedding_dimension
+
+# Chunk text fetched for the details view (preview shows 200 chars + "...")
+CHUNK_PREVIEW_FETCH_CHARS = 210
+
+# Documents rendered per stdout write when listing
+LIST_FLUSH_DOCUMENTS = 100
+
+TROUBLESHOOTING = (
+    "\nTroubleshooting:\n"
+    "  1. Is the database running?\n"
+    "     Run: cd database && docker-compose up -d\n"
+    "  2. Is DATABASE_URL configured in .env?\n"
+    "\n"
+)
+
+
+def _write_lines(lines: List[str]):
+    """Write buffered output lines to stdout in one call"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _open_store() -> "PgVectorStore":
+    """Create a store on the shared connection pool (imports SQLAlchemy on first use)"""
+    from vector_store.pgvector_client import PgVectorStore
+    from vector_store.pool import get_engine
+
+    return PgVectorStore(
+        connection_string=DB_URL,
+        embedding_dim=EMBED_DIM,
+        debug=False,
+        engine=get_engine(DB_URL)
+    )
+
 
 def list_all_documents(verbose: bool = False) -> List[Dict[str, Any]]:
     """
@@ -36,15 +78,28 @@ def list_all_documents(verbose: bool = False) -> List[Dict[str, Any]]:
     Returns:
         List of documents with metadata
     """
-    store = PgVectorStore(
-        connection_string=settings.database_url,
-        embedding_dim=settings.embedding_dimension,
-        debug=False
-    )
+    store = _open_store()
+
+    try:
+        return list(store.iter_documents())
+    finally:
+        store.close()
+
+
+def iter_all_documents() -> Iterator[Dict[str, Any]]:
+    """
+    Stream all documents in the database (newest first).
+
+    Documents are fetched in batches through a server-side cursor, so the
+    full list is never held in memory.
+
+    Yields:
+        Document dicts
+    """
+    store = _open_store()
 
     try:
-        documents = store.list_documents()
-        return documents
+        yield from store.iter_documents()
     finally:
         store.close()
 
@@ -59,11 +114,7 @@ def get_document_details(document_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Document details with chunks
     """
-    store = PgVectorStore(
-        connection_string=settings.database_url,
-        embedding_dim=settings.embedding_dimension,
-        debug=False
-    )
+    store = _open_store()
 
     try:
         # Get document metadata
@@ -71,8 +122,8 @@ def get_document_details(document_id: str) -> Optional[Dict[str, Any]]:
         if not document:
             return None
 
-        # Get all chunks for this document
-        chunks = store.get_document_chunks(document_id)
+        # Get all chunks for this document (only a text preview is displayed)
+        chunks = store.get_document_chunks(document_id, text_limit=CHUNK_PREVIEW_FETCH_CHARS)
         document['chunks'] = chunks
 
         return document
@@ -80,44 +131,51 @@ def get_document_details(document_id: str) -> Optional[Dict[str, Any]]:
         store.close()
 
 
-def format_document_list(documents: List[Dict[str, Any]], verbose: bool = False):
+def format_document_list(documents: Iterable[Dict[str, Any]], verbose: bool = False):
     """
     Format and print document list.
 
+    Lines are buffered and written in blocks of LIST_FLUSH_DOCUMENTS
+    documents, so an iterator can be passed to avoid materializing the
+    whole list.
+
     Args:
-        documents: List of documents
+        documents: Documents (list or iterator)
         verbose: Show additional details
     """
-    print()
-    print("=" * 70)
-    print("Uploaded Documents")
-    print("=" * 70)
-
-    if not documents:
-        print("\nNo documents found.")
-        print("\nUpload a document:")
-        print("  python scripts/upload_pdf.py document.pdf")
-        return
+    buf = ["", "=" * 70, "Uploaded Documents", "=" * 70, ""]
 
-    print(f"\nTotal: {len(documents)} document(s)\n")
-
-    for i, doc in enumerate(documents, 1):
+    count = 0
+    for count, doc in enumerate(documents, 1):
         doc_id = doc['id']
         filename = doc['filename']
         chunk_count = doc['chunk_count']
         page_count = doc['page_count']
         upload_date = doc['upload_date']  # Already formatted as ISO string
 
-        print(f"{i}. {filename}")
-        print(f"   Document ID: {doc_id}")
-        print(f"   Uploaded: {upload_date}")
-        print(f"   Pages: {page_count}")
-        print(f"   Chunks: {chunk_count}")
+        buf.append(f"{count}. {filename}")
+        buf.append(f"   Document ID: {doc_id}")
+        buf.append(f"   Uploaded: {upload_date}")
+        buf.append(f"   Pages: {page_count}")
+        buf.append(f"   Chunks: {chunk_count}")
 
         if verbose and doc.get('metadata'):
-            print(f"   Metadata: {doc['metadata']}")
+            buf.append(f"   Metadata: {doc['metadata']}")
+
+        buf.append("")
 
-        print()
+        if count % LIST_FLUSH_DOCUMENTS == 0:
+            _write_lines(buf)
+            buf = []
+
+    if not count:
+        buf.append("No documents found.")
+        buf.append("\nUpload a document:")
+        buf.append("  python scripts/upload_pdf.py document.pdf")
+    else:
+        buf.append(f"Total: {count} document(s)")
+
+    _write_lines(buf)
 
 
 def format_document_details(document: Dict[str, Any]):
@@ -127,25 +185,27 @@ def format_document_details(document: Dict[str, Any]):
     Args:
         document: Document with chunks
     """
-    print()
-    print("=" * 70)
-    print("Document Details")
-    print("=" * 70)
-    print()
-    print(f"Filename:     {document['filename']}")
-    print(f"Document ID:  {document['id']}")
-    print(f"Uploaded:     {document['upload_date']}")  # Already formatted as ISO string
-    print(f"Pages:        {document['page_count']}")
-    print(f"Chunks:       {document['chunk_count']}")
+    buf = [
+        "",
+        "=" * 70,
+        "Document Details",
+        "=" * 70,
+        "",
+        f"Filename:     {document['filename']}",
+        f"Document ID:  {document['id']}",
+        f"Uploaded:     {document['upload_date']}",  # Already formatted as ISO string
+        f"Pages:        {document['page_count']}",
+        f"Chunks:       {document['chunk_count']}",
+    ]
 
     if document.get('metadata'):
-        print(f"Metadata:     {document['metadata']}")
+        buf.append(f"Metadata:     {document['metadata']}")
 
     chunks = document.get('chunks', [])
     if chunks:
-        print()
-        print(f"Chunks ({len(chunks)}):")
-        print()
+        buf.append("")
+        buf.append(f"Chunks ({len(chunks)}):")
+        buf.append("")
 
         for i, chunk in enumerate(chunks, 1):
             text = chunk['text']
@@ -158,13 +218,15 @@ def format_document_details(document: Dict[str, Any]):
             else:
                 text_preview = text
 
-            print(f"  {i}. Chunk #{chunk_index}")
-            print(f"     Text: {text_preview}")
+            buf.append(f"  {i}. Chunk #{chunk_index}")
+            buf.append(f"     Text: {text_preview}")
 
             if metadata:
-                print(f"     Metadata: {metadata}")
+                buf.append(f"     Metadata: {metadata}")
+
+            buf.append("")
 
-            print()
+    _write_lines(buf)
 
 
 def main():
@@ -211,19 +273,13 @@ Upload documents:
             format_document_details(document)
 
         else:
-            # List all documents
-            documents = list_all_documents(verbose=args.verbose)
-            format_document_list(documents, verbose=args.verbose)
+            # List all documents (streamed)
+            format_document_list(iter_all_documents(), verbose=args.verbose)
 
         return 0
 
     except Exception as e:
-        print(f"\n Error: {e}", file=sys.stderr)
-        print("\nTroubleshooting:", file=sys.stderr)
-        print("  1. Is the database running?", file=sys.stderr)
-        print("     Run: cd database && docker-compose up -d", file=sys.stderr)
-        print("  2. Is DATABASE_URL configured in .env?", file=sys.stderr)
-        print(file=sys.stderr)
+        sys.stderr.write(f"\n Error: {e}\n{TROUBLESHOOTING}")
 
         if args.verbose:
             import traceback
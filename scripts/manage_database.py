@@ -6,71 +6,108 @@ This script helps manage the vector database:
 - Delete specific documents
 - Show database statistics
 - Vacuum database (reclaim space)
+- Dump / restore all data with COPY (fast re-ingest)
 
 Usage:
     python scripts/manage_database.py --stats
     python scripts/manage_database.py --clear
     python scripts/manage_database.py --delete-document <doc_id>
     python scripts/manage_database.py --vacuum
+    python scripts/manage_database.py --halfvec
+    python scripts/manage_database.py --reindex
+    python scripts/manage_database.py --binary-index
+    python scripts/manage_database.py --dump backups/pdf_rag
+    python scripts/manage_database.py --clear --restore-from backups/pdf_rag
 """
 
+import importlib.util
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Use the installed package (pip install -e .); fall back to the source tree
+SRC_DIR = Path(__file__).parent.parent / "src"
+if importlib.util.find_spec("vector_store") is None:
+    sys.path.append(str(SRC_DIR))
 
-from vector_store.pgvector_client import PgVectorStore
 from config.settings import settings
-from sqlalchemy import create_engine, text
+
+# Settings used by this script, read once at import
+DB_URL = settings.database_url
+EMBED_DIM = settings.embedding_dimension
+
+# Tables and columns in a --dump directory (one binary COPY file per table),
+# in foreign-key order for restoring
+DUMP_TABLES = (
+    ("documents", "id, filename, upload_date, page_count, chunk_count, doc_metadata, created_at, updated_at"),
+    ("chunks", "id, document_id, chunk_index, text, embedding, chunk_metadata, created_at"),
+)
+
+# chunks carries the vector index, so let Postgres (13+) vacuum its indexes
+# with parallel workers
+VACUUM_STATEMENTS = {
+    "documents": "VACUUM ANALYZE documents",
+    "chunks": "VACUUM (ANALYZE, PARALLEL 4) chunks",
+}
 
 
 class DatabaseManager:
     """Manage vector database"""
 
     def __init__(self, verbose: bool = False):
+        # Imported here so --help doesn't pay for loading SQLAlchemy
+        from vector_store.pgvector_client import PgVectorStore
+        from vector_store.pool import get_engine
+
         self.verbose = verbose
         self.store = PgVectorStore(
-            connection_string=settings.database_url,
-            embedding_dim=settings.embedding_dimension,
-            debug=verbose
+            connection_string=DB_URL,
+            embedding_dim=EMBED_DIM,
+            debug=verbose,
+            engine=get_engine(DB_URL)
         )
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics"""
-        docs = self.store.list_documents()
+        """Get database statistics (counts and sizes; documents are streamed separately)"""
+        from sqlalchemy import text
 
-        total_chunks = sum(doc['chunk_count'] for doc in docs)
+        counts = self.store.get_stats()
 
         # Get database size
-        engine = create_engine(settings.database_url)
-        with engine.connect() as conn:
+        with self.store.engine.connect() as conn:
             result = conn.execute(text(
                 "SELECT pg_size_pretty(pg_database_size(current_database())) as size"
             ))
             db_size = result.fetchone()[0]
 
-            # Get table sizes
+            # Get table sizes (each relation is sized once, then formatted)
             result = conn.execute(text("""
+                WITH sizes AS (
+                    SELECT
+                        relname,
+                        pg_total_relation_size(relid) as total_bytes,
+                        pg_relation_size(relid) as table_bytes
+                    FROM pg_catalog.pg_statio_user_tables
+                    WHERE relname IN ('documents', 'chunks')
+                )
                 SELECT
                     relname as table_name,
-                    pg_size_pretty(pg_total_relation_size(relid)) as total_size,
-                    pg_size_pretty(pg_relation_size(relid)) as table_size,
-                    pg_size_pretty(pg_total_relation_size(relid) - pg_relation_size(relid)) as index_size
-                FROM pg_catalog.pg_statio_user_tables
-                WHERE relname IN ('documents', 'chunks')
-                ORDER BY pg_total_relation_size(relid) DESC;
+                    pg_size_pretty(total_bytes) as total_size,
+                    pg_size_pretty(table_bytes) as table_size,
+                    pg_size_pretty(total_bytes - table_bytes) as index_size
+                FROM sizes
+                ORDER BY total_bytes DESC;
             """))
             table_sizes = result.fetchall()
 
         return {
-            'document_count': len(docs),
-            'chunk_count': total_chunks,
+            'document_count': counts['document_count'],
+            'chunk_count': counts['chunk_count'],
             'database_size': db_size,
-            'table_sizes': table_sizes,
-            'documents': docs
+            'table_sizes': table_sizes
         }
 
     def display_stats(self):
@@ -89,15 +126,23 @@ class DatabaseManager:
             table_name, total_size, table_size, index_size = table
             print(f"  {table_name:12} - Total: {total_size:>10}  Table: {table_size:>10}  Index: {index_size:>10}")
 
-        if stats['documents']:
-            print(f"\nDocuments ({len(stats['documents'])}):")
-            for doc in stats['documents']:
+        if stats['document_count']:
+            print(f"\nDocuments ({stats['document_count']}):")
+            for doc in self.store.iter_documents():
+                uploaded = datetime.fromisoformat(doc['upload_date'])
                 print(f"  • {doc['filename']} ({doc['chunk_count']} chunks)")
                 print(f"    ID: {doc['id']}")
-                print(f"    Uploaded: {doc['upload_date'].strftime('%Y-%m-%d %H:%M:%S')}")
+                print(f"    Uploaded: {uploaded.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    def clear_all(self, confirm: bool = False, soft: bool = False):
+        """
+        Clear all documents and chunks.
+
+        Uses TRUNCATE (no per-row WAL, space reclaimed immediately) unless
+        soft is set, in which case rows are removed with DELETE.
+        """
+        from sqlalchemy import text
 
-    def clear_all(self, confirm: bool = False):
-        """Clear all documents and chunks"""
         if not confirm:
             print("\n⚠️  WARNING: This will delete ALL documents and chunks!")
 
@@ -114,17 +159,19 @@ class DatabaseManager:
 
         print("\nDeleting all documents and chunks...")
 
-        engine = create_engine(settings.database_url)
-        with engine.connect() as conn:
-            # Delete all chunks first (due to foreign key)
-            result = conn.execute(text("DELETE FROM chunks"))
-            chunks_deleted = result.rowcount
+        if soft:
+            with self.store.engine.connect() as conn:
+                # Delete all chunks first (due to foreign key)
+                result = conn.execute(text("DELETE FROM chunks"))
+                chunks_deleted = result.rowcount
 
-            # Delete all documents
-            result = conn.execute(text("DELETE FROM documents"))
-            docs_deleted = result.rowcount
+                # Delete all documents
+                result = conn.execute(text("DELETE FROM documents"))
+                docs_deleted = result.rowcount
 
-            conn.commit()
+                conn.commit()
+        else:
+            docs_deleted, chunks_deleted = self.store.truncate_all()
 
         print(f"✓ Deleted {docs_deleted} document(s) and {chunks_deleted} chunk(s)")
         return True
@@ -147,24 +194,147 @@ class DatabaseManager:
         return True
 
     def vacuum_database(self):
-        """Vacuum database to reclaim space"""
+        """Vacuum database to reclaim space (tables are vacuumed in parallel)"""
         print("\nVacuuming database (this may take a while)...")
 
-        engine = create_engine(settings.database_url)
+        # The tables are independent, so each runs on its own pooled connection
+        with ThreadPoolExecutor(max_workers=len(VACUUM_STATEMENTS)) as executor:
+            futures = {
+                executor.submit(self._vacuum_table, statement): table
+                for table, statement in VACUUM_STATEMENTS.items()
+            }
+            for future in as_completed(futures):
+                future.result()
+                print(f"✓ Vacuumed {futures[future]} table")
 
-        # Need to use isolation level autocommit for VACUUM
-        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
-            conn.execute(text("VACUUM ANALYZE documents"))
-            print("✓ Vacuumed documents table")
+        print("✓ Vacuum complete")
 
-            conn.execute(text("VACUUM ANALYZE chunks"))
-            print("✓ Vacuumed chunks table")
+    def _vacuum_table(self, statement: str):
+        """Run one VACUUM statement (needs autocommit, VACUUM can't run in a transaction)"""
+        from sqlalchemy import text
 
-        print("✓ Vacuum complete")
+        with self.store.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(statement))
+
+    def reindex(self, index_type: str = "hnsw"):
+        """Rebuild the vector index from the current data (run after bulk loads)"""
+        print(f"\nRebuilding vector index ({index_type}, this may take a while)...")
+
+        self.store.rebuild_vector_index(index_type=index_type)
+
+        print("✓ Reindex complete")
+
+    def build_binary_index(self):
+        """Build the HNSW index on binary-quantized embeddings used by two-stage search"""
+        print("\nBuilding binary (1-bit) embedding index (this may take a while)...")
+
+        self.store.rebuild_binary_index()
+
+        print("✓ Binary index complete - set SEARCH_OVERSAMPLE (e.g. 4) in .env to use it")
+
+    def convert_to_halfvec(self):
+        """
+        Convert stored embeddings to halfvec (FP16) and rebuild the vector index.
+
+        Halves the bytes read per distance computation. Requires pgvector >= 0.7
+        on the server; set EMBEDDING_STORAGE=halfvec afterwards so queries are
+        cast to the same type. The index is rebuilt with its current type
+        (HNSW if there was none).
+        """
+        from sqlalchemy import text
+        from vector_store.pgvector_client import VECTOR_INDEX_NAME
+
+        dim = EMBED_DIM
+        index_type = self.store.vector_index_type() or "hnsw"
+
+        print(f"\nConverting chunks.embedding to halfvec({dim})...")
+
+        with self.store.engine.connect() as conn:
+            # The index's vector opclass doesn't apply to halfvec, so drop it first
+            conn.execute(text(f"DROP INDEX IF EXISTS {VECTOR_INDEX_NAME}"))
+            conn.execute(text(
+                f"ALTER TABLE chunks ALTER COLUMN embedding TYPE halfvec({dim}) "
+                f"USING embedding::halfvec({dim})"
+            ))
+            conn.commit()
+        print("✓ Converted embedding column")
+
+        print(f"Rebuilding vector index ({index_type}, this may take a while)...")
+        self.store.embedding_storage = "halfvec"  # the column is halfvec now, whatever .env says
+        self.store.rebuild_vector_index(index_type=index_type)
+        print("✓ Rebuilt vector index")
+
+        print("✓ Conversion complete - set EMBEDDING_STORAGE=halfvec in .env")
+
+    def dump_to(self, path: str):
+        """
+        Dump documents and chunks to a directory with binary COPY TO STDOUT.
+
+        The files can only be restored into the same schema (including the
+        embedding storage type, vector or halfvec).
+        """
+        out_dir = Path(path)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        print(f"\nDumping database to {out_dir}...")
+
+        raw_conn = self.store.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            for table, columns in DUMP_TABLES:
+                with open(out_dir / f"{table}.copy", "wb") as f:
+                    cursor.copy_expert(f"COPY {table} ({columns}) TO STDOUT WITH (FORMAT binary)", f)
+                print(f"✓ Dumped {table} table")
+            cursor.close()
+            raw_conn.rollback()  # read-only, just end the transaction
+        finally:
+            raw_conn.close()
+
+        print("✓ Dump complete")
+
+    def restore_from(self, path: str, index_type: str = "hnsw"):
+        """
+        Load a --dump directory with COPY FROM STDIN.
+
+        COPY streams every row in one statement instead of an INSERT per row.
+        The vector index is dropped for the load and built once afterwards.
+        The tables should be empty (e.g. run with --clear) - existing IDs
+        make the restore fail and roll back.
+        """
+        in_dir = Path(path)
+        missing = [f"{table}.copy" for table, _ in DUMP_TABLES if not (in_dir / f"{table}.copy").exists()]
+        if missing:
+            raise FileNotFoundError(f"Not a dump directory ({', '.join(missing)} missing): {in_dir}")
+
+        print(f"\nRestoring database from {in_dir}...")
+
+        self.store.drop_vector_index()
+
+        raw_conn = self.store.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            for table, columns in DUMP_TABLES:
+                with open(in_dir / f"{table}.copy", "rb") as f:
+                    cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT binary)", f)
+                print(f"✓ Restored {table} table ({cursor.rowcount} rows)")
+            cursor.close()
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+            # Rebuild even if the load failed, so the index isn't left missing
+            self.reindex(index_type=index_type)
+
+        print("✓ Restore complete")
 
     def cleanup(self):
         """Clean up resources"""
+        from vector_store.pool import dispose_engines
+
         self.store.close()
+        dispose_engines()
 
 
 def main():
@@ -180,16 +350,34 @@ Examples:
   # Clear all data (fresh start)
   python scripts/manage_database.py --clear
 
+  # Clear all data with row-by-row DELETE instead of TRUNCATE
+  python scripts/manage_database.py --clear --soft
+
   # Delete specific document
   python scripts/manage_database.py --delete-document abc-123-def
 
   # Vacuum database (reclaim space)
   python scripts/manage_database.py --vacuum
 
+  # Rebuild the vector index after loading many documents
+  python scripts/manage_database.py --reindex
+
+  # Store embeddings as FP16 halfvec (then set EMBEDDING_STORAGE=halfvec)
+  python scripts/manage_database.py --halfvec
+
+  # Index 1-bit codes for two-stage search (then set SEARCH_OVERSAMPLE=4)
+  python scripts/manage_database.py --binary-index
+
+  # Back up all data, then restore it into an empty database
+  python scripts/manage_database.py --dump backups/pdf_rag
+  python scripts/manage_database.py --clear --restore-from backups/pdf_rag
+
 Database Management Tips:
   • Clearing database is useful when testing different chunking strategies
-  • Vacuum after deleting many documents to reclaim disk space
+  • Vacuum after deleting many documents (or --clear --soft) to reclaim disk space
   • Use --delete-document to remove individual documents during testing
+  • Reindex after bulk uploads - one build gives a better index than incremental inserts
+  • Dump before experimenting; --restore-from reloads with COPY instead of re-processing PDFs
         """
     )
 
@@ -218,6 +406,51 @@ Database Management Tips:
         help='Vacuum database to reclaim space'
     )
 
+    parser.add_argument(
+        '--reindex', '-r',
+        action='store_true',
+        help='Rebuild the vector index from current data (after bulk loads)'
+    )
+
+    parser.add_argument(
+        '--index-type',
+        choices=['hnsw', 'ivfflat'],
+        default='hnsw',
+        help='Index type for --reindex (default: hnsw)'
+    )
+
+    parser.add_argument(
+        '--halfvec',
+        action='store_true',
+        help='Convert embeddings to halfvec (FP16) storage (pgvector >= 0.7)'
+    )
+
+    parser.add_argument(
+        '--binary-index',
+        action='store_true',
+        help='Build the binary-quantized index for two-stage search (pgvector >= 0.7)'
+    )
+
+    parser.add_argument(
+        '--dump',
+        type=str,
+        metavar='DIR',
+        help='Dump all documents and chunks to DIR (binary COPY files)'
+    )
+
+    parser.add_argument(
+        '--restore-from',
+        type=str,
+        metavar='DIR',
+        help='Load a --dump directory with COPY (into empty tables, see --clear)'
+    )
+
+    parser.add_argument(
+        '--soft',
+        action='store_true',
+        help='With --clear: delete rows with DELETE instead of TRUNCATE'
+    )
+
     parser.add_argument(
         '--yes', '-y',
         action='store_true',
@@ -233,7 +466,8 @@ Database Management Tips:
     args = parser.parse_args()
 
     # If no action specified, show stats by default
-    if not (args.stats or args.clear or args.delete_document or args.vacuum):
+    if not (args.stats or args.clear or args.delete_document or args.vacuum or args.halfvec
+            or args.reindex or args.binary_index or args.dump or args.restore_from):
         args.stats = True
 
     manager = DatabaseManager(verbose=args.verbose)
@@ -242,12 +476,29 @@ Database Management Tips:
         if args.stats:
             manager.display_stats()
 
+        if args.dump:
+            manager.dump_to(args.dump)
+
         if args.clear:
-            manager.clear_all(confirm=args.yes)
+            cleared = manager.clear_all(confirm=args.yes, soft=args.soft)
+            if not cleared and args.restore_from:
+                return 1  # don't restore on top of existing data
+
+        if args.restore_from:
+            manager.restore_from(args.restore_from, index_type=args.index_type)
 
         if args.delete_document:
             manager.delete_document(args.delete_document)
 
+        if args.halfvec:
+            manager.convert_to_halfvec()
+
+        if args.reindex:
+            manager.reindex(index_type=args.index_type)
+
+        if args.binary_index:
+            manager.build_binary_index()
+
         if args.vacuum:
             manager.vacuum_database()
 
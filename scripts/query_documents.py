@@ -8,30 +8,148 @@ Usage:
     python scripts/query_documents.py "What are the vacation policies?"
     python scripts/query_documents.py "health insurance" --top-k 5
     python scripts/query_documents.py "stock options" --document-id abc-123
+    python scripts/query_documents.py --repl
+    python scripts/query_documents.py --queries-file queries.txt
 
 Requirements:
     - Database running with uploaded documents
     - DATABASE_URL configured in .env
 """
 
+import importlib.util
 import sys
 import argparse
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import numpy as np
+
+# Use the installed package (pip install -e .); fall back to the source tree
+SRC_DIR = Path(__file__).parent.parent / "src"
+if importlib.util.find_spec("vector_store") is None:
+    sys.path.append(str(SRC_DIR))
 
-from embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder
-from vector_store.pgvector_client import PgVectorStore
 from config.settings import settings
 
+if TYPE_CHECKING:
+    from vector_store.pgvector_client import PgVectorStore
+
+# Settings used by this script, read once at import
+DB_URL = settings.database_url
+EMBED_DIM = settings.embedding_dimension
+EMBED_MODEL = settings.embedding_model
+EMBED_NORMALIZE = settings.embedding_normalize
+
+
+# Similarity bands: [Weak] < 0.6 <= [Fair] < 0.7 <= [Good] < 0.8 <= [Excellent]
+SCORE_THRESHOLDS = np.array([0.6, 0.7, 0.8])
+SCORE_LABELS = np.array(["[Weak]", "[Fair]", "[Good]", "[Excellent]"])
+
+TROUBLESHOOTING = (
+    "\nTroubleshooting:\n"
+    "  1. Is the database running?\n"
+    "     Run: cd database && docker-compose up -d\n"
+    "  2. Are any documents uploaded?\n"
+    "     Check: python scripts/list_documents.py\n"
+    "  3. Upload a document first:\n"
+    "     Run: python scripts/upload_pdf.py document.pdf\n"
+    "\n"
+)
+
+
+def _open_store() -> "PgVectorStore":
+    """Create a store on the shared connection pool (imports SQLAlchemy on first use)"""
+    from vector_store.pgvector_client import PgVectorStore
+    from vector_store.pool import get_engine
+
+    return PgVectorStore(
+        connection_string=DB_URL,
+        embedding_dim=EMBED_DIM,
+        debug=False,
+        engine=get_engine(DB_URL)
+    )
+
+
+def _load_embedder():
+    """Get the shared embedder (torch/transformers are imported on first use)"""
+    from embeddings.cache import get_embedder
+
+    return get_embedder(
+        model_name=EMBED_MODEL,
+        device="cpu",
+        normalize=EMBED_NORMALIZE
+    )
+
+
+@lru_cache(maxsize=1)
+def _open_query_cache():
+    """Open the on-disk query embedding cache once per process"""
+    from embeddings.query_cache import QueryEmbeddingCache
+
+    return QueryEmbeddingCache(
+        model_name=EMBED_MODEL,
+        backend=settings.embedding_backend,
+        onnx_file=settings.embedding_onnx_file or None,
+        normalize=EMBED_NORMALIZE
+    )
+
+
+def embed_queries(
+    queries: List[str],
+    batch_size: int = 32,
+    use_cache: bool = True,
+    verbose: bool = False
+) -> List[List[float]]:
+    """
+    Embed queries, reusing vectors cached on disk by earlier runs.
+
+    The model is only loaded if at least one query is not cached.
+
+    Args:
+        queries: Query strings
+        batch_size: Queries per embedding forward pass
+        use_cache: Read and update the query embedding cache
+        verbose: Print detailed progress
+
+    Returns:
+        One embedding per query
+    """
+    cache = _open_query_cache() if use_cache else None
+    embeddings = cache.get_many(queries) if cache else [None] * len(queries)
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+    if verbose and cache:
+        print(f"Query embedding cache: {len(queries) - len(missing)}/{len(queries)} hit(s)")
+
+    if missing:
+        # Initialize embedder (loaded once per process)
+        if verbose:
+            print("Loading embedding model...")
+
+        embedder = _load_embedder()
+
+        if verbose:
+            print("Generating query embeddings...")
+
+        missing_queries = [queries[i] for i in missing]
+        new_embeddings = embedder.embed_batch(missing_queries, batch_size=batch_size)
+        for i, embedding in zip(missing, new_embeddings):
+            embeddings[i] = embedding
+
+        if cache:
+            cache.put_many(missing_queries, new_embeddings)
+
+    return embeddings
+
 
 def search_documents(
     query: str,
     top_k: int = 3,
     document_id: Optional[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    ef_search: Optional[int] = None,
+    use_cache: bool = True
 ) -> List[Dict[str, Any]]:
     """
     Search documents using semantic similarity.
@@ -41,6 +159,8 @@ def search_documents(
         top_k: Number of results to return
         document_id: Optional document ID to filter results
         verbose: Print detailed progress
+        ef_search: HNSW ef_search for this query (higher = better recall, slower)
+        use_cache: Reuse the query embedding from the on-disk cache
 
     Returns:
         List of search results with similarity scores and metadata
@@ -50,28 +170,10 @@ def search_documents(
         print(f"Searching for top {top_k} results...")
         print()
 
-    # Initialize embedder
-    if verbose:
-        print("Loading embedding model...")
-
-    embedder = SentenceTransformerEmbedder(
-        model_name=settings.embedding_model,
-        device="cpu",
-        normalize=settings.embedding_normalize
-    )
-
-    # Generate query embedding
-    if verbose:
-        print("Generating query embedding...")
-
-    query_embedding = embedder.embed(query)
+    query_embedding = embed_queries([query], use_cache=use_cache, verbose=verbose)[0]
 
     # Connect to database and search
-    store = PgVectorStore(
-        connection_string=settings.database_url,
-        embedding_dim=settings.embedding_dimension,
-        debug=False
-    )
+    store = _open_store()
 
     try:
         # Build filters
@@ -79,22 +181,61 @@ def search_documents(
         if document_id:
             filters['document_id'] = document_id
 
-        # Perform search
-        results = store.search(
+        # Perform search (results include document_name)
+        return store.search(
             query_vector=query_embedding,
             top_k=top_k,
-            filters=filters if filters else None
+            filters=filters if filters else None,
+            ef_search=ef_search
         )
 
-        # Enrich results with document names
-        for result in results:
-            doc = store.get_document(result['document_id'])
-            if doc:
-                result['document_name'] = doc['filename']
-            else:
-                result['document_name'] = 'Unknown'
+    finally:
+        store.close()
+
+
+def search_documents_batch(
+    queries: List[str],
+    top_k: int = 3,
+    document_id: Optional[str] = None,
+    verbose: bool = False,
+    batch_size: int = 64,
+    ef_search: Optional[int] = None,
+    use_cache: bool = True
+) -> List[List[Dict[str, Any]]]:
+    """
+    Search documents for many queries at once.
+
+    All queries are embedded in batched forward passes and searched with a
+    single SQL statement.
+
+    Args:
+        queries: Natural language search queries
+        top_k: Number of results to return per query
+        document_id: Optional document ID to filter results
+        verbose: Print detailed progress
+        batch_size: Queries per embedding forward pass
+        ef_search: HNSW ef_search (higher = better recall, slower)
+        use_cache: Reuse query embeddings from the on-disk cache
+
+    Returns:
+        One list of search results per query
+    """
+    if verbose:
+        print(f"\nSearching {len(queries)} queries for top {top_k} results each...")
+
+    query_embeddings = embed_queries(queries, batch_size=batch_size, use_cache=use_cache, verbose=verbose)
 
-        return results
+    store = _open_store()
+
+    try:
+        filters = {'document_id': document_id} if document_id else None
+
+        return store.search_batch(
+            query_vectors=query_embeddings,
+            top_k=top_k,
+            filters=filters,
+            ef_search=ef_search
+        )
 
     finally:
         store.close()
@@ -109,40 +250,32 @@ def format_results(query: str, results: List[Dict[str, Any]], verbose: bool = Fa
         results: List of search results
         verbose: Show additional details
     """
-    print()
-    print("=" * 70)
-    print(f"Query: \"{query}\"")
-    print("=" * 70)
+    buf = ["", "=" * 70, f"Query: \"{query}\"", "=" * 70]
 
     if not results:
-        print("\nNo results found.")
-        print("\nTips:")
-        print("  - Try different keywords")
-        print("  - Check if documents are uploaded: python scripts/list_documents.py")
-        print("  - Upload documents: python scripts/upload_pdf.py file.pdf")
+        buf.append("\nNo results found.")
+        buf.append("\nTips:")
+        buf.append("  - Try different keywords")
+        buf.append("  - Check if documents are uploaded: python scripts/list_documents.py")
+        buf.append("  - Upload documents: python scripts/upload_pdf.py file.pdf")
+        sys.stdout.write("\n".join(buf) + "\n")
         return
 
-    print(f"\nResults (top {len(results)}):\n")
+    buf.append(f"\nResults (top {len(results)}):\n")
+
+    # Label all similarity scores at once (text only, no special chars)
+    similarities = np.fromiter((r['similarity'] for r in results), dtype=np.float64, count=len(results))
+    score_indicators = SCORE_LABELS[np.digitize(similarities, SCORE_THRESHOLDS)]
 
-    for i, result in enumerate(results, 1):
+    for i, (result, score_indicator) in enumerate(zip(results, score_indicators), 1):
         similarity = result['similarity']
         text = result['text']
         doc_name = result.get('document_name', 'Unknown')
         metadata = result.get('metadata', {})
 
-        # Format similarity score with color-coding (using text only, no special chars)
-        if similarity >= 0.8:
-            score_indicator = "[Excellent]"
-        elif similarity >= 0.7:
-            score_indicator = "[Good]"
-        elif similarity >= 0.6:
-            score_indicator = "[Fair]"
-        else:
-            score_indicator = "[Weak]"
-
-        # Print result
-        print(f"{i}. {score_indicator} Score: {similarity:.3f}")
-        print(f"   Document: {doc_name}")
+        # Result header
+        buf.append(f"{i}. {score_indicator} Score: {similarity:.3f}")
+        buf.append(f"   Document: {doc_name}")
 
         # Truncate text to reasonable length
         if len(text) > 250:
@@ -150,18 +283,67 @@ def format_results(query: str, results: List[Dict[str, Any]], verbose: bool = Fa
         else:
             text_preview = text
 
-        # Print text with indentation
-        print(f"   Text: {text_preview}")
+        # Text with indentation
+        buf.append(f"   Text: {text_preview}")
 
-        # Print metadata if available
+        # Metadata if available
         if metadata and verbose:
-            print(f"   Metadata: {metadata}")
+            buf.append(f"   Metadata: {metadata}")
 
         if verbose:
-            print(f"   Document ID: {result['document_id']}")
-            print(f"   Chunk Index: {result['chunk_index']}")
+            buf.append(f"   Document ID: {result['document_id']}")
+            buf.append(f"   Chunk Index: {result['chunk_index']}")
 
-        print()
+        buf.append("")
+
+    # One write for the whole block instead of a print() per line
+    sys.stdout.write("\n".join(buf) + "\n")
+
+
+def run_repl(
+    top_k: int = 3,
+    document_id: Optional[str] = None,
+    verbose: bool = False,
+    ef_search: Optional[int] = None,
+    use_cache: bool = True
+):
+    """
+    Read queries from stdin (one per line) and search each one.
+
+    The embedding model and database pool stay loaded between queries,
+    so only the first query pays the startup cost.
+
+    Args:
+        top_k: Number of results per query
+        document_id: Optional document ID to filter results
+        verbose: Show additional details
+        ef_search: HNSW ef_search (higher = better recall, slower)
+        use_cache: Reuse query embeddings from the on-disk cache
+    """
+    interactive = sys.stdin.isatty()
+    if interactive:
+        print("Enter a query per line (empty line or Ctrl-D to quit).")
+
+    while True:
+        try:
+            query = input("\nquery> " if interactive else "").strip()
+        except EOFError:
+            break
+
+        if not query:
+            if interactive:
+                break
+            continue
+
+        results = search_documents(
+            query=query,
+            top_k=top_k,
+            document_id=document_id,
+            verbose=verbose,
+            ef_search=ef_search,
+            use_cache=use_cache
+        )
+        format_results(query, results, verbose=verbose)
 
 
 def main():
@@ -174,6 +356,8 @@ Examples:
   python scripts/query_documents.py "What are the vacation policies?"
   python scripts/query_documents.py "health insurance" --top-k 5
   python scripts/query_documents.py "remote work" --verbose
+  python scripts/query_documents.py --repl < queries.txt
+  python scripts/query_documents.py --queries-file queries.txt --top-k 5
 
 Upload documents first:
   python scripts/upload_pdf.py document.pdf
@@ -183,6 +367,7 @@ Upload documents first:
     parser.add_argument(
         'query',
         type=str,
+        nargs='?',
         help='Natural language search query'
     )
 
@@ -205,15 +390,72 @@ Upload documents first:
         help='Show detailed information'
     )
 
+    parser.add_argument(
+        '--repl',
+        action='store_true',
+        help='Keep the model loaded and read queries from stdin (one per line)'
+    )
+
+    parser.add_argument(
+        '--ef-search',
+        type=int,
+        help='HNSW ef_search for this search (default: 40 for top-k <= 10, up to 200 for top-k >= 50)'
+    )
+
+    parser.add_argument(
+        '--queries-file',
+        type=str,
+        help='Search every query in a text file (one per line) in one batch'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always embed queries with the model (skip the on-disk embedding cache)'
+    )
+
     args = parser.parse_args()
 
+    if not args.query and not args.repl and not args.queries_file:
+        parser.error("a query is required (or use --repl / --queries-file)")
+
     try:
+        if args.repl:
+            run_repl(
+                top_k=args.top_k,
+                document_id=args.document_id,
+                verbose=args.verbose,
+                ef_search=args.ef_search,
+                use_cache=not args.no_cache
+            )
+            return 0
+
+        if args.queries_file:
+            with open(args.queries_file, 'r', encoding='utf-8') as f:
+                queries = [line.strip() for line in f if line.strip()]
+
+            all_results = search_documents_batch(
+                queries,
+                top_k=args.top_k,
+                document_id=args.document_id,
+                verbose=args.verbose,
+                ef_search=args.ef_search,
+                use_cache=not args.no_cache
+            )
+
+            for query, results in zip(queries, all_results):
+                format_results(query, results, verbose=args.verbose)
+
+            return 0
+
         # Perform search
         results = search_documents(
             query=args.query,
             top_k=args.top_k,
             document_id=args.document_id,
-            verbose=args.verbose
+            verbose=args.verbose,
+            ef_search=args.ef_search,
+            use_cache=not args.no_cache
         )
 
         # Display results
@@ -222,15 +464,7 @@ Upload documents first:
         return 0
 
     except Exception as e:
-        print(f"\n❌ Search failed: {e}", file=sys.stderr)
-        print("\nTroubleshooting:", file=sys.stderr)
-        print("  1. Is the database running?", file=sys.stderr)
-        print("     Run: cd database && docker-compose up -d", file=sys.stderr)
-        print("  2. Are any documents uploaded?", file=sys.stderr)
-        print("     Check: python scripts/list_documents.py", file=sys.stderr)
-        print("  3. Upload a document first:", file=sys.stderr)
-        print("     Run: python scripts/upload_pdf.py document.pdf", file=sys.stderr)
-        print(file=sys.stderr)
+        sys.stderr.write(f"\n❌ Search failed: {e}\n{TROUBLESHOOTING}")
 
         if args.verbose:
             import traceback
@@ -7,73 +7,450 @@ This script:
 3. Shows progress and statistics
 
 Usage:
-    python scripts/reprocess_all_documents.py [--confirm]
+    python scripts/reprocess_all_documents.py [--confirm] [--bulk] [--workers N] [--incremental]
 
-    --confirm: Skip confirmation prompt (use with caution!)
+    --confirm:     Skip confirmation prompt (use with caution!)
+    --incremental: Keep the database and only re-process PDFs (or settings) that changed
+    --compile:     torch.compile the embedding model (worth it for large runs)
+    --bulk:    Build the vector index once after loading instead of per insert
+    --workers: Processes for PDF extraction (default: CPU count, max 8)
 """
 
+import importlib.util
 import sys
 import os
 from pathlib import Path
 
-# Add src to path
-src_path = Path(__file__).parent.parent / "src"
-sys.path.insert(0, str(src_path))
+# Use the installed package (pip install -e .); fall back to the source tree
+SRC_DIR = Path(__file__).parent.parent / "src"
+if importlib.util.find_spec("vector_store") is None:
+    sys.path.append(str(SRC_DIR))
 
 import argparse
+import hashlib
+import json
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from operator import itemgetter
 import time
 
 from vector_store.pgvector_client import PgVectorStore
 from extraction.formatting_extractor import FormattingExtractor
 from preprocessing.text_cleaner import TextCleaner
 from chunking import create_chunker, get_chunker_info
-from embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder
+from embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder, max_tokens_for_chunks
 from config.settings import settings
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Chunks embedded per embed_batch call, across documents (bounds memory
+# while letting the model batch chunks from many PDFs together)
+EMBED_WINDOW_CHUNKS = 4096
 
-def clear_database(store: PgVectorStore) -> dict:
-    """Delete all documents and chunks from database"""
-    print("\nClearing database...")
+# PDF extraction processes (PyMuPDF uses ~200 MB per worker on large files)
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+
+# Extracted PDFs buffered ahead of embedding when extracting in-process
+EXTRACT_PREFETCH_DOCUMENTS = 4
+
+# Embedded windows waiting for the store thread (each up to EMBED_WINDOW_CHUNKS chunks)
+STORE_QUEUE_WINDOWS = 2
 
-    stats_before = store.get_stats()
-    print(f"  Current: {stats_before['document_count']} documents, {stats_before['chunk_count']} chunks")
+# Documents stored per database transaction (one commit/WAL flush per batch)
+STORE_COMMIT_DOCUMENTS = 25
 
-    # Get all documents
-    docs = store.list_documents(limit=10000)
+# Sidecar file recording which PDFs are already stored, for --incremental
+REPROCESS_CACHE_PATH = Path("data/cache/reprocess_cache.json")
 
-    deleted_count = 0
-    for doc in docs:
-        # Note: list_documents returns 'id', but delete_document expects UUID string
-        store.delete_document(doc['id'])
-        deleted_count += 1
-        if deleted_count % 50 == 0:
-            print(f"  Deleted {deleted_count} documents...")
 
-    stats_after = store.get_stats()
-    print(f"  After: {stats_after['document_count']} documents, {stats_after['chunk_count']} chunks")
+def file_fingerprint(pdf_path: Path) -> str:
+    """Content hash of a file (read in 1 MB blocks)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def processing_key(pdf_path: Path, chunker_info: dict, embedder_info: dict) -> str:
+    """
+    Identify a PDF's stored chunks by file content plus the settings that produced them.
+
+    If either the PDF or the chunking/embedding settings change, the key changes
+    and the document is re-processed. The embedding part comes from the loaded
+    embedder (get_model_info()), so backend, --int8/FP16 precision and the
+    sequence length are covered as well as the model name.
+    """
+    return (
+        f"{file_fingerprint(pdf_path)}:{chunker_info['type']}"
+        f":{chunker_info['max_chunk_size']}:{chunker_info['chunk_overlap']}"
+        f":{embedder_info['model_name']}:{embedder_info['backend']}:{embedder_info['onnx_file']}"
+        f":{embedder_info['precision']}:{embedder_info['max_seq_length']}"
+        f":{embedder_info['normalize']}"
+    )
+
+
+def load_reprocess_cache(path: Path) -> dict:
+    """Load the relative_path -> {'key', 'document_id'} map (empty if missing or unreadable)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_reprocess_cache(path: Path, cache: dict):
+    """Write the cache atomically so an interrupted run can't leave a truncated file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def clear_database(store: PgVectorStore) -> dict:
+    """Delete all documents and chunks from database (one TRUNCATE)"""
+    print("\nClearing database...")
+
+    deleted_documents, deleted_chunks = store.truncate_all()
+    print(f"  Deleted {deleted_documents} documents, {deleted_chunks} chunks")
 
     return {
-        'deleted_documents': deleted_count,
-        'deleted_chunks': stats_before['chunk_count']
+        'deleted_documents': deleted_documents,
+        'deleted_chunks': deleted_chunks
     }
 
 
+def extract_clean_chunk(pdf_path: Path, extractor, cleaner, chunker) -> dict:
+    """
+    Run the extract -> clean -> chunk stages for one PDF.
+
+    Progress messages are returned in 'log' rather than printed, so output
+    from worker processes isn't interleaved.
+
+    Returns:
+        Dict with 'chunks', 'page_count' and 'log' ('chunks' is None if
+        extraction failed, with the reason in 'errors')
+    """
+    log = []
+
+    # Extract
+    extraction_result = extractor.extract(str(pdf_path))
+
+    if not extraction_result.success or not extraction_result.extracted_text:
+        return {'chunks': None, 'page_count': 0, 'errors': extraction_result.errors, 'log': log}
+
+    text = extraction_result.extracted_text
+    page_count = extraction_result.metadata.get('page_count', 0)
+
+    log.append(f"  Extracted {len(text)} chars from {page_count} pages")
+
+    # Clean
+    cleaned, warnings = cleaner.clean(text)
+    log.append(f"  Cleaned to {len(cleaned)} chars")
+    if warnings:
+        log.append(f"  Warnings: {', '.join(warnings[:3])}")
+
+    # Chunk
+    chunks = chunker.chunk(cleaned)
+    log.append(f"  Created {len(chunks)} chunks")
+
+    if chunks:
+        avg_chunk_size = sum(map(itemgetter('chunk_size'), chunks)) / len(chunks)
+        log.append(f"  Avg chunk size: {avg_chunk_size:.0f} chars")
+
+    return {'chunks': chunks, 'page_count': page_count, 'errors': [], 'log': log}
+
+
+# Per-process pipeline for extraction workers (built once by _init_extract_worker)
+_worker_pipeline = None
+
+
+def _init_extract_worker():
+    """Build the extract/clean/chunk components once per worker process"""
+    global _worker_pipeline
+    _worker_pipeline = (FormattingExtractor(debug=False), TextCleaner(), create_chunker())
+
+
+def _extract_in_worker(pdf_path: str) -> dict:
+    extractor, cleaner, chunker = _worker_pipeline
+    return extract_clean_chunk(Path(pdf_path), extractor, cleaner, chunker)
+
+
+def iter_extracted(pdf_files: list, extractor, cleaner, chunker, workers: int = 1):
+    """
+    Extract, clean and chunk PDFs, yielding each one as it finishes.
+
+    With workers > 1 the (CPU-bound) PDF work runs in a process pool and
+    results arrive in completion order; otherwise it runs on a background
+    thread, a few documents ahead of the caller. Embedding stays in this
+    process so the model is only loaded once.
+
+    Yields:
+        (pdf_path, result dict from extract_clean_chunk() or the exception raised)
+    """
+    if workers <= 1:
+        # Extract on a thread so the next PDFs are decoded while the caller
+        # embeds (PyMuPDF and torch both release the GIL in native code)
+        extracted = queue.Queue(maxsize=EXTRACT_PREFETCH_DOCUMENTS)
+
+        def produce():
+            for pdf_path in pdf_files:
+                try:
+                    extracted.put((pdf_path, extract_clean_chunk(pdf_path, extractor, cleaner, chunker)))
+                except Exception as e:
+                    extracted.put((pdf_path, e))
+            extracted.put(None)
+
+        threading.Thread(target=produce, name="extract-pdfs", daemon=True).start()
+
+        while True:
+            item = extracted.get()
+            if item is None:
+                return
+            yield item
+
+    # spawn: forking after torch has started its thread pools can deadlock
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_extract_worker
+    ) as executor:
+        futures = {executor.submit(_extract_in_worker, str(pdf_path)): pdf_path for pdf_path in pdf_files}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def embed_pending(pending: list, embedder, results: dict) -> bool:
+    """
+    Embed the chunks of several documents in one embed_batch_array call.
+
+    One call across documents lets the model batch similar-length chunks
+    from different PDFs together and pays its per-call overhead once.
+    Each document gets its rows of the float32 matrix as 'embeddings'.
+
+    Args:
+        pending: Documents as dicts with 'pdf_path', 'relative_path', 'page_count', 'chunks'
+        embedder: Embedder with embed_batch_array()
+        results: Running totals, updated in place if embedding fails
+
+    Returns:
+        True if the documents were embedded
+    """
+    texts_to_embed = [chunk['text'] for doc in pending for chunk in doc['chunks']]
+    print(f"\nGenerating embeddings for {len(texts_to_embed)} chunks from {len(pending)} documents...")
+
+    try:
+        embeddings = embedder.embed_batch_array(texts_to_embed)
+    except Exception as e:
+        print(f"  [ERROR] Embedding failed: {str(e)}")
+        for doc in pending:
+            results['failed'] += 1
+            results['errors'].append({'file': str(doc['pdf_path']), 'error': str(e)})
+        return False
+
+    offset = 0
+    for doc in pending:
+        doc['embeddings'] = embeddings[offset:offset + len(doc['chunks'])]  # view, no copy
+        offset += len(doc['chunks'])
+
+    return True
+
+
+def store_documents(
+    pending: list,
+    store: PgVectorStore,
+    chunker_info: dict,
+    results: dict,
+    cache: dict = None,
+    commit_every: int = STORE_COMMIT_DOCUMENTS
+):
+    """
+    Store embedded documents, commit_every documents per transaction.
+
+    Each batch goes through store.insert_documents() (document rows plus
+    COPY-based chunk loads, one commit). If a batch fails, its documents
+    are retried one at a time so only the bad ones are reported.
+
+    Args:
+        pending: Embedded documents (see embed_pending())
+        store: Vector store
+        chunker_info: Chunker description (stored in document metadata)
+        results: Running totals, updated in place
+        cache: Reprocess cache, updated in place for each stored document
+            (a changed document's previous version is deleted once the new one is stored)
+        commit_every: Documents per transaction
+    """
+    def record(doc):
+        return {
+            'filename': doc['pdf_path'].name,
+            'page_count': doc['page_count'],
+            'metadata': {
+                'relative_path': doc['relative_path'],
+                'extraction_method': 'FormattingExtractor',
+                'chunking_method': chunker_info['type'],
+                'max_chunk_size': chunker_info['max_chunk_size'],
+                'chunk_overlap': chunker_info['chunk_overlap']
+            },
+            'chunks': doc['chunks'],
+            'embeddings': doc['embeddings']
+        }
+
+    def stored(doc, doc_id):
+        if cache is not None:
+            previous = cache.get(doc['relative_path'])
+            if previous:
+                store.delete_document(previous['document_id'])
+            cache[doc['relative_path']] = {'key': doc['cache_key'], 'document_id': doc_id}
+
+        print(f"  [OK] {doc['relative_path']} stored as {doc_id}")
+        results['successful'] += 1
+        results['total_chunks'] += len(doc['chunks'])
+        results['total_pages'] += doc['page_count']
+
+    for start in range(0, len(pending), commit_every):
+        batch = pending[start:start + commit_every]
+
+        try:
+            doc_ids = store.insert_documents([record(doc) for doc in batch])
+        except Exception:
+            doc_ids = None  # retried per document below
+
+        if doc_ids is not None:
+            for doc, doc_id in zip(batch, doc_ids):
+                stored(doc, doc_id)
+            continue
+
+        for doc in batch:
+            try:
+                [doc_id] = store.insert_documents([record(doc)])
+                stored(doc, doc_id)
+            except Exception as e:
+                print(f"  [ERROR] {doc['relative_path']}: {str(e)}")
+                results['failed'] += 1
+                results['errors'].append({
+                    'file': str(doc['pdf_path']),
+                    'error': str(e)
+                })
+
+
+class StoreThread(threading.Thread):
+    """
+    Stores embedded windows in the background, so the database inserts of
+    one window overlap extracting and embedding the next.
+
+    Keeps its own totals (merged by finish()) so no state is shared with
+    the embedding thread.
+    """
+
+    def __init__(
+        self,
+        store: PgVectorStore,
+        chunker_info: dict,
+        cache: dict = None,
+        cache_path: Path = REPROCESS_CACHE_PATH
+    ):
+        super().__init__(name="store-documents", daemon=True)
+        self.store = store
+        self.chunker_info = chunker_info
+        self.cache = cache
+        self.cache_path = cache_path
+        self.queue = queue.Queue(maxsize=STORE_QUEUE_WINDOWS)
+        self.results = {'successful': 0, 'failed': 0, 'total_chunks': 0, 'total_pages': 0, 'errors': []}
+
+    def run(self):
+        while True:
+            pending = self.queue.get()
+            if pending is None:
+                return
+            try:
+                store_documents(pending, self.store, self.chunker_info, self.results, self.cache)
+                if self.cache is not None:
+                    save_reprocess_cache(self.cache_path, self.cache)
+            except Exception as e:
+                # Keep draining the queue so the producer never blocks
+                logger.error(f"Storing documents failed: {e}")
+
+    def submit(self, pending: list):
+        """Queue embedded documents (blocks while STORE_QUEUE_WINDOWS windows are waiting)"""
+        self.queue.put(pending)
+
+    def finish(self, results: dict):
+        """Wait for queued windows to be stored, then add this thread's totals to results"""
+        self.queue.put(None)
+        self.join()
+        for key in ('successful', 'failed', 'total_chunks', 'total_pages'):
+            results[key] += self.results[key]
+        results['errors'].extend(self.results['errors'])
+
+
+def find_pdfs(root: Path) -> list:
+    """
+    Find all .pdf files under root.
+
+    Walks the tree with os.scandir, whose entries carry the file type from
+    the directory listing, so no per-entry stat() calls or Path objects are
+    needed; only matching files are turned into Paths.
+    """
+    pdf_files = []
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.pdf') and entry.is_file():
+                        pdf_files.append(Path(entry.path))
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+    return pdf_files
+
+
+def _relative_path(pdf_path: Path, pdf_dir: Path) -> str:
+    """Path relative to the PDF directory (falls back to the file name)"""
+    try:
+        return str(pdf_path.relative_to(pdf_dir))
+    except ValueError:
+        return pdf_path.name
+
+
 def process_all_pdfs(
     pdf_dir: Path,
     store: PgVectorStore,
     extractor,
     cleaner,
     chunker,
-    embedder
+    embedder,
+    embed_window: int = EMBED_WINDOW_CHUNKS,
+    workers: int = 1,
+    cache: dict = None,
+    cache_path: Path = REPROCESS_CACHE_PATH
 ) -> dict:
-    """Process all PDFs in directory"""
+    """
+    Process all PDFs in directory.
+
+    The stages overlap: PDFs are extracted/chunked by `workers` processes
+    (or a background thread), chunks are embedded in this thread, and a
+    StoreThread writes them to the database. Chunks are collected across
+    documents and embedded together once at least embed_window chunks are
+    pending (and at the end), instead of one embed_batch call per PDF.
+
+    If cache is given, PDFs whose content and chunking/embedding settings
+    match their cache entry are skipped, and the cache is saved to
+    cache_path after each stored window.
+    """
 
     print(f"\nScanning for PDFs in: {pdf_dir}")
-    pdf_files = list(pdf_dir.rglob("*.pdf"))
+    pdf_files = find_pdfs(pdf_dir)
     print(f"Found {len(pdf_files)} PDF files")
 
     if not pdf_files:
@@ -88,6 +465,7 @@ def process_all_pdfs(
     results = {
         'total_files': len(pdf_files),
         'successful': 0,
+        'skipped': 0,
         'failed': 0,
         'total_chunks': 0,
         'total_pages': 0,
@@ -96,86 +474,72 @@ def process_all_pdfs(
 
     start_time = time.time()
 
-    for i, pdf_path in enumerate(pdf_files, 1):
-        try:
-            # Calculate relative path from data/documents
-            try:
-                relative_path = str(pdf_path.relative_to(pdf_dir))
-            except ValueError:
-                relative_path = pdf_path.name
-
-            print(f"\n[{i}/{len(pdf_files)}] Processing: {relative_path}")
+    cache_keys = {}
+    if cache is not None:
+        embedder_info = embedder.get_model_info()
+        to_process = []
+        for pdf_path in pdf_files:
+            relative_path = _relative_path(pdf_path, pdf_dir)
+            key = processing_key(pdf_path, chunker_info, embedder_info)
+            entry = cache.get(relative_path)
+            if entry and entry['key'] == key:
+                results['skipped'] += 1
+                continue
+            cache_keys[pdf_path] = key
+            to_process.append(pdf_path)
 
-            # Extract
-            print(f"  Extracting...")
-            extraction_result = extractor.extract(str(pdf_path))
+        print(f"\nUnchanged (skipped): {results['skipped']}, to process: {len(to_process)}")
+        pdf_files = to_process
 
-            if not extraction_result.success or not extraction_result.extracted_text:
-                print(f"  [SKIP] Extraction failed: {extraction_result.errors}")
-                results['failed'] += 1
-                continue
+    pending = []
+    pending_chunks = 0
 
-            text = extraction_result.extracted_text
-            page_count = extraction_result.metadata.get('page_count', 0)
+    store_thread = StoreThread(store, chunker_info, cache=cache, cache_path=cache_path)
+    store_thread.start()
 
-            print(f"  Extracted {len(text)} chars from {page_count} pages")
+    extracted = iter_extracted(pdf_files, extractor, cleaner, chunker, workers=workers)
 
-            # Clean
-            cleaned, warnings = cleaner.clean(text)
-            print(f"  Cleaned to {len(cleaned)} chars")
-            if warnings:
-                print(f"  Warnings: {', '.join(warnings[:3])}")
+    for i, (pdf_path, doc) in enumerate(extracted, 1):
+        relative_path = _relative_path(pdf_path, pdf_dir)
 
-            # Chunk
-            chunks = chunker.chunk(cleaned)
-            print(f"  Created {len(chunks)} chunks")
+        print(f"\n[{i}/{len(pdf_files)}] Processed: {relative_path}")
 
-            if chunks:
-                avg_chunk_size = sum(c['chunk_size'] for c in chunks) / len(chunks)
-                print(f"  Avg chunk size: {avg_chunk_size:.0f} chars")
+        if isinstance(doc, Exception):
+            print(f"  [ERROR] {str(doc)}")
+            results['failed'] += 1
+            results['errors'].append({
+                'file': str(pdf_path),
+                'error': str(doc)
+            })
+            continue
 
-            # Embed
-            print(f"  Generating embeddings...")
-            texts_to_embed = [chunk['text'] for chunk in chunks]
-            embeddings = embedder.embed_batch(texts_to_embed)
+        for line in doc['log']:
+            print(line)
 
-            # Combine
-            chunks_with_embeddings = []
-            for chunk, embedding in zip(chunks, embeddings):
-                chunks_with_embeddings.append({
-                    **chunk,
-                    'embedding': embedding
-                })
+        if doc['chunks'] is None:
+            print(f"  [SKIP] Extraction failed: {doc['errors']}")
+            results['failed'] += 1
+            continue
 
-            # Store document (using insert_document + insert_chunks like RAG service)
-            doc_metadata = {
-                'relative_path': relative_path,
-                'extraction_method': 'FormattingExtractor',
-                'chunking_method': chunker_info['type'],
-                'max_chunk_size': chunker_info['max_chunk_size'],
-                'chunk_overlap': chunker_info['chunk_overlap']
-            }
+        doc['pdf_path'] = pdf_path
+        doc['relative_path'] = relative_path
+        doc['cache_key'] = cache_keys.get(pdf_path)
+        pending.append(doc)
+        pending_chunks += len(doc['chunks'])
 
-            doc_id = store.insert_document(
-                filename=pdf_path.name,
-                page_count=page_count,
-                metadata=doc_metadata
-            )
+        if pending_chunks >= embed_window:
+            if embed_pending(pending, embedder, results):
+                store_thread.submit(pending)
+            pending = []
+            pending_chunks = 0
 
-            store.insert_chunks(doc_id, chunks_with_embeddings)
+    if pending and embed_pending(pending, embedder, results):
+        store_thread.submit(pending)
 
-            print(f"  [OK] Stored as {doc_id}")
-            results['successful'] += 1
-            results['total_chunks'] += len(chunks)
-            results['total_pages'] += page_count
+    store_thread.finish(results)
 
-        except Exception as e:
-            print(f"  [ERROR] {str(e)}")
-            results['failed'] += 1
-            results['errors'].append({
-                'file': str(pdf_path),
-                'error': str(e)
-            })
+    if cache is not None:
+        save_reprocess_cache(cache_path, cache)
 
     elapsed = time.time() - start_time
     results['elapsed_seconds'] = elapsed
@@ -197,6 +561,49 @@ def main():
         default='data/documents',
         help='Directory containing PDFs to process'
     )
+    parser.add_argument(
+        '--embed-window',
+        type=int,
+        default=EMBED_WINDOW_CHUNKS,
+        help=f'Chunks (across documents) embedded per batch (default: {EMBED_WINDOW_CHUNKS})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=EXTRACT_WORKERS,
+        help=f'Processes used for PDF extraction/chunking (default: {EXTRACT_WORKERS}, 1 = no pool)'
+    )
+    parser.add_argument(
+        '--device',
+        choices=['auto', 'cpu', 'cuda'],
+        default='auto',
+        help='Device for the embedding model (default: auto = CUDA if available, FP16 on GPU)'
+    )
+    parser.add_argument(
+        '--int8',
+        action='store_true',
+        help='On CPU, quantize the embedding model to int8 (~2x faster, slightly different vectors)'
+    )
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='Compile the embedding model with torch.compile (slow start, faster batches on large runs)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Keep existing documents; skip PDFs unchanged since the last run (same content and settings)'
+    )
+    parser.add_argument(
+        '--cache-file',
+        default=str(REPROCESS_CACHE_PATH),
+        help=f'Cache of already processed PDFs (default: {REPROCESS_CACHE_PATH})'
+    )
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Drop the vector index while loading and rebuild it (HNSW) once at the end'
+    )
 
     args = parser.parse_args()
 
@@ -226,8 +633,18 @@ def main():
     # Get current stats
     current_stats = store.get_stats()
 
+    cache_path = Path(args.cache_file)
+
+    if args.incremental:
+        cache = load_reprocess_cache(cache_path)
+        # Drop entries whose document is gone (e.g. database cleared elsewhere)
+        stored_ids = {doc['id'] for doc in store.iter_documents()}
+        cache = {path: entry for path, entry in cache.items() if entry['document_id'] in stored_ids}
+        print(f"\nIncremental mode: {len(cache)} documents already processed")
+        clear_stats = {'deleted_documents': 0, 'deleted_chunks': 0}
+
     # Confirmation
-    if not args.confirm:
+    elif not args.confirm:
         print("\n" + "!"*80)
         print("WARNING: This will DELETE all existing documents and chunks!")
         print(f"  Current: {current_stats['document_count']} documents, {current_stats['chunk_count']} chunks")
@@ -238,8 +655,10 @@ def main():
             print("Cancelled.")
             return 0
 
-    # Clear database
-    clear_stats = clear_database(store)
+    if not args.incremental:
+        # Clear database (and with it everything the cache refers to)
+        clear_stats = clear_database(store)
+        cache = {}
 
     # Initialize processing components
     print("\nInitializing processing pipeline...")
@@ -248,8 +667,28 @@ def main():
     chunker = create_chunker()  # Uses settings
     embedder = SentenceTransformerEmbedder(
         model_name=settings.embedding_model,
-        device='cpu'
+        device=None if args.device == 'auto' else args.device,
+        half_precision=True,
+        max_seq_length=max_tokens_for_chunks(settings.max_chunk_size),
+        backend=settings.embedding_backend,
+        onnx_file=settings.embedding_onnx_file or None
     )
+    print(f"  Embedding device: {embedder.model.device}")
+    if args.int8:
+        if embedder.quantize_int8():
+            print("  Quantized embedding model to int8 (dynamic)")
+        else:
+            print("  --int8 ignored: model is not a PyTorch model on the CPU")
+    if args.compile and embedder.compile():
+        # First encode triggers compilation; do it now at the real batch size
+        print("  Compiling embedding model (torch.compile, one-time)...")
+        embedder.warmup(batch_size=settings.embedding_batch_size)
+    else:
+        embedder.warmup()
+
+    if args.bulk:
+        print("\nDropping vector index for bulk load...")
+        store.drop_vector_index()
 
     # Process all PDFs
     results = process_all_pdfs(
@@ -258,9 +697,17 @@ def main():
         extractor,
         cleaner,
         chunker,
-        embedder
+        embedder,
+        embed_window=args.embed_window,
+        workers=args.workers,
+        cache=cache,
+        cache_path=cache_path
     )
 
+    if args.bulk:
+        print("\nRebuilding vector index...")
+        store.rebuild_vector_index()
+
     # Final summary
     print("\n" + "="*80)
     print("SUMMARY")
@@ -272,6 +719,7 @@ def main():
     print(f"\nProcessed:")
     print(f"  Total Files: {results['total_files']}")
     print(f"  Successful: {results['successful']}")
+    print(f"  Skipped (unchanged): {results.get('skipped', 0)}")
     print(f"  Failed: {results['failed']}")
     print(f"  Total Pages: {results.get('total_pages', 0)}")
     print(f"  Total Chunks: {results.get('total_chunks', 0)}")
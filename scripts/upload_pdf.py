@@ -17,28 +17,32 @@ Requirements:
     - DATABASE_URL configured in .env
 """
 
+import importlib.util
 import sys
 import argparse
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Use the installed package (pip install -e .); fall back to the source tree
+SRC_DIR = Path(__file__).parent.parent / "src"
+if importlib.util.find_spec("vector_store") is None:
+    sys.path.append(str(SRC_DIR))
 
 from extraction.formatting_extractor import FormattingExtractor
-from cleaning.text_cleaner import TextCleaner
+from preprocessing.text_cleaner import TextCleaner
 from chunking.langchain_chunker import LangChainChunker
-from embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder
+from embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder, max_tokens_for_chunks
 from vector_store.pgvector_client import PgVectorStore
 from config.settings import settings
 
 
-def process_pdf(file_path: str, verbose: bool = False) -> dict:
+def process_pdf(file_path: str, verbose: bool = False, device: str = "auto") -> dict:
     """
     Process and upload a PDF to the vector database.
 
     Args:
         file_path: Path to PDF file
         verbose: Print detailed progress
+        device: Embedding device ('auto' = CUDA if available, 'cpu' or 'cuda')
 
     Returns:
         dict with document_id, filename, chunk_count, and page_count
@@ -108,15 +112,19 @@ def process_pdf(file_path: str, verbose: bool = False) -> dict:
 
     embedder = SentenceTransformerEmbedder(
         model_name=settings.embedding_model,
-        device="cpu",
-        normalize=settings.embedding_normalize
+        device=None if device == "auto" else device,
+        normalize=settings.embedding_normalize,
+        half_precision=True,
+        max_seq_length=max_tokens_for_chunks(settings.max_chunk_size),
+        backend=settings.embedding_backend,
+        onnx_file=settings.embedding_onnx_file or None
     )
 
     texts = [chunk['text'] for chunk in chunks]
-    embeddings = embedder.embed_batch(texts)
+    embeddings = embedder.embed_batch_array(texts)  # float32 matrix, one row per chunk
 
     if verbose:
-        print(f"  ✓ Generated {len(embeddings)} embeddings ({len(embeddings[0])} dimensions)")
+        print(f"  ✓ Generated {embeddings.shape[0]} embeddings ({embeddings.shape[1]} dimensions)")
 
     # Step 5: Store in database
     if verbose:
@@ -129,28 +137,18 @@ def process_pdf(file_path: str, verbose: bool = False) -> dict:
     )
 
     try:
-        # Insert document
-        document_id = store.insert_document(
-            filename=pdf_path.name,
-            page_count=page_count,
-            metadata={
+        # Insert document and chunks (embeddings passed as the matrix) in one transaction
+        [document_id] = store.insert_documents([{
+            "filename": pdf_path.name,
+            "page_count": page_count,
+            "metadata": {
                 "file_size": pdf_path.stat().st_size,
                 "extractor": "FormattingExtractor",
                 "original_path": str(pdf_path.absolute())
-            }
-        )
-
-        # Insert chunks with embeddings
-        chunks_with_embeddings = [
-            {
-                "text": chunk['text'],
-                "embedding": embedding,
-                "metadata": chunk['metadata']
-            }
-            for chunk, embedding in zip(chunks, embeddings)
-        ]
-
-        chunk_ids = store.insert_chunks(document_id, chunks_with_embeddings)
+            },
+            "chunks": chunks,
+            "embeddings": embeddings
+        }])
 
         if verbose:
             print(f"  ✓ Uploaded to database")
@@ -158,7 +156,7 @@ def process_pdf(file_path: str, verbose: bool = False) -> dict:
         return {
             "document_id": document_id,
             "filename": pdf_path.name,
-            "chunk_count": len(chunk_ids),
+            "chunk_count": len(chunks),
             "page_count": page_count
         }
 
@@ -193,11 +191,18 @@ After uploading, query with:
         help='Show detailed progress'
     )
 
+    parser.add_argument(
+        '--device',
+        choices=['auto', 'cpu', 'cuda'],
+        default='auto',
+        help='Device for the embedding model (default: auto = CUDA if available)'
+    )
+
     args = parser.parse_args()
 
     try:
         # Process and upload
-        result = process_pdf(args.file, verbose=args.verbose)
+        result = process_pdf(args.file, verbose=args.verbose, device=args.device)
 
         # Print success message
         print()
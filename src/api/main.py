@@ -7,10 +7,15 @@ Provides REST API for uploading PDFs, searching documents, and managing the vect
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import time
 import logging
 
 from api.routes import health, documents, search
+from config.settings import settings
+from api.services.rag_service import get_rag_service, close_rag_service
+from api.services.upload_queue import get_upload_queue
+from vector_store.pool import dispose_engines
 
 # Configure logging
 logging.basicConfig(
@@ -28,13 +33,15 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# CORS middleware - configure based on your needs
+# CORS middleware - origins from CORS_ORIGINS; methods/headers limited to what the API uses
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=settings.cors_origins,
+    # Credentials can't be combined with a wildcard origin
+    allow_credentials="*" not in settings.cors_origins,
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=3600,  # Browsers cache preflight responses for an hour (default 10 min)
 )
 
 
@@ -73,6 +80,20 @@ app.include_router(search.router, prefix="/api/v1", tags=["Search"])
 async def startup_event():
     """Initialize services on startup"""
     logger.info("Starting RAG Document Search API...")
+
+    # Build the service and run one encode and one query now, so the first
+    # request doesn't pay for model loading and lazy initialization
+    try:
+        service = await asyncio.to_thread(get_rag_service)
+        await asyncio.to_thread(service.warmup)
+        logger.info("RAG service initialized and warmed up")
+    except Exception as e:
+        # Keep serving (health checks report the problem); the service is
+        # created on first request instead
+        logger.warning(f"RAG service warmup failed: {e}")
+
+    get_upload_queue().start()
+
     logger.info("API documentation available at /docs")
 
 
@@ -80,6 +101,9 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down RAG Document Search API...")
+    await get_upload_queue().stop()
+    close_rag_service()
+    dispose_engines()
 
 
 @app.get("/", tags=["Root"])
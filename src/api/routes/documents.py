@@ -3,43 +3,69 @@ Document management endpoints - upload, list, get, delete.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi.responses import StreamingResponse
+from api.models.schemas import DocumentUploadResponse
 from api.schemas.responses import (
     DocumentListResponse,
     DocumentInfo,
     UploadResponse,
+    UploadJobResponse,
     DeleteResponse,
     StatsResponse,
     DocumentMetadata
 )
 from api.services.rag_service import get_rag_service, RAGService
+from api.services.upload_queue import get_upload_queue, UploadQueue
 from pathlib import Path
+import asyncio
+import json
+import shutil
 import tempfile
-import os
 import logging
 
+# Try to import orjson for faster JSON encoding (falls back to json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Copy buffer for streaming uploads to disk
+UPLOAD_COPY_BUFFER_SIZE = 1 << 20  # 1 MB
+
+# Documents fetched per database round trip when exporting
+EXPORT_BATCH_SIZE = 500
+
+
+def _json_line(obj) -> bytes:
+    """One JSON Lines record, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
 
-@router.post("/documents/upload", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/documents/upload", response_model=DocumentUploadResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_document(
     file: UploadFile = File(..., description="PDF file to upload"),
-    rag_service: RAGService = Depends(get_rag_service)
+    upload_queue: UploadQueue = Depends(get_upload_queue)
 ):
     """
-    Upload and process a PDF document.
+    Upload a PDF document and queue it for processing.
 
-    **Process:**
-    1. Validates PDF file
-    2. Extracts text using FormattingExtractor
-    3. Cleans extracted text
-    4. Creates chunks (section-aware)
-    5. Generates embeddings
-    6. Stores in pgVector database
+    **Process (in the background):**
+    1. Extracts text using FormattingExtractor
+    2. Cleans extracted text
+    3. Creates chunks (section-aware)
+    4. Generates embeddings
+    5. Stores in pgVector database
 
-    **Returns:** Document ID, processing stats, and timing information
+    **Returns:** Job ID with status "queued"
 
-    **Note:** Processing happens synchronously. For large PDFs, this may take 2-5 seconds.
+    **Note:** Processing takes 2-5 seconds for large PDFs. Poll
+    GET /documents/jobs/{job_id} for the document ID and processing stats.
     """
     # Validate file type
     if not file.filename.endswith('.pdf'):
@@ -48,40 +74,59 @@ async def upload_document(
             detail="Only PDF files are supported"
         )
 
-    # Save uploaded file temporarily
+    # Save uploaded file temporarily, streaming in 1 MB blocks off the event loop
     with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
         temp_path = temp_file.name
-        content = await file.read()
-        temp_file.write(content)
+        await asyncio.to_thread(shutil.copyfileobj, file.file, temp_file, UPLOAD_COPY_BUFFER_SIZE)
 
-    try:
-        # Process the PDF
-        result = await rag_service.process_pdf(
-            file_path=temp_path,
-            original_filename=file.filename,
-            relative_path=file.filename
+    # The queue deletes the temporary file once the job has run
+    job = upload_queue.submit(temp_path, file.filename)
+
+    return DocumentUploadResponse(
+        job_id=job['job_id'],
+        filename=job['filename'],
+        status=job['status']
+    )
+
+
+@router.get("/documents/jobs/{job_id}", response_model=UploadJobResponse)
+async def get_upload_job(
+    job_id: str,
+    upload_queue: UploadQueue = Depends(get_upload_queue)
+):
+    """
+    Get the status of an upload job.
+
+    **Parameters:**
+    - job_id: ID returned by POST /documents/upload
+
+    **Returns:** Job status (queued, processing, completed, failed); the
+    document ID and processing stats once completed, or the error if failed
+    """
+    job = upload_queue.get(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Upload job not found: {job_id}"
         )
 
-        return UploadResponse(
+    result = job['result']
+
+    return UploadJobResponse(
+        job_id=job['job_id'],
+        filename=job['filename'],
+        status=job['status'],
+        result=UploadResponse(
             document_id=result['document_id'],
             filename=result['filename'],
             page_count=result['page_count'],
             chunk_count=result['chunk_count'],
             status="completed",
             processing_time_ms=result['processing_time_ms']
-        )
-
-    except Exception as e:
-        logger.error(f"Error processing {file.filename}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process document: {str(e)}"
-        )
-
-    finally:
-        # Clean up temporary file
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+        ) if result else None,
+        error=job['error']
+    )
 
 
 @router.get("/documents", response_model=DocumentListResponse)
@@ -134,6 +179,25 @@ async def list_documents(
         )
 
 
+@router.get("/documents/export")
+async def export_documents(rag_service: RAGService = Depends(get_rag_service)):
+    """
+    Stream every document as JSON Lines (one document per line, newest first).
+
+    Unlike GET /documents there is no limit: rows are read through a
+    server-side cursor and written as they arrive, so admin tools can dump
+    thousands of documents without the API holding them all in memory.
+
+    **Returns:** application/x-ndjson stream of documents in the same format
+    as the entries of GET /documents
+    """
+    async def generate_ndjson():
+        async for doc in rag_service.iter_documents(batch_size=EXPORT_BATCH_SIZE):
+            yield _json_line(doc)
+
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+
 @router.get("/documents/{document_id}", response_model=DocumentInfo)
 async def get_document(
     document_id: str,
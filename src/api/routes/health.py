@@ -2,6 +2,8 @@
 Health check endpoint.
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends
 from api.schemas.responses import HealthResponse
 from api.services.rag_service import get_rag_service, RAGService
@@ -17,7 +19,7 @@ async def health_check(rag_service: RAGService = Depends(get_rag_service)):
 
     Returns system health including database and embedder status.
     """
-    health_status = rag_service.health_check()
+    health_status = await asyncio.to_thread(rag_service.health_check)
 
     return HealthResponse(
         status=health_status['status'],
@@ -3,8 +3,8 @@ Search endpoints for document querying.
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from api.schemas.requests import SearchRequest
-from api.schemas.responses import SearchResponse, SearchResult
+from api.schemas.requests import SearchRequest, BatchSearchRequest
+from api.schemas.responses import SearchResponse, BatchSearchResponse
 from api.services.rag_service import get_rag_service, RAGService
 
 router = APIRouter()
@@ -40,15 +40,40 @@ async def search_documents(
             document_id=request.document_id
         )
 
-        return SearchResponse(
-            query=result['query'],
-            results=[SearchResult(**r) for r in result['results']],
-            total_results=result['total_results'],
-            search_time_ms=result['search_time_ms']
-        )
+        # Returned as a dict: FastAPI validates it against SearchResponse once
+        # and serializes straight to JSON, instead of building models here first
+        return result
 
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Search failed: {str(e)}"
         )
+
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_documents_batch(
+    request: BatchSearchRequest,
+    rag_service: RAGService = Depends(get_rag_service)
+):
+    """
+    Search documents for several queries in one request.
+
+    Query embeddings are generated in a single batch, which is much cheaper
+    than one request per query. Results are returned in request order, each
+    in the same shape as a `/search` response.
+    """
+    try:
+        result = await rag_service.search_documents_batch(
+            queries=request.queries,
+            top_k=request.top_k,
+            document_id=request.document_id
+        )
+
+        return result  # validated against BatchSearchResponse by FastAPI (see search_documents)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch search failed: {str(e)}"
+        )
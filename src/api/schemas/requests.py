@@ -3,7 +3,7 @@ Pydantic request models for API endpoints.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 
 class SearchRequest(BaseModel):
@@ -35,3 +35,37 @@ class SearchRequest(BaseModel):
                 "top_k": 3
             }
         }
+
+
+class BatchSearchRequest(BaseModel):
+    """Request model for searching several queries in one call"""
+    queries: List[str] = Field(
+        ...,
+        description="Natural language search queries",
+        min_length=1,
+        max_length=100,
+        example=["What are the stock option vesting terms?", "Who are the board members?"]
+    )
+    top_k: int = Field(
+        default=3,
+        description="Number of results to return per query",
+        ge=1,
+        le=20,
+        example=3
+    )
+    document_id: Optional[str] = Field(
+        default=None,
+        description="Optional: Filter results to specific document UUID",
+        example="123e4567-e89b-12d3-a456-426614174000"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "queries": [
+                    "What are the vesting terms for stock options?",
+                    "Who are the board members?"
+                ],
+                "top_k": 3
+            }
+        }
@@ -76,6 +76,15 @@ class UploadResponse(BaseModel):
         }
 
 
+class UploadJobResponse(BaseModel):
+    """Status of a background upload job"""
+    job_id: str = Field(..., description="Upload job ID")
+    filename: str = Field(..., description="Uploaded filename")
+    status: str = Field(..., description="queued, processing, completed or failed", example="completed")
+    result: Optional[UploadResponse] = Field(default=None, description="Processing result (when completed)")
+    error: Optional[str] = Field(default=None, description="Error message (when failed)")
+
+
 class SearchResult(BaseModel):
     """Single search result"""
     text: str = Field(..., description="Chunk text content")
@@ -128,6 +137,13 @@ class SearchResponse(BaseModel):
         }
 
 
+class BatchSearchResponse(BaseModel):
+    """Batch search results response"""
+    results: List[SearchResponse] = Field(..., description="Search results, one entry per query (in request order)")
+    total_queries: int = Field(..., description="Number of queries searched")
+    search_time_ms: int = Field(..., description="Total execution time in milliseconds")
+
+
 class DeleteResponse(BaseModel):
     """Document deletion response"""
     deleted: bool = Field(..., description="Whether deletion was successful")
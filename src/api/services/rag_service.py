@@ -4,41 +4,132 @@ RAG Service - Business logic for document processing and search.
 Reuses logic from scripts/ folder for consistency.
 """
 
+import asyncio
+import multiprocessing
+import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence, Tuple
 import logging
 
+import numpy as np
+
 from vector_store.pgvector_client import PgVectorStore
+from vector_store.pool import get_engine
+from vector_store.memory_index import MemoryVectorIndex
 from extraction.formatting_extractor import FormattingExtractor
 from preprocessing.text_cleaner import TextCleaner
 from chunking import create_chunker, get_chunker_info
-from embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder
+from embeddings.cache import get_embedder
+from embeddings.chunk_cache import ChunkEmbeddingCache
 from config.settings import settings
+from utils.cpu import configure_compute_threads
 
 logger = logging.getLogger(__name__)
 
+# Before the embedding model (and with it torch / onnxruntime) is loaded
+configure_compute_threads()
+
+
+def extract_clean_chunk(file_path: str, original_filename: str, extractor, cleaner, chunker):
+    """
+    Extract, clean and chunk one PDF.
+
+    Returns:
+        (chunks, page_count, cleaning warnings)
+    """
+    # 1. Extract
+    logger.info(f"Extracting text from {original_filename}")
+    extraction_result = extractor.extract(file_path)
+
+    # 2. Clean
+    logger.info(f"Cleaning text from {original_filename}")
+    cleaned_text, warnings = cleaner.clean(extraction_result.extracted_text)
+
+    # 3. Chunk
+    logger.info(f"Chunking text from {original_filename}")
+    chunks = chunker.chunk(cleaned_text)
+
+    return chunks, extraction_result.metadata.get('page_count', 0), warnings
+
+
+# Per-process pipeline for extraction workers (built once by _init_extract_worker)
+_worker_pipeline = None
+
+
+def _init_extract_worker():
+    """Build the extract/clean/chunk components once per worker process"""
+    global _worker_pipeline
+    _worker_pipeline = (FormattingExtractor(debug=False), TextCleaner(), create_chunker())
+
+
+def _extract_in_worker(file_path: str, original_filename: str):
+    extractor, cleaner, chunker = _worker_pipeline
+    return extract_clean_chunk(file_path, original_filename, extractor, cleaner, chunker)
+
+
+def _format_document(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Document dict from the store in API format"""
+    return {
+        'id': str(doc['id']),
+        'filename': doc['filename'],
+        'upload_date': doc['upload_date'],
+        'page_count': doc['page_count'],
+        'chunk_count': doc['chunk_count'],
+        'metadata': doc.get('metadata', {})
+    }
+
 
 class RAGService:
     """Service for RAG operations - document processing and search"""
 
     def __init__(self):
         """Initialize RAG service with all components"""
+        # Process-wide pool: connections (and their prepared statements) are
+        # kept across requests instead of reconnecting per store
         self.store = PgVectorStore(
             connection_string=settings.database_url,
             embedding_dim=settings.embedding_dimension,
-            debug=False
+            debug=False,
+            engine=get_engine(settings.database_url)
         )
 
-        self.embedder = SentenceTransformerEmbedder(
+        # Shared per process (model load takes seconds)
+        self.embedder = get_embedder(
             model_name=settings.embedding_model,
             device='cpu'
         )
 
+        # LRU of (model, normalized query) -> embedding; repeated queries skip the forward pass
+        self._query_embeddings: "OrderedDict[Tuple[str, str], Tuple[float, ...]]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
+
+        # Chunk text -> embedding on disk; shared boilerplate and re-uploads skip the model
+        self.chunk_cache: Optional[ChunkEmbeddingCache] = None
+        if settings.chunk_cache_max_entries > 0:
+            self.chunk_cache = ChunkEmbeddingCache(
+                model_name=self.embedder.model_name,
+                backend=self.embedder.backend,
+                onnx_file=self.embedder.onnx_file,
+                normalize=self.embedder.normalize
+            )
+
         self.extractor = FormattingExtractor(debug=False)
         self.cleaner = TextCleaner()
         self.chunker = create_chunker()  # Uses settings.chunker_type
 
+        # In-process mirror of the chunk embeddings (loaded by warmup(), see load_memory_index())
+        self.memory_index: Optional[MemoryVectorIndex] = None
+
+        # Process pool for extracting several uploads at once (created on first use)
+        self._extract_pool: Optional[ProcessPoolExecutor] = None
+        self._extract_pool_lock = threading.Lock()
+
         chunker_info = get_chunker_info(self.chunker)
         logger.info(
             f"RAG Service initialized with {chunker_info['type']} "
@@ -46,11 +137,75 @@ class RAGService:
             f"overlap={chunker_info['chunk_overlap']})"
         )
 
+    def warmup(self):
+        """
+        Run one encode and one database query, so the first request doesn't
+        pay for lazy initialization (model graph, pooled connection, plans).
+        """
+        self.embedder.warmup()
+        self.store.list_documents(limit=1)
+        self.store.prepare_search_statements(connections=settings.db_pool_size)
+        self.load_memory_index()
+
+    def load_memory_index(self):
+        """
+        Mirror all chunk embeddings in memory if the corpus is small enough.
+
+        Enabled by settings.memory_index_max_chunks; larger corpora (and
+        failed loads) keep searching in Postgres.
+        """
+        max_chunks = settings.memory_index_max_chunks
+        if max_chunks <= 0:
+            return
+
+        chunk_count = self.store.get_stats()['chunk_count']
+        if chunk_count > max_chunks:
+            logger.info(f"Memory index disabled: {chunk_count} chunks exceed {max_chunks}")
+            self.memory_index = None
+            return
+
+        index = MemoryVectorIndex(self.store.embedding_dim)
+        index.add(*self.store.get_chunk_vectors())
+        self.memory_index = index
+        logger.info(f"Memory index loaded with {len(index)} chunks")
+
+    def _update_memory_index(self, document_ids: List[str]):
+        """Add newly stored documents to the memory index (dropping it once the corpus outgrows it)"""
+        index = self.memory_index
+        if index is None or not document_ids:
+            return
+
+        try:
+            index.add(*self.store.get_chunk_vectors(document_ids))
+        except Exception as e:
+            logger.warning(f"Memory index disabled, could not add documents: {e}")
+            self.memory_index = None
+            return
+
+        if len(index) > settings.memory_index_max_chunks:
+            logger.info(f"Memory index disabled: {len(index)} chunks exceed {settings.memory_index_max_chunks}")
+            self.memory_index = None
+
     async def process_pdf(
         self,
         file_path: str,
         original_filename: str,
         relative_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a PDF through the full RAG pipeline without blocking the event loop.
+
+        Runs process_pdf_sync() in a worker thread; see it for arguments and return value.
+        """
+        return await asyncio.to_thread(
+            self.process_pdf_sync, file_path, original_filename, relative_path
+        )
+
+    def process_pdf_sync(
+        self,
+        file_path: str,
+        original_filename: str,
+        relative_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process a PDF through the full RAG pipeline.
@@ -65,66 +220,204 @@ class RAGService:
         Returns:
             Dict with document_id, filename, page_count, chunk_count, processing_time_ms
         """
-        start_time = time.time()
+        [result] = self.process_pdfs_sync([{
+            'file_path': file_path,
+            'original_filename': original_filename,
+            'relative_path': relative_path
+        }])
 
-        try:
-            # 1. Extract
-            logger.info(f"Extracting text from {original_filename}")
-            extraction_result = self.extractor.extract(file_path)
-
-            # 2. Clean
-            logger.info(f"Cleaning text from {original_filename}")
-            cleaned_text, warnings = self.cleaner.clean(extraction_result.extracted_text)
-
-            # 3. Chunk
-            logger.info(f"Chunking text from {original_filename}")
-            chunks = self.chunker.chunk(cleaned_text)
-
-            # 4. Embed
-            logger.info(f"Generating embeddings for {len(chunks)} chunks")
-            texts = [chunk['text'] for chunk in chunks]
-            embeddings = self.embedder.embed_batch(texts)
-
-            # Add embeddings to chunks
-            chunks_with_embeddings = []
-            for chunk, embedding in zip(chunks, embeddings):
-                chunk['embedding'] = embedding
-                chunks_with_embeddings.append(chunk)
-
-            # 5. Store
-            logger.info(f"Storing document in database")
-            page_count = extraction_result.metadata.get('page_count', 0)
-
-            metadata = {
-                'source_path': file_path,
-                'relative_path': relative_path or original_filename,
-                'extraction_method': 'FormattingExtractor',
-                'cleaning_warnings': len(warnings)
-            }
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-            document_id = self.store.insert_document(
-                filename=original_filename,
-                page_count=page_count,
-                metadata=metadata
-            )
+    async def process_pdfs(self, files: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Process several PDFs together without blocking the event loop.
 
-            self.store.insert_chunks(document_id, chunks_with_embeddings)
+        Runs process_pdfs_sync() in a worker thread; see it for arguments and return value.
+        """
+        return await asyncio.to_thread(self.process_pdfs_sync, files)
 
-            processing_time_ms = int((time.time() - start_time) * 1000)
+    def process_pdfs_sync(self, files: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Process several PDFs as one batch.
 
-            logger.info(f"Successfully processed {original_filename} ({processing_time_ms}ms)")
+        Each PDF is extracted, cleaned and chunked on its own; then the chunks
+        of all PDFs are embedded in a single embed_batch_array call (the
+        model batches chunks across documents) and stored in a single
+        transaction. If that transaction fails, documents are stored one by
+        one so a bad document doesn't fail the others.
 
-            return {
-                'document_id': document_id,
-                'filename': original_filename,
+        Args:
+            files: Dicts with 'file_path', 'original_filename' and optional 'relative_path'
+
+        Returns:
+            One entry per file, in order: a result dict as from process_pdf_sync(),
+            or the exception that file failed with
+        """
+        start_time = time.time()
+        results: List[Any] = [None] * len(files)
+
+        # 1-3. Extract, clean, chunk (per file)
+        prepared = []
+        for i, (file, outcome) in enumerate(zip(files, self._extract_all(files))):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error processing {file['original_filename']}: {outcome}")
+                results[i] = outcome
+            else:
+                prepared.append((i, outcome))
+
+        if not prepared:
+            return results
+
+        # 4. Embed all chunks of all files in one call
+        texts = [chunk['text'] for _, (chunks, _, _) in prepared for chunk in chunks]
+        logger.info(f"Generating embeddings for {len(texts)} chunks from {len(prepared)} documents")
+        try:
+            embeddings = self._embed_chunks(texts)  # float32 matrix, one row per chunk
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            for i, _ in prepared:
+                results[i] = e
+            return results
+
+        # 5. Store
+        documents = []
+        offset = 0
+        for i, (chunks, page_count, warnings) in prepared:
+            file = files[i]
+            documents.append({
+                'filename': file['original_filename'],
                 'page_count': page_count,
-                'chunk_count': len(chunks_with_embeddings),
+                'metadata': {
+                    'source_path': file['file_path'],
+                    'relative_path': file.get('relative_path') or file['original_filename'],
+                    'extraction_method': 'FormattingExtractor',
+                    'cleaning_warnings': len(warnings)
+                },
+                'chunks': chunks,
+                'embeddings': embeddings[offset:offset + len(chunks)]
+            })
+            offset += len(chunks)
+
+        logger.info(f"Storing {len(documents)} documents in database")
+        try:
+            # All documents and chunks in one transaction
+            document_ids = self.store.insert_documents(documents)
+        except Exception as e:
+            if len(documents) == 1:
+                logger.error(f"Error storing {documents[0]['filename']}: {e}")
+                results[prepared[0][0]] = e
+                return results
+            document_ids = []
+            for document in documents:
+                try:
+                    document_ids.extend(self.store.insert_documents([document]))
+                except Exception as e:
+                    logger.error(f"Error storing {document['filename']}: {e}")
+                    document_ids.append(e)
+
+        processing_time_ms = int((time.time() - start_time) * 1000)
+
+        self._update_memory_index([d for d in document_ids if not isinstance(d, Exception)])
+
+        for (i, _), document, document_id in zip(prepared, documents, document_ids):
+            if isinstance(document_id, Exception):
+                results[i] = document_id
+                continue
+
+            logger.info(f"Successfully processed {document['filename']} ({processing_time_ms}ms)")
+            results[i] = {
+                'document_id': document_id,
+                'filename': document['filename'],
+                'page_count': document['page_count'],
+                'chunk_count': len(document['chunks']),
                 'processing_time_ms': processing_time_ms
             }
 
-        except Exception as e:
-            logger.error(f"Error processing {original_filename}: {e}")
-            raise
+        return results
+
+    def _embed_chunks(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed chunk texts, embedding each distinct text once.
+
+        Repeated texts (within the batch, or seen by earlier uploads and still
+        in the chunk cache) reuse their vector; only the rest go to the model.
+
+        Returns:
+            float32 matrix, one row per text (as embed_batch_array())
+        """
+        if not texts:
+            return self.embedder.embed_batch_array(texts)
+
+        unique = list(dict.fromkeys(texts))
+        if self.chunk_cache is not None:
+            vectors = dict(zip(unique, self.chunk_cache.get_many(unique)))
+        else:
+            vectors = dict.fromkeys(unique)
+
+        missing = [text for text, vector in vectors.items() if vector is None]
+        if missing:
+            embeddings = self.embedder.embed_batch_array(missing)
+            vectors.update(zip(missing, embeddings))
+            if self.chunk_cache is not None:
+                self.chunk_cache.put_many(missing, embeddings)
+
+        logger.info(f"Embedded {len(missing)} of {len(texts)} chunks ({len(texts) - len(missing)} reused)")
+        return np.stack([vectors[text] for text in texts])
+
+    def _extract_all(self, files: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Extract, clean and chunk several PDFs.
+
+        PDF parsing is CPU-bound and mostly holds the GIL, so with more than
+        one file (and settings.upload_extract_workers > 1) the files are
+        processed in parallel in a process pool; a single file runs here,
+        without the pickling round trip.
+
+        Returns:
+            One (chunks, page_count, warnings) tuple or exception per file, in order
+        """
+        if len(files) > 1 and settings.upload_extract_workers > 1:
+            pool = self._get_extract_pool()
+            futures = [
+                pool.submit(_extract_in_worker, file['file_path'], file['original_filename'])
+                for file in files
+            ]
+
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. killed for memory); start a new pool next time
+                    with self._extract_pool_lock:
+                        self._extract_pool = None
+                    outcomes.append(e)
+                except Exception as e:
+                    outcomes.append(e)
+            return outcomes
+
+        outcomes = []
+        for file in files:
+            try:
+                outcomes.append(extract_clean_chunk(
+                    file['file_path'], file['original_filename'], self.extractor, self.cleaner, self.chunker
+                ))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    def _get_extract_pool(self) -> ProcessPoolExecutor:
+        with self._extract_pool_lock:
+            if self._extract_pool is None:
+                # spawn: forking after torch has started its thread pools can deadlock
+                self._extract_pool = ProcessPoolExecutor(
+                    max_workers=settings.upload_extract_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_extract_worker
+                )
+            return self._extract_pool
 
     async def search_documents(
         self,
@@ -150,44 +443,22 @@ class RAGService:
         try:
             # Generate query embedding
             logger.info(f"Searching for: {query}")
-            query_embedding = self.embedder.embed(query)
+            # Model and database calls block, so they run in worker threads
+            # (the event loop keeps serving other requests meanwhile)
+            [query_embedding] = await asyncio.to_thread(self._embed_queries, [query])
 
-            # Build filters
-            filters = {}
-            if document_id:
-                filters['document_id'] = document_id
-
-            # Search vector store
-            results = self.store.search(
-                query_vector=query_embedding,
-                top_k=top_k,
-                filters=filters if filters else None
+            results = await asyncio.to_thread(
+                self._search_by_embedding, query_embedding, top_k, document_id
             )
 
-            # Enrich with document details
-            enriched_results = []
-            for result in results:
-                doc = self.store.get_document(result['document_id'])
-                doc_metadata = doc.get('metadata', {})
-
-                enriched_results.append({
-                    'text': result['text'],
-                    'document_name': doc['filename'],
-                    'document_id': result['document_id'],
-                    'relative_path': doc_metadata.get('relative_path', doc['filename']),
-                    'chunk_index': result['chunk_index'],
-                    'similarity': result['similarity'],
-                    'metadata': result.get('metadata', {})
-                })
-
             search_time_ms = int((time.time() - start_time) * 1000)
 
-            logger.info(f"Search completed in {search_time_ms}ms, found {len(enriched_results)} results")
+            logger.info(f"Search completed in {search_time_ms}ms, found {len(results)} results")
 
             return {
                 'query': query,
-                'results': enriched_results,
-                'total_results': len(enriched_results),
+                'results': results,
+                'total_results': len(results),
                 'search_time_ms': search_time_ms
             }
 
@@ -195,6 +466,188 @@ class RAGService:
             logger.error(f"Error searching for '{query}': {e}")
             raise
 
+    async def search_documents_batch(
+        self,
+        queries: List[str],
+        top_k: int = 3,
+        document_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Search documents for several queries at once.
+
+        All query embeddings are generated in a single batch call and all
+        vector searches run in a single SQL statement.
+
+        Args:
+            queries: Natural language search queries
+            top_k: Number of results to return per query
+            document_id: Optional filter to specific document
+
+        Returns:
+            Dict with per-query results (same shape as search_documents),
+            total_queries, search_time_ms
+        """
+        start_time = time.time()
+
+        try:
+            logger.info(f"Batch searching {len(queries)} queries")
+            query_embeddings = await asyncio.to_thread(self._embed_queries, queries)
+
+            search_start = time.time()
+            all_results = await asyncio.to_thread(
+                self._search_batch_by_embedding, query_embeddings, top_k, document_id
+            )
+            # Search time is shared by all queries in the statement
+            per_query_ms = int((time.time() - search_start) * 1000 / max(1, len(queries)))
+
+            batch_results = [
+                {
+                    'query': query,
+                    'results': results,
+                    'total_results': len(results),
+                    'search_time_ms': per_query_ms
+                }
+                for query, results in zip(queries, all_results)
+            ]
+
+            search_time_ms = int((time.time() - start_time) * 1000)
+
+            logger.info(f"Batch search of {len(queries)} queries completed in {search_time_ms}ms")
+
+            return {
+                'results': batch_results,
+                'total_queries': len(batch_results),
+                'search_time_ms': search_time_ms
+            }
+
+        except Exception as e:
+            logger.error(f"Error in batch search: {e}")
+            raise
+
+    def _embed_queries(self, queries: Sequence[str]) -> List[List[float]]:
+        """
+        Embed queries, reusing embeddings of recently seen queries.
+
+        Queries that differ only in whitespace share a cache entry. Misses are
+        embedded in one call and added to the LRU (settings.query_embedding_cache_size
+        entries, 0 disables it).
+
+        Args:
+            queries: Natural language search queries
+
+        Returns:
+            One embedding per query (fresh lists, safe to modify)
+        """
+        model_name = self.embedder.model_name
+        keys = [(model_name, " ".join(query.split())) for query in queries]
+        cache = self._query_embeddings
+
+        with self._query_embeddings_lock:
+            found = {}
+            for key in keys:
+                if key in cache:
+                    cache.move_to_end(key)
+                    found[key] = cache[key]
+
+        # Unique misses, in query order
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if missing:
+            if len(missing) == 1:
+                embeddings = [self.embedder.embed(missing[0][1])]
+            else:
+                embeddings = self.embedder.embed_batch([text for _, text in missing])
+
+            for key, embedding in zip(missing, embeddings):
+                found[key] = tuple(embedding)
+
+            max_size = settings.query_embedding_cache_size
+            if max_size > 0:
+                with self._query_embeddings_lock:
+                    for key in missing:
+                        cache[key] = found[key]
+                    while len(cache) > max_size:
+                        cache.popitem(last=False)
+
+        return [list(found[key]) for key in keys]
+
+    def _search_batch_by_embedding(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int,
+        document_id: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several vector searches in one round trip (see _search_by_embedding())"""
+        index = self.memory_index
+        if index is None:
+            return self.store.search_batch(
+                query_vectors=query_embeddings,
+                top_k=top_k,
+                filters={'document_id': document_id} if document_id else None
+            )
+
+        document_id = str(uuid.UUID(document_id)) if document_id else None
+        all_hits = [index.search(embedding, top_k, document_id) for embedding in query_embeddings]
+        # One fetch for the chunks of all queries
+        found = {
+            result['id']: result
+            for result in self.store.get_search_results([hit for hits in all_hits for hit in hits])
+        }
+        return [
+            [
+                {**found[chunk_id], 'distance': distance, 'similarity': 1 - distance}
+                for chunk_id, distance in hits
+                if chunk_id in found
+            ]
+            for hits in all_hits
+        ]
+
+    def _search_by_embedding(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        document_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a vector search for the API.
+
+        Args:
+            query_embedding: Query embedding vector
+            top_k: Number of results to return
+            document_id: Optional filter to specific document
+
+        Returns:
+            Vector store hit dicts, used as API SearchResult dicts without
+            copying (document name/path are joined by the store; keys the
+            response model doesn't declare are dropped when it serializes)
+        """
+        index = self.memory_index
+        if index is not None:
+            # Exact scan in memory; Postgres only fetches the top chunks
+            document_id = str(uuid.UUID(document_id)) if document_id else None
+            return self.store.get_search_results(index.search(query_embedding, top_k, document_id))
+
+        # Build filters
+        filters = {}
+        if document_id:
+            filters['document_id'] = document_id
+
+        # Search vector store (document name/path are joined in the query)
+        if settings.search_oversample > 0:
+            results = self.store.search_rescored(
+                query_vector=query_embedding,
+                top_k=top_k,
+                filters=filters if filters else None,
+                oversample=settings.search_oversample
+            )
+        else:
+            results = self.store.search(
+                query_vector=query_embedding,
+                top_k=top_k,
+                filters=filters if filters else None
+            )
+
+        return results
+
     async def list_documents(
         self,
         limit: int = 100,
@@ -213,19 +666,10 @@ class RAGService:
             Dict with documents list and total count
         """
         try:
-            documents = self.store.list_documents(limit=limit, offset=offset)
+            documents = await asyncio.to_thread(self.store.list_documents, limit=limit, offset=offset)
 
             # Convert to API format
-            formatted_docs = []
-            for doc in documents:
-                formatted_docs.append({
-                    'id': str(doc['id']),
-                    'filename': doc['filename'],
-                    'upload_date': doc['upload_date'],
-                    'page_count': doc['page_count'],
-                    'chunk_count': doc['chunk_count'],
-                    'metadata': doc.get('metadata', {})
-                })
+            formatted_docs = [_format_document(doc) for doc in documents]
 
             return {
                 'documents': formatted_docs,
@@ -236,6 +680,31 @@ class RAGService:
             logger.error(f"Error listing documents: {e}")
             raise
 
+    async def iter_documents(self, batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all documents, newest first, in API format.
+
+        Rows come from the store's server-side cursor and are fetched off the
+        event loop batch_size at a time, so memory use does not grow with the
+        number of documents.
+
+        Args:
+            batch_size: Number of documents fetched per round trip
+
+        Yields:
+            Document dicts (same format as list_documents)
+        """
+        rows = self.store.iter_documents(batch_size=batch_size)
+        try:
+            while True:
+                batch = await asyncio.to_thread(lambda: list(islice(rows, batch_size)))
+                if not batch:
+                    break
+                for doc in batch:
+                    yield _format_document(doc)
+        finally:
+            rows.close()  # closes the cursor's session if the client went away
+
     async def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a specific document by ID.
@@ -247,7 +716,7 @@ class RAGService:
             Document info or None if not found
         """
         try:
-            doc = self.store.get_document(document_id)
+            doc = await asyncio.to_thread(self.store.get_document, document_id)
             if not doc:
                 return None
 
@@ -278,14 +747,16 @@ class RAGService:
         """
         try:
             # Get document info before deletion
-            doc = self.store.get_document(document_id)
+            doc = await asyncio.to_thread(self.store.get_document, document_id)
             if not doc:
                 raise ValueError(f"Document not found: {document_id}")
 
             chunk_count = doc['chunk_count']
 
             # Delete document (cascades to chunks)
-            self.store.delete_document(document_id)
+            await asyncio.to_thread(self.store.delete_document, document_id)
+            if self.memory_index is not None:
+                self.memory_index.remove_document(str(uuid.UUID(document_id)))
 
             logger.info(f"Deleted document {document_id} and {chunk_count} chunks")
 
@@ -309,7 +780,7 @@ class RAGService:
             Dict with database stats
         """
         try:
-            stats = self.store.get_stats()
+            stats = await asyncio.to_thread(self.store.get_stats)
 
             return {
                 'total_documents': stats['document_count'],
@@ -347,18 +818,42 @@ class RAGService:
         }
 
     def close(self):
-        """Close database connections"""
+        """Close database connections and shut down the extraction processes"""
+        with self._extract_pool_lock:
+            if self._extract_pool is not None:
+                self._extract_pool.shutdown(cancel_futures=True)
+                self._extract_pool = None
+
         if self.store:
             self.store.close()
 
+        if self.chunk_cache is not None:
+            self.chunk_cache.close()
+
 
-# Global service instance
 _rag_service: Optional[RAGService] = None
+_rag_service_lock = threading.Lock()
 
 
 def get_rag_service() -> RAGService:
-    """Dependency injection for RAG service"""
+    """
+    Dependency injection for RAG service (one instance per process).
+
+    FastAPI runs sync dependencies in its thread pool, so a burst of first
+    requests can call this concurrently; the lock makes sure only one of
+    them builds the service (and loads the model).
+    """
     global _rag_service
+
     if _rag_service is None:
-        _rag_service = RAGService()
+        with _rag_service_lock:
+            if _rag_service is None:
+                _rag_service = RAGService()
+
     return _rag_service
+
+
+def close_rag_service():
+    """Close the service if it was created (on application shutdown)"""
+    if _rag_service is not None:
+        _rag_service.close()
@@ -0,0 +1,147 @@
+"""
+Background processing of uploaded PDFs.
+
+Extracting, chunking and embedding a PDF takes seconds. Rather than holding
+the HTTP request open for that long, the upload route saves the file, queues
+a job and returns its id immediately; a fixed number of worker tasks process
+queued jobs in threads, and clients poll the job status.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from api.services.rag_service import get_rag_service
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for status lookups (oldest are forgotten first)
+MAX_FINISHED_JOBS = 1000
+
+
+class UploadQueue:
+    """asyncio.Queue of uploaded PDFs with a pool of worker tasks"""
+
+    def __init__(self, max_concurrency: Optional[int] = None, batch_size: Optional[int] = None):
+        """
+        Args:
+            max_concurrency: Batches processed at the same time (uses settings if not provided)
+            batch_size: Most queued PDFs one worker processes together (uses settings if not provided)
+        """
+        self.max_concurrency = max(1, max_concurrency or settings.upload_max_concurrency)
+        self.batch_size = max(1, batch_size or settings.upload_batch_size)
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker tasks (must be called from the running event loop)"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"upload-worker-{i}")
+            for i in range(self.max_concurrency)
+        ]
+        logger.info(f"Upload queue started with {self.max_concurrency} workers")
+
+    async def stop(self):
+        """Cancel the workers and delete the files of jobs that never ran"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while self._queue is not None and not self._queue.empty():
+            job_id, temp_path = self._queue.get_nowait()
+            self.jobs[job_id].update(status='failed', error='Server shut down before processing')
+            _remove_file(temp_path)
+
+    def submit(self, temp_path: str, filename: str) -> Dict[str, Any]:
+        """
+        Queue a saved PDF for processing. The queue takes ownership of temp_path
+        and deletes it when the job finishes.
+
+        Returns:
+            Job dict (job_id, filename, status='queued')
+        """
+        self.start()
+
+        job = {
+            'job_id': str(uuid.uuid4()),
+            'filename': filename,
+            'status': 'queued',
+            'submitted_at': time.time(),
+            'result': None,
+            'error': None
+        }
+        self.jobs[job['job_id']] = job
+        self._queue.put_nowait((job['job_id'], temp_path))
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job dict for a job id, or None if unknown (or already forgotten)"""
+        return self.jobs.get(job_id)
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Take whatever else is already waiting, so one embedder call and
+            # one transaction cover several uploads
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            jobs = [self.jobs[job_id] for job_id, _ in batch]
+            for job in jobs:
+                job['status'] = 'processing'
+            try:
+                service = await asyncio.to_thread(get_rag_service)
+                results = await asyncio.to_thread(service.process_pdfs_sync, [
+                    {
+                        'file_path': temp_path,
+                        'original_filename': job['filename'],
+                        'relative_path': job['filename']
+                    }
+                    for (_, temp_path), job in zip(batch, jobs)
+                ])
+            except Exception as e:
+                results = [e] * len(jobs)
+            finally:
+                for _, temp_path in batch:
+                    _remove_file(temp_path)
+                    self._queue.task_done()
+
+            for job, result in zip(jobs, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error processing {job['filename']}: {result}")
+                    job['status'] = 'failed'
+                    job['error'] = str(result)
+                else:
+                    job['result'] = result
+                    job['status'] = 'completed'
+            self._forget_old_jobs()
+
+    def _forget_old_jobs(self):
+        finished = [
+            job_id for job_id, job in self.jobs.items()
+            if job['status'] in ('completed', 'failed')
+        ]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+
+def _remove_file(path: str):
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+@lru_cache(maxsize=1)
+def get_upload_queue() -> UploadQueue:
+    """Dependency injection for the upload queue (one instance per process)"""
+    return UploadQueue()
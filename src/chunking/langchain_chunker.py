@@ -4,22 +4,45 @@ LangChain-based text chunking with section awareness.
 Ported from original PDF_Processor.py chunking logic.
 """
 
-import re
 from typing import List, Dict, Any, Optional
 from langchain.text_splitter import RecursiveCharacterTextSplitter, MarkdownHeaderTextSplitter
 from langchain.schema import Document
 
 from chunking.base_chunker import BaseChunker
 from config.settings import settings
-from config.constants import MARKDOWN_HEADERS, CHUNK_SEPARATORS
+from config.constants import (
+    MARKDOWN_HEADERS,
+    CHUNK_SEPARATORS,
+    PATTERN_MAIN_SECTION,
+    PATTERN_SUBSECTION,
+    PATTERN_SUBSUBSECTION
+)
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Endings of lines that continue a sentence (plain suffixes, not whole words:
+# "Data" ends with "a"), checked as-is and lowercased respectively
+CONTINUATION_ENDINGS = (',', 'and', 'or', 'the', 'a', 'an', 'of', 'to', 'in')
+CONTINUATION_ENDINGS_LOWER = ('applicable to', 'conditions', 'procedures', 'including')
+
+HEADERS_TO_SPLIT_ON = [
+    ("##", "section"),
+    ("###", "subsection"),
+    ("####", "subsubsection")
+]
+
 
 class LangChainChunker(BaseChunker):
     """Chunk text using LangChain splitters with section awareness"""
 
+    # Numbered section headers, most specific first (1.1.1, then 1.1, then 1.)
+    SECTION_PATTERNS = (
+        (PATTERN_SUBSUBSECTION, '#### {} {}'),
+        (PATTERN_SUBSECTION, '### {} {}'),
+        (PATTERN_MAIN_SECTION, '## {}. {}'),
+    )
+
     def __init__(
         self,
         max_chunk_size: Optional[int] = None,
@@ -43,6 +66,18 @@ class LangChainChunker(BaseChunker):
         self.debug = debug
         self.logger = logger
 
+        # Splitters hold no per-call state, so build them once per chunker
+        self._markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=HEADERS_TO_SPLIT_ON
+        )
+        # Ensure overlap is smaller than chunk size
+        self._splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.max_chunk_size,
+            chunk_overlap=min(self.chunk_overlap, self.max_chunk_size - 1),
+            length_function=len,
+            separators=CHUNK_SEPARATORS
+        )
+
     def chunk(
         self,
         text: str,
@@ -83,21 +118,9 @@ class LangChainChunker(BaseChunker):
             self.logger.debug(f"Chunking text (section-awareness ON): {len(text)} chars")
             self.logger.debug(f"Markdown conversion complete")
 
-        # Define header hierarchy
-        headers_to_split_on = [
-            ("##", "section"),
-            ("###", "subsection"),
-            ("####", "subsubsection")
-        ]
-
-        # Create markdown splitter
-        markdown_splitter = MarkdownHeaderTextSplitter(
-            headers_to_split_on=headers_to_split_on
-        )
-
         # Split by headers
         try:
-            header_chunks = markdown_splitter.split_text(markdown_text)
+            header_chunks = self._markdown_splitter.split_text(markdown_text)
         except Exception as e:
             if self.debug:
                 self.logger.warning(f"Markdown splitting failed: {e}, falling back to basic splitting")
@@ -110,22 +133,23 @@ class LangChainChunker(BaseChunker):
         for chunk in header_chunks:
             chunk_text = chunk.page_content
             chunk_metadata = {**base_metadata, **chunk.metadata}
+            # Hierarchical context, shared by all sub-chunks of this section
+            section_hierarchy = self._section_hierarchy(chunk_metadata)
 
             # Split oversized chunks
             if len(chunk_text) > self.max_chunk_size:
-                sub_chunks = self._split_large_chunk(chunk_text, chunk_metadata)
+                sub_chunks = self._split_large_chunk(chunk_text, chunk_metadata, section_hierarchy)
                 final_chunks.extend(sub_chunks)
             else:
                 chunk_metadata["is_split_chunk"] = False
+                if section_hierarchy:
+                    chunk_metadata["section_hierarchy"] = section_hierarchy
                 final_chunks.append({
                     "text": chunk_text,
                     "metadata": chunk_metadata,
                     "chunk_size": len(chunk_text)
                 })
 
-        # Add hierarchical context
-        final_chunks = self._add_section_hierarchy(final_chunks)
-
         if self.debug:
             self.logger.debug(f"Created {len(final_chunks)} chunks")
 
@@ -142,34 +166,20 @@ class LangChainChunker(BaseChunker):
         Returns:
             Text with markdown headers
         """
-        lines = text.split('\n')
+        section_patterns = self.SECTION_PATTERNS
         output_lines = []
 
-        for line in lines:
-            # Check for sub-subsection (1.1.1)
-            match = re.match(r'^(\d+\.\d+\.\d+)\.?\s+(.+)$', line)
-            if match and self._is_likely_section_header(match.group(2)):
-                output_lines.append(f'#### {match.group(1)} {match.group(2)}')
-                continue
-
-            # Check for subsection (1.1)
-            match = re.match(r'^(\d+\.\d+)\.?\s+(.+)$', line)
-            if match and self._is_likely_section_header(match.group(2)):
-                output_lines.append(f'### {match.group(1)} {match.group(2)}')
-                continue
-
-            # Check for main section (1.)
-            match = re.match(r'^(\d+)\.\s+(.+)$', line)
-            if match and self._is_likely_section_header(match.group(2)):
-                output_lines.append(f'## {match.group(1)}. {match.group(2)}')
-                continue
-
-            # Check if line already has markdown header (from formatting extraction)
-            if line.startswith('##'):
-                output_lines.append(line)
-                continue
-
-            # Regular line - keep as is
+        for line in text.split('\n'):
+            # Only lines starting with a digit can be numbered headers
+            if line[:1].isdigit():
+                for pattern, template in section_patterns:
+                    match = pattern.match(line)
+                    if match and self._is_likely_section_header(match.group(2)):
+                        line = template.format(match.group(1), match.group(2))
+                        break
+
+            # Lines already carrying markdown headers (from formatting
+            # extraction) and regular lines are kept as is
             output_lines.append(line)
 
         return '\n'.join(output_lines)
@@ -204,12 +214,11 @@ class LangChainChunker(BaseChunker):
             return False
 
         # Ends with continuation (likely incomplete sentence from content)
-        if text.endswith((',', 'and', 'or', 'the', 'a', 'an', 'of', 'to', 'in')):
+        if text.endswith(CONTINUATION_ENDINGS):
             return False
 
         # Contains common sentence continuations
-        lowered = text.lower()
-        if any(lowered.endswith(word) for word in ['applicable to', 'conditions', 'procedures', 'including']):
+        if text.lower().endswith(CONTINUATION_ENDINGS_LOWER):
             return False
 
         return True
@@ -217,7 +226,8 @@ class LangChainChunker(BaseChunker):
     def _split_large_chunk(
         self,
         text: str,
-        base_metadata: Dict[str, Any]
+        base_metadata: Dict[str, Any],
+        section_hierarchy: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Split a chunk that exceeds max_chunk_size using RecursiveCharacterTextSplitter.
@@ -225,61 +235,50 @@ class LangChainChunker(BaseChunker):
         Args:
             text: Text to split
             base_metadata: Metadata to add to all sub-chunks
+            section_hierarchy: Hierarchical context to add to all sub-chunks
 
         Returns:
             List of sub-chunks
         """
-        # Ensure overlap is smaller than chunk size
-        overlap = min(self.chunk_overlap, self.max_chunk_size - 1)
-
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.max_chunk_size,
-            chunk_overlap=overlap,
-            length_function=len,
-            separators=CHUNK_SEPARATORS
-        )
-
-        sub_texts = splitter.split_text(text)
-        sub_chunks = []
+        sub_texts = self._splitter.split_text(text)
+        n = len(sub_texts)
+        hierarchy = {"section_hierarchy": section_hierarchy} if section_hierarchy else {}
 
-        for i, sub_text in enumerate(sub_texts):
-            metadata = base_metadata.copy()
-            metadata["chunk_part"] = f"{i+1}/{len(sub_texts)}"
-            metadata["is_split_chunk"] = True
-
-            sub_chunks.append({
+        return [
+            {
                 "text": sub_text,
-                "metadata": metadata,
+                "metadata": {
+                    **base_metadata,
+                    "chunk_part": f"{i}/{n}",
+                    "is_split_chunk": True,
+                    **hierarchy
+                },
                 "chunk_size": len(sub_text)
-            })
-
-        return sub_chunks
+            }
+            for i, sub_text in enumerate(sub_texts, 1)
+        ]
 
-    def _add_section_hierarchy(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _section_hierarchy(metadata: Dict[str, Any]) -> Optional[str]:
         """
-        Add hierarchical context to chunks based on section metadata.
+        Hierarchical context from section metadata.
 
         Args:
-            chunks: List of chunks
+            metadata: Chunk metadata with section/subsection/subsubsection headers
 
         Returns:
-            Chunks with section_hierarchy added to metadata
+            e.g. "Section: 1. Intro > Subsection: 1.1 Scope", or None without headers
         """
-        for chunk in chunks:
-            metadata = chunk["metadata"]
-            context_parts = []
+        context_parts = []
 
-            if "section" in metadata:
-                context_parts.append(f"Section: {metadata['section']}")
-            if "subsection" in metadata:
-                context_parts.append(f"Subsection: {metadata['subsection']}")
-            if "subsubsection" in metadata:
-                context_parts.append(f"Sub-subsection: {metadata['subsubsection']}")
+        if "section" in metadata:
+            context_parts.append(f"Section: {metadata['section']}")
+        if "subsection" in metadata:
+            context_parts.append(f"Subsection: {metadata['subsection']}")
+        if "subsubsection" in metadata:
+            context_parts.append(f"Sub-subsection: {metadata['subsubsection']}")
 
-            if context_parts:
-                chunk["metadata"]["section_hierarchy"] = " > ".join(context_parts)
-
-        return chunks
+        return " > ".join(context_parts) if context_parts else None
 
     def _fallback_chunk(
         self,
@@ -300,28 +299,16 @@ class LangChainChunker(BaseChunker):
         if self.debug:
             self.logger.debug("Using fallback chunking method")
 
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.max_chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=CHUNK_SEPARATORS
-        )
+        texts = self._splitter.split_text(text)
 
-        texts = splitter.split_text(text)
-        chunks = []
-
-        for i, chunk_text in enumerate(texts):
-            metadata = base_metadata.copy()
-            metadata["chunk_index"] = i
-            metadata["is_fallback_chunk"] = True
-
-            chunks.append({
+        return [
+            {
                 "text": chunk_text,
-                "metadata": metadata,
+                "metadata": {**base_metadata, "chunk_index": i, "is_fallback_chunk": True},
                 "chunk_size": len(chunk_text)
-            })
-
-        return chunks
+            }
+            for i, chunk_text in enumerate(texts)
+        ]
 
     def create_langchain_documents(
         self,
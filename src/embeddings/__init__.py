@@ -7,13 +7,21 @@ from embeddings.bedrock_embedder import BedrockEmbedder
 from embeddings.sentence_transformer_embedder import (
     SentenceTransformerEmbedder,
     get_recommended_model,
+    max_tokens_for_chunks,
     RECOMMENDED_MODELS
 )
+from embeddings.cache import get_embedder
+from embeddings.query_cache import QueryEmbeddingCache
+from embeddings.chunk_cache import ChunkEmbeddingCache
 
 __all__ = [
     'BaseEmbedder',
     'BedrockEmbedder',
     'SentenceTransformerEmbedder',
     'get_recommended_model',
-    'RECOMMENDED_MODELS'
+    'max_tokens_for_chunks',
+    'RECOMMENDED_MODELS',
+    'get_embedder',
+    'QueryEmbeddingCache',
+    'ChunkEmbeddingCache'
 ]
@@ -0,0 +1,63 @@
+"""
+Process-wide cache of loaded embedding models.
+
+Loading a SentenceTransformer model takes seconds (weights read from disk and
+initialized on the device), which dwarfs the cost of embedding one query.
+get_embedder() loads each (model, device, normalize, backend) combination once per
+process and returns the same instance afterwards.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder
+from config.settings import settings
+
+
+# lru_cache doesn't lock around a miss: without this, concurrent first calls
+# would each load the model
+_load_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _load_embedder(
+    model_name: str,
+    device: Optional[str],
+    normalize: bool,
+    backend: str
+) -> SentenceTransformerEmbedder:
+    return SentenceTransformerEmbedder(
+        model_name=model_name,
+        device=device,
+        normalize=normalize,
+        backend=backend,
+        onnx_file=settings.embedding_onnx_file or None
+    )
+
+
+def get_embedder(
+    model_name: Optional[str] = None,
+    device: Optional[str] = "cpu",
+    normalize: Optional[bool] = None,
+    backend: Optional[str] = None
+) -> SentenceTransformerEmbedder:
+    """
+    Get a shared embedder, loading the model on first use.
+
+    Args:
+        model_name: HuggingFace model name (uses settings if not provided)
+        device: Device to use ('cuda', 'cpu', or None for auto)
+        normalize: Whether to normalize embeddings (uses settings if not provided)
+        backend: 'torch' or 'onnx_int8' (uses settings if not provided)
+
+    Returns:
+        Cached SentenceTransformerEmbedder instance
+    """
+    with _load_lock:
+        return _load_embedder(
+            model_name or settings.embedding_model,
+            device,
+            settings.embedding_normalize if normalize is None else normalize,
+            backend or settings.embedding_backend
+        )
@@ -0,0 +1,134 @@
+"""
+On-disk cache of chunk embeddings.
+
+PDFs in one corpus share boilerplate - letterheads, confidentiality notices,
+signature blocks - that chunks to identical text, and re-uploading a document
+repeats all of its chunks. Vectors are kept in a SQLite table keyed by a hash
+of (model, backend, ONNX file, normalize, text), so such chunks skip the model
+forward pass. The least recently used entries are evicted beyond max_entries.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.settings import settings
+from embeddings.sentence_transformer_embedder import onnx_file_for
+
+
+class ChunkEmbeddingCache:
+    """SQLite key-value store of chunk text -> float32 embedding, LRU-bounded"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+        onnx_file: Optional[str] = None,
+        normalize: Optional[bool] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite file (uses settings if not provided)
+            model_name: Model the vectors come from (uses settings if not provided)
+            backend: Embedder backend, 'torch' or 'onnx_int8' (uses settings if not provided)
+            onnx_file: ONNX export used by 'onnx_int8' (uses settings if not provided)
+            normalize: Whether vectors are normalized (uses settings if not provided)
+            max_entries: Entries kept before the least recently used are evicted
+                         (uses settings if not provided)
+        """
+        self.path = Path(path or settings.chunk_cache_path)
+        self.model_name = model_name or settings.embedding_model
+        self.backend = backend or settings.embedding_backend
+        self.onnx_file = onnx_file_for(self.backend, onnx_file or settings.embedding_onnx_file)
+        self.normalize = settings.embedding_normalize if normalize is None else normalize
+        self.max_entries = max_entries or settings.chunk_cache_max_entries
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the upload worker threads; the lock serializes access
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunk_embeddings "
+            "(key BLOB PRIMARY KEY, vector BLOB NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_chunk_embeddings_last_used ON chunk_embeddings (last_used)"
+        )
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.blake2b(
+            f"{self.model_name}|{self.backend}|{self.onnx_file}|{self.normalize}|{text}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up several chunk texts, marking the hits as recently used.
+
+        Returns:
+            One float32 vector per text, None where the text is not cached
+        """
+        keys = [self._key(text) for text in texts]
+        found: Dict[bytes, bytes] = {}
+
+        unique_keys = list(set(keys))
+        with self._lock, self.conn:
+            for start in range(0, len(unique_keys), 500):  # stay under SQLite's parameter limit
+                batch = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self.conn.execute(
+                    f"SELECT key, vector FROM chunk_embeddings WHERE key IN ({placeholders})", batch
+                ))
+
+            if found:
+                now = time.time_ns()
+                self.conn.executemany(
+                    "UPDATE chunk_embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+
+    def put_many(self, texts: Sequence[str], embeddings: np.ndarray):
+        """Store vectors for several texts (overwrites existing entries), then evict beyond max_entries"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        now = time.time_ns()
+
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chunk_embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [
+                    (self._key(text), embedding.tobytes(), now)
+                    for text, embedding in zip(texts, embeddings)
+                ]
+            )
+
+            (count,) = self.conn.execute("SELECT COUNT(*) FROM chunk_embeddings").fetchone()
+            if count > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM chunk_embeddings WHERE key IN "
+                    "(SELECT key FROM chunk_embeddings ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM chunk_embeddings").fetchone()[0]
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,106 @@
+"""
+On-disk cache of query embeddings.
+
+Evaluation suites and regression runs re-submit the same queries. Embedding a
+query costs a model forward pass, and loading the model costs seconds, so
+vectors are kept in a small SQLite table keyed by (model, backend, ONNX file,
+normalize, query). A run whose queries are all cached never loads the model.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.settings import settings
+from embeddings.sentence_transformer_embedder import onnx_file_for
+
+
+class QueryEmbeddingCache:
+    """SQLite key-value store of query text -> embedding vector"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+        onnx_file: Optional[str] = None,
+        normalize: Optional[bool] = None
+    ):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite file (uses settings if not provided)
+            model_name: Model the vectors come from (uses settings if not provided)
+            backend: Embedder backend, 'torch' or 'onnx_int8' (uses settings if not provided)
+            onnx_file: ONNX export used by 'onnx_int8' (uses settings if not provided)
+            normalize: Whether vectors are normalized (uses settings if not provided)
+        """
+        self.path = Path(path or settings.query_cache_path)
+        self.model_name = model_name or settings.embedding_model
+        self.backend = backend or settings.embedding_backend
+        self.onnx_file = onnx_file_for(self.backend, onnx_file or settings.embedding_onnx_file)
+        self.normalize = settings.embedding_normalize if normalize is None else normalize
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+
+    def _key(self, query: str) -> bytes:
+        # Whitespace differences don't change the tokens, so they share an entry
+        normalized = " ".join(query.split())
+        return hashlib.blake2b(
+            f"{self.model_name}|{self.backend}|{self.onnx_file}|{self.normalize}|{normalized}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+
+    def get_many(self, queries: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up several queries.
+
+        Returns:
+            One vector per query, None where the query is not cached
+        """
+        keys = [self._key(query) for query in queries]
+        found: Dict[bytes, bytes] = {}
+
+        unique_keys = list(set(keys))
+        for start in range(0, len(unique_keys), 500):  # stay under SQLite's parameter limit
+            batch = unique_keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            found.update(self.conn.execute(
+                f"SELECT key, vector FROM query_embeddings WHERE key IN ({placeholders})", batch
+            ))
+
+        return [
+            np.frombuffer(found[key], dtype=np.float32).tolist() if key in found else None
+            for key in keys
+        ]
+
+    def get(self, query: str) -> Optional[List[float]]:
+        """Cached vector for a query, or None"""
+        return self.get_many([query])[0]
+
+    def put_many(self, queries: Sequence[str], embeddings: Sequence[List[float]]):
+        """Store vectors for several queries (overwrites existing entries)"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO query_embeddings (key, vector) VALUES (?, ?)",
+                [
+                    (self._key(query), np.asarray(embedding, dtype=np.float32).tobytes())
+                    for query, embedding in zip(queries, embeddings)
+                ]
+            )
+
+    def put(self, query: str, embedding: List[float]):
+        """Store the vector for one query"""
+        self.put_many([query], [embedding])
+
+    def close(self):
+        """Close the SQLite connection"""
+        self.conn.close()
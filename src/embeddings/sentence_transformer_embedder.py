@@ -5,6 +5,8 @@ Provides free, offline embeddings without API calls.
 Uses HuggingFace models that run locally.
 """
 
+import importlib.util
+import os
 from typing import List, Optional
 import numpy as np
 
@@ -13,17 +15,23 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Try to import sentence-transformers
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+# Check for sentence-transformers without importing it: the import pulls in
+# torch + transformers (seconds), so it is deferred until a model is loaded
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     logger.warning(
         "sentence-transformers not installed. "
         "Install with: pip install sentence-transformers"
     )
 
+# Embedding backends: 'torch' (PyTorch FP32/FP16) or 'onnx_int8' (ONNX Runtime,
+# dynamically int8-quantized export shipped in the model repo, CPU)
+EMBEDDING_BACKENDS = ("torch", "onnx_int8")
+
+# Quantized ONNX export in sentence-transformers model repos (AVX2 = any recent x86 CPU;
+# model_qint8_avx512_vnni.onnx / model_qint8_arm64.onnx are faster where supported)
+DEFAULT_ONNX_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
 
 class SentenceTransformerEmbedder(BaseEmbedder):
     """
@@ -42,7 +50,11 @@ class SentenceTransformerEmbedder(BaseEmbedder):
         model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
         device: Optional[str] = None,
         normalize: bool = True,
-        debug: bool = False
+        debug: bool = False,
+        half_precision: bool = False,
+        max_seq_length: Optional[int] = None,
+        backend: str = "torch",
+        onnx_file: Optional[str] = None
     ):
         """
         Initialize the sentence transformer embedder.
@@ -52,6 +64,16 @@ class SentenceTransformerEmbedder(BaseEmbedder):
             device: Device to use ('cuda', 'cpu', or None for auto)
             normalize: Whether to normalize embeddings to unit length
             debug: Enable debug logging
+            half_precision: Run the model in FP16 when it is on a CUDA device
+                            (ignored on CPU, where FP16 matmuls are slow)
+            max_seq_length: Upper bound on tokens per text; only ever lowers the
+                            model's own limit (some models allow 8192, and
+                            attention cost grows with the square of the length)
+            backend: 'torch' or 'onnx_int8' - the model's int8-quantized ONNX export
+                     run by ONNX Runtime on the CPU (~2x faster encode, small
+                     cosine drift vs FP32; needs optimum[onnxruntime])
+            onnx_file: ONNX file inside the model repo for 'onnx_int8'
+                       (default: DEFAULT_ONNX_INT8_FILE)
         """
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise ImportError(
@@ -59,9 +81,21 @@ class SentenceTransformerEmbedder(BaseEmbedder):
                 "Install with: pip install sentence-transformers"
             )
 
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend}")
+        if backend == "onnx_int8" and importlib.util.find_spec("optimum") is None:
+            raise ImportError(
+                "The onnx_int8 embedding backend requires ONNX Runtime. "
+                "Install with: pip install optimum[onnxruntime]"
+            )
+
         self.model_name = model_name
-        self.device = device
+        self.backend = backend
+        self.device = "cpu" if backend == "onnx_int8" else device
         self.normalize = normalize
+        # Weight precision actually in use: 'fp32', 'fp16' (CUDA half) or 'int8'
+        self.precision = "int8" if backend == "onnx_int8" else "fp32"
+        self.onnx_file = onnx_file_for(backend, onnx_file)
         self.debug = debug
         self.logger = logger
 
@@ -70,9 +104,26 @@ class SentenceTransformerEmbedder(BaseEmbedder):
             self.logger.info(f"Loading embedding model: {model_name}")
 
         try:
-            self.model = SentenceTransformer(model_name, device=device)
+            from sentence_transformers import SentenceTransformer
+
+            if backend == "onnx_int8":
+                self.model = SentenceTransformer(
+                    model_name,
+                    device=self.device,
+                    backend="onnx",
+                    model_kwargs=self._onnx_model_kwargs(self.onnx_file)
+                )
+            else:
+                self.model = SentenceTransformer(model_name, device=device)
             self.embedding_dim = self.model.get_sentence_embedding_dimension()
 
+            if half_precision and self.model.device.type == "cuda":
+                self.model.half()
+                self.precision = "fp16"
+
+            if max_seq_length and (self.model.max_seq_length is None or max_seq_length < self.model.max_seq_length):
+                self.model.max_seq_length = max_seq_length
+
             if self.debug:
                 self.logger.info(
                     f"Model loaded successfully. "
@@ -82,6 +133,25 @@ class SentenceTransformerEmbedder(BaseEmbedder):
             self.logger.error(f"Failed to load model {model_name}: {e}")
             raise
 
+    @staticmethod
+    def _onnx_model_kwargs(onnx_file: str) -> dict:
+        """ORTModel loading options: the quantized file, all graph optimizations, sequential execution"""
+        import onnxruntime
+
+        session_options = onnxruntime.SessionOptions()
+        session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # One inference at a time; parallelism comes from intra-op threads (default: physical cores)
+        session_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        # Same limit as PyTorch when set (see utils.cpu.configure_compute_threads)
+        if os.environ.get("OMP_NUM_THREADS", "").isdigit():
+            session_options.intra_op_num_threads = int(os.environ["OMP_NUM_THREADS"])
+
+        return {
+            "file_name": onnx_file,
+            "provider": "CPUExecutionProvider",
+            "session_options": session_options
+        }
+
     def embed(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
@@ -110,59 +180,201 @@ class SentenceTransformerEmbedder(BaseEmbedder):
             self.logger.error(f"Error generating embedding: {e}")
             raise
 
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_batch(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
         """
         Generate embeddings for multiple texts efficiently.
 
         Args:
             texts: List of texts to embed
+            batch_size: Number of texts per model forward pass
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors (zero vectors for empty texts)
         """
-        if not texts:
-            return []
+        # Empty texts are skipped and the rows are placed in one matrix there;
+        # one tolist() then gives every row (zero rows included) its own list
+        return self.embed_batch_array(texts, batch_size=batch_size).tolist()
 
-        # Filter out empty texts but remember their positions
-        non_empty_texts = []
-        non_empty_indices = []
-
-        for i, text in enumerate(texts):
-            if text and text.strip():
-                non_empty_texts.append(text)
-                non_empty_indices.append(i)
+    def embed_batch_array(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts as one float32 matrix.
 
-        if not non_empty_texts:
-            # All texts were empty
-            return [[0.0] * self.embedding_dim] * len(texts)
+        Same vectors as embed_batch(), but kept in the contiguous array the
+        model returns instead of being converted to len(texts) * dim
+        Python floats - use for bulk loading (see PgVectorStore.copy_chunks).
 
-        try:
-            # Batch encode is much faster than individual encodes
-            embeddings = self.model.encode(
-                non_empty_texts,
-                normalize_embeddings=self.normalize,
-                show_progress_bar=self.debug,
-                batch_size=32
-            )
+        Args:
+            texts: List of texts to embed
+            batch_size: Number of texts per model forward pass
 
-            # Convert to list and insert zero vectors for empty texts
-            result = []
-            zero_vector = [0.0] * self.embedding_dim
-            non_empty_idx = 0
+        Returns:
+            Array of shape (len(texts), embedding_dim); zero rows for empty texts
+        """
+        result = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
 
-            for i in range(len(texts)):
-                if i in non_empty_indices:
-                    result.append(embeddings[non_empty_idx].tolist())
-                    non_empty_idx += 1
-                else:
-                    result.append(zero_vector)
+        non_empty_indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not non_empty_indices:
+            return result
 
+        try:
+            non_empty_texts = [texts[i] for i in non_empty_indices]
+            if self.model.device.type == "cuda":
+                result[non_empty_indices] = self._encode_pipelined(non_empty_texts, batch_size)
+            else:
+                result[non_empty_indices] = self.model.encode(
+                    non_empty_texts,
+                    normalize_embeddings=self.normalize,
+                    show_progress_bar=self.debug,
+                    batch_size=batch_size,
+                    convert_to_numpy=True
+                )
             return result
 
         except Exception as e:
             self.logger.error(f"Error generating batch embeddings: {e}")
             raise
 
+    def _encode_pipelined(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Encode texts, overlapping host work with GPU compute.
+
+        model.encode() tokenizes a batch, copies it to the GPU synchronously,
+        runs it and copies the result back before starting the next batch.
+        Here inputs are copied from pinned memory on a side CUDA stream
+        (non_blocking), the next batch is tokenized while the GPU runs the
+        current one, and results stay on the GPU until the end (one sync).
+        Also runs on CPU (without streams/pinning).
+
+        Returns:
+            float32 array of shape (len(texts), embedding_dim), in input order
+        """
+        import torch
+
+        device = self.model.device
+        on_cuda = device.type == "cuda"
+        copy_stream = torch.cuda.Stream(device) if on_cuda else None
+        # sentence-transformers >= 6 renamed tokenize() to preprocess()
+        preprocess = getattr(self.model, "preprocess", None) or self.model.tokenize
+
+        def to_device(batch_texts):
+            features = preprocess(batch_texts)
+            if not on_cuda:
+                return features
+            with torch.cuda.stream(copy_stream):
+                return {
+                    key: value.pin_memory().to(device, non_blocking=True)
+                    if isinstance(value, torch.Tensor) else value
+                    for key, value in features.items()
+                }
+
+        # Longest first, like encode(): similar lengths share a batch (less padding)
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+        outputs = []
+        with torch.inference_mode():
+            next_features = to_device([texts[i] for i in batches[0]])
+            for batch_number in range(len(batches)):
+                features = next_features
+                if on_cuda:
+                    compute_stream = torch.cuda.current_stream(device)
+                    compute_stream.wait_stream(copy_stream)
+                    for value in features.values():
+                        if isinstance(value, torch.Tensor):
+                            value.record_stream(compute_stream)
+
+                embeddings = self.model(features)["sentence_embedding"]  # queued, not waited for
+
+                if batch_number + 1 < len(batches):
+                    next_features = to_device([texts[i] for i in batches[batch_number + 1]])
+
+                if self.normalize:
+                    embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+                outputs.append(embeddings.float())
+
+        result = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+        result[order] = torch.cat(outputs).cpu().numpy()
+        return result
+
+    def quantize_int8(self) -> bool:
+        """
+        Apply dynamic int8 quantization to the model's Linear layers (CPU only).
+
+        Weights are stored as int8 and activations quantized on the fly,
+        which roughly halves CPU encode time on x86 (VNNI). Embeddings shift
+        slightly versus FP32, so use the same setting for documents and queries
+        when comparing runs.
+
+        Returns:
+            True if the model was quantized, False if it is not a PyTorch model
+            on the CPU (the onnx_int8 backend is already quantized)
+        """
+        if self.backend != "torch" or self.model.device.type != "cpu":
+            return False
+
+        import torch
+
+        torch.ao.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+        self.precision = "int8"
+
+        if self.debug:
+            self.logger.info("Applied dynamic int8 quantization to Linear layers")
+
+        return True
+
+    def compile(self, mode: Optional[str] = None) -> bool:
+        """
+        Compile the transformer with torch.compile (PyTorch 2.x).
+
+        Fuses the encoder's forward graph and removes per-op Python dispatch,
+        which pays off when embed_batch is called many times (bulk
+        reprocessing). Compilation happens lazily on the next encode and can
+        take tens of seconds - call warmup() at the real batch size first.
+        Shapes are marked dynamic so varying padded lengths don't recompile.
+
+        Args:
+            mode: torch.compile mode (e.g. 'reduce-overhead', 'max-autotune';
+                  None = default)
+
+        Returns:
+            True if the model was wrapped, False if compilation is unavailable
+            (or the backend is not PyTorch)
+        """
+        if self.backend != "torch":
+            return False
+
+        try:
+            import torch
+
+            # Compile the forward of the Hugging Face model inside the
+            # Transformer layer (replaced on the instance, since some
+            # sentence-transformers versions call .forward directly); the
+            # SentenceTransformer wrapper (tokenization, pooling) stays eager
+            hf_model = self.model[0].auto_model
+            hf_model.forward = torch.compile(hf_model.forward, mode=mode, dynamic=True)
+        except Exception as e:
+            self.logger.warning(f"torch.compile unavailable, using eager model: {e}")
+            return False
+
+        if self.debug:
+            self.logger.info(f"Compiled model with torch.compile (mode={mode})")
+
+        return True
+
+    def warmup(self, batch_size: int = 1):
+        """
+        Run one small encode so the first real batch doesn't pay for
+        lazy initialization (CUDA context, kernel selection, allocator,
+        torch.compile).
+
+        Args:
+            batch_size: Texts in the warmup batch (use the real batch size
+                        after compile())
+        """
+        self.model.encode(["warmup"] * batch_size, batch_size=batch_size, show_progress_bar=False)
+
     def get_embedding_dimension(self) -> int:
         """
         Get the dimension of embeddings produced by this model.
@@ -181,8 +393,11 @@ class SentenceTransformerEmbedder(BaseEmbedder):
         """
         return {
             "model_name": self.model_name,
+            "backend": self.backend,
+            "onnx_file": self.onnx_file,
             "embedding_dimension": self.embedding_dim,
             "device": str(self.model.device),
+            "precision": self.precision,
             "normalize": self.normalize,
             "max_seq_length": self.model.max_seq_length
         }
@@ -208,3 +423,33 @@ def get_recommended_model(use_case: str = "balanced") -> str:
         Model name string
     """
     return RECOMMENDED_MODELS.get(use_case, RECOMMENDED_MODELS["balanced"])
+
+
+def max_tokens_for_chunks(max_chunk_size: int) -> int:
+    """
+    Token limit that fits chunks of up to max_chunk_size characters.
+
+    Assumes at least ~3 characters per token (English prose averages ~4),
+    capped at 512 - the limit of most BERT-style encoders.
+
+    Args:
+        max_chunk_size: Maximum chunk size in characters
+
+    Returns:
+        max_seq_length to pass to SentenceTransformerEmbedder
+    """
+    return min(512, max(32, max_chunk_size // 3))
+
+
+def onnx_file_for(backend: str, onnx_file: Optional[str] = None) -> Optional[str]:
+    """
+    ONNX export a backend loads.
+
+    Args:
+        backend: 'torch' or 'onnx_int8'
+        onnx_file: Configured ONNX file (empty/None = DEFAULT_ONNX_INT8_FILE)
+
+    Returns:
+        File inside the model repo for 'onnx_int8', None for 'torch'
+    """
+    return (onnx_file or DEFAULT_ONNX_INT8_FILE) if backend == "onnx_int8" else None
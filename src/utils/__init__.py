@@ -5,6 +5,7 @@ Utility modules.
 from utils import logger
 from utils import exceptions
 from utils import validators
+from utils import cpu
 from utils.processing_result import ProcessingResult
 
-__all__ = ['logger', 'exceptions', 'validators', 'ProcessingResult']
+__all__ = ['logger', 'exceptions', 'validators', 'cpu', 'ProcessingResult']
@@ -0,0 +1,76 @@
+"""
+Thread pool sizing for CPU-bound model inference.
+
+PyTorch, ONNX Runtime and the BLAS under numpy each start one thread per
+logical CPU by default. Hyperthread siblings share a core's vector units, so
+beyond the physical core count extra threads only contend with each other
+(and with other API workers) during the embedder forward pass.
+"""
+
+import os
+import sys
+from typing import Optional
+
+from config.settings import settings
+
+# Thread pool sizes read by OpenMP (PyTorch), MKL and OpenBLAS when they load
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def physical_cpu_count() -> int:
+    """
+    Physical cores this process may run on (hyperthread siblings count once).
+
+    Reads /proc/cpuinfo where available (Linux), restricted to the CPUs in
+    the process's affinity mask; elsewhere falls back to the logical count.
+    """
+    try:
+        allowed = os.sched_getaffinity(0)
+    except AttributeError:  # not Linux
+        allowed = None
+
+    cores = set()
+    try:
+        with open("/proc/cpuinfo") as f:
+            processor = physical_id = None
+            for line in f:
+                key, _, value = line.partition(":")
+                key, value = key.strip(), value.strip()
+                if key == "processor":
+                    processor, physical_id = int(value), None
+                elif key == "physical id":
+                    physical_id = value
+                elif key == "core id" and (allowed is None or processor in allowed):
+                    cores.add((physical_id, value))
+    except (OSError, ValueError):
+        cores = set()
+
+    if cores:
+        return len(cores)
+    if allowed:
+        return len(allowed)
+    return os.cpu_count() or 1
+
+
+def configure_compute_threads(threads: Optional[int] = None) -> int:
+    """
+    Limit inference thread pools to `threads` (settings.compute_threads, or
+    the physical core count when that is 0).
+
+    Thread count environment variables that are already set are left alone.
+    They only take effect for libraries loaded afterwards, so call this
+    before the first model load; PyTorch is also adjusted if already imported.
+
+    Returns:
+        Thread count applied
+    """
+    threads = threads or settings.compute_threads or physical_cpu_count()
+
+    for var in THREAD_ENV_VARS:
+        os.environ.setdefault(var, str(threads))
+
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(int(os.environ["OMP_NUM_THREADS"]))
+
+    return threads
@@ -4,5 +4,7 @@ Vector store module (Part 4).
 
 from vector_store.base_store import BaseVectorStore
 from vector_store.pgvector_client import PgVectorStore
+from vector_store.pool import get_engine, dispose_engines
+from vector_store.memory_index import MemoryVectorIndex
 
-__all__ = ['BaseVectorStore', 'PgVectorStore']
+__all__ = ['BaseVectorStore', 'PgVectorStore', 'get_engine', 'dispose_engines', 'MemoryVectorIndex']
@@ -0,0 +1,120 @@
+"""
+In-process mirror of chunk embeddings for small corpora.
+
+A pgvector search pays for a round trip, planning and an index scan. While
+the corpus is small (tens of thousands of chunks), an exact scan of all
+embeddings held in one float32 matrix takes well under a millisecond. The
+API can keep such a mirror and only go to Postgres - still the source of
+truth - to fetch the text of the top results.
+
+The mirror is updated by the process that owns it (RAGService uploads and
+deletes); writes from other processes are only seen after a reload.
+"""
+
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class MemoryVectorIndex:
+    """Exact cosine-distance index over (chunk id, document id, embedding) rows"""
+
+    def __init__(self, embedding_dim: int):
+        """
+        Args:
+            embedding_dim: Dimension of the embedding vectors
+        """
+        self.embedding_dim = embedding_dim
+        # Replaced as a whole on every write, so searches read a consistent
+        # snapshot without taking the lock
+        self._rows = self._empty_rows()
+        self._write_lock = threading.Lock()
+
+    def _empty_rows(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return (
+            np.zeros((0, self.embedding_dim), dtype=np.float32),
+            np.empty(0, dtype=object),
+            np.empty(0, dtype=object)
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows[0])
+
+    def add(self, chunk_ids: Sequence[str], document_ids: Sequence[str], embeddings: np.ndarray):
+        """
+        Add chunks to the index.
+
+        Args:
+            chunk_ids: Chunk UUIDs
+            document_ids: Document UUID of each chunk
+            embeddings: Matrix with one embedding row per chunk
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.embedding_dim)
+        # Unit rows, so cosine distance is 1 - dot product
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1)
+
+        with self._write_lock:
+            old_vectors, old_chunk_ids, old_document_ids = self._rows
+            self._rows = (
+                np.concatenate([old_vectors, vectors]),
+                np.concatenate([old_chunk_ids, np.array(list(chunk_ids), dtype=object)]),
+                np.concatenate([old_document_ids, np.array(list(document_ids), dtype=object)])
+            )
+
+    def remove_document(self, document_id: str) -> int:
+        """
+        Remove all chunks of a document.
+
+        Returns:
+            Number of chunks removed
+        """
+        with self._write_lock:
+            vectors, chunk_ids, document_ids = self._rows
+            keep = document_ids != document_id
+            self._rows = (vectors[keep], chunk_ids[keep], document_ids[keep])
+            return int(len(keep) - keep.sum())
+
+    def clear(self):
+        """Remove all chunks"""
+        with self._write_lock:
+            self._rows = self._empty_rows()
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        top_k: int = 10,
+        document_id: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the chunks nearest to a query vector.
+
+        Args:
+            query_vector: Query embedding vector
+            top_k: Number of results to return
+            document_id: Optional filter to one document
+
+        Returns:
+            (chunk id, cosine distance) pairs, nearest first
+        """
+        vectors, chunk_ids, document_ids = self._rows
+        if document_id:
+            mask = document_ids == document_id
+            vectors, chunk_ids = vectors[mask], chunk_ids[mask]
+        if len(vectors) == 0 or top_k <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        distances = 1 - vectors @ query
+        if top_k < len(distances):
+            nearest = np.argpartition(distances, top_k)[:top_k]
+        else:
+            nearest = np.arange(len(distances))
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+
+        return [(chunk_ids[i], float(distances[i])) for i in nearest]
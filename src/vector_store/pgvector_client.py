@@ -4,13 +4,21 @@ PostgreSQL + pgVector client for vector storage and similarity search.
 Implements complete CRUD operations for documents and chunks with embeddings.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+import csv
+import io
+import json
 import uuid
 from datetime import datetime
 
-from sqlalchemy import create_engine, text
+import numpy as np
+from sqlalchemy import (
+    create_engine, text, select, insert, update, func, literal, cast, union_all, true, Integer
+)
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
+from pgvector.sqlalchemy import Vector, HALFVEC
 
 from vector_store.base_store import BaseVectorStore
 from vector_store.schema import Base, Document, Chunk, CREATE_EXTENSION_SQL
@@ -19,6 +27,89 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Name of the ANN index on chunks.embedding (see schema.Chunk)
+VECTOR_INDEX_NAME = "ix_chunks_embedding_cosine"
+
+# Name of the HNSW index on binary_quantize(chunks.embedding) used by search_rescored()
+BINARY_INDEX_NAME = "ix_chunks_embedding_bq_hamming"
+
+# pgvector's default hnsw.ef_search (an HNSW scan returns at most this many rows)
+DEFAULT_EF_SEARCH = 40
+
+
+# Distance metrics: 'cosine' (<=>) or 'inner_product' (<#>, negative dot
+# product - equal ordering for unit-length embeddings without the per-row norms)
+DISTANCE_METRICS = ("cosine", "inner_product")
+
+# Server-side prepared statements, PREPAREd once per pooled connection.
+# $1 = query vector, $2 = top_k, $3 = document_id (filtered variant)
+# {distance}/{order_by} come from PgVectorStore._distance_sql()
+SEARCH_SQL = """
+SELECT c.id, c.document_id, c.chunk_index, c.text, c.chunk_metadata, c.created_at,
+       {distance} AS distance, d.filename, d.doc_metadata->>'relative_path'
+FROM chunks c JOIN documents d ON d.id = c.document_id
+{where}
+ORDER BY {order_by}
+LIMIT $2
+"""
+# Two-stage search: nearest candidates by Hamming distance of the 1-bit codes
+# (binary index, 48 bytes per 384-dim row), reordered by exact distance.
+# The ORDER BY expression must match the binary index expression.
+RESCORE_SEARCH_SQL = """
+SELECT c.id, c.document_id, c.chunk_index, c.text, c.chunk_metadata, c.created_at,
+       {distance} AS distance, d.filename, d.doc_metadata->>'relative_path'
+FROM (
+    SELECT id FROM chunks
+    {where}
+    ORDER BY binary_quantize(embedding)::bit({dim}) <~> binary_quantize(CAST(:embedding AS {storage}))
+    LIMIT :candidates
+) candidates
+JOIN chunks c ON c.id = candidates.id
+JOIN documents d ON d.id = c.document_id
+ORDER BY {order_by}
+LIMIT :top_k
+"""
+GET_DOCUMENT_SQL = """
+SELECT id, filename, upload_date, page_count, chunk_count, doc_metadata, created_at
+FROM documents
+WHERE id = $1
+"""
+
+
+def default_ef_search(top_k: int) -> int:
+    """HNSW ef_search for a given top_k: 40 up to top_k=10, growing to 200 at top_k>=50"""
+    return min(200, max(DEFAULT_EF_SEARCH, 4 * top_k))
+
+
+def vector_index_ops(embedding_storage: str, distance: str) -> str:
+    """pgvector operator class for an ANN index, e.g. 'halfvec_ip_ops'"""
+    return f"{embedding_storage}_{'ip' if distance == 'inner_product' else 'cosine'}_ops"
+
+
+def _vector_literals(embeddings: np.ndarray) -> List[str]:
+    """
+    Format embedding rows in pgvector's text format ('[x,y,...]').
+
+    '%.9g' is the shortest precision that round-trips every float32 exactly;
+    one template per row avoids a str() call per element.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if len(embeddings) == 0:
+        return []
+    template = "[" + ",".join(["%.9g"] * embeddings.shape[1]) + "]"
+    return [template % tuple(row) for row in embeddings.tolist()]
+
+
+def _query_vector_literal(query_vector: List[float]) -> str:
+    """
+    A query vector in pgvector's text format, bound as a plain string.
+
+    The server casts it to the parameter's vector type. This is about twice
+    as fast as pgvector's per-element str() conversion and ~40% shorter on
+    the wire (see _vector_literals()).
+    """
+    return _vector_literals([query_vector])[0]
+
 
 class PgVectorStore(BaseVectorStore):
     """Vector store using PostgreSQL + pgVector extension"""
@@ -27,7 +118,10 @@ class PgVectorStore(BaseVectorStore):
         self,
         connection_string: Optional[str] = None,
         embedding_dim: int = 384,
-        debug: bool = False
+        debug: bool = False,
+        engine: Optional[Engine] = None,
+        embedding_storage: Optional[str] = None,
+        distance: Optional[str] = None
     ):
         """
         Initialize pgVector store.
@@ -36,14 +130,29 @@ class PgVectorStore(BaseVectorStore):
             connection_string: PostgreSQL connection string (uses settings if not provided)
             embedding_dim: Dimension of embedding vectors (must match your model)
             debug: Enable debug logging
+            engine: Existing engine to use (e.g. vector_store.pool.get_engine()).
+                    A shared engine is not disposed by close().
+            embedding_storage: Column type of chunks.embedding, 'vector' or
+                               'halfvec' (uses settings if not provided)
+            distance: 'cosine' or 'inner_product' (uses settings if not provided).
+                      Inner product requires unit-length embeddings and an index
+                      built for it (rebuild_vector_index()).
         """
         self.connection_string = connection_string or settings.database_url
         self.embedding_dim = embedding_dim
+        self.embedding_storage = embedding_storage or settings.embedding_storage
+        self.distance = distance or settings.embedding_distance
+        if self.distance not in DISTANCE_METRICS:
+            raise ValueError(f"Unknown distance metric: {self.distance}")
+        if self.distance == "inner_product" and not settings.embedding_normalize:
+            raise ValueError("Inner product distance requires normalized embeddings (EMBEDDING_NORMALIZE=true)")
+        self.use_prepared_statements = settings.db_prepared_statements
         self.debug = debug
         self.logger = logger
 
-        # Create engine and session
-        self.engine = create_engine(
+        # Create engine (unless one is shared with us) and session
+        self._owns_engine = engine is None
+        self.engine = engine or create_engine(
             self.connection_string,
             echo=debug,
             pool_pre_ping=True  # Verify connections before using
@@ -77,6 +186,108 @@ class PgVectorStore(BaseVectorStore):
             self.logger.error(f"Failed to initialize database: {e}")
             raise
 
+    def drop_vector_index(self):
+        """
+        Drop the ANN index on chunks.embedding.
+
+        Use before bulk loading - maintaining the index row by row is slower
+        than building it once afterwards with rebuild_vector_index().
+        """
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"DROP INDEX IF EXISTS {VECTOR_INDEX_NAME}"))
+
+        if self.debug:
+            self.logger.info(f"Dropped vector index {VECTOR_INDEX_NAME}")
+
+    def vector_index_type(self) -> Optional[str]:
+        """
+        Access method of the ANN index on chunks.embedding.
+
+        Returns:
+            'hnsw' or 'ivfflat', or None if the index does not exist
+        """
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text(
+                    "SELECT am.amname FROM pg_class c JOIN pg_am am ON am.oid = c.relam "
+                    "WHERE c.relname = :name AND c.relkind = 'i'"
+                ),
+                {"name": VECTOR_INDEX_NAME}
+            ).scalar()
+
+    def rebuild_vector_index(
+        self,
+        index_type: str = "hnsw",
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: int = 100,
+        maintenance_work_mem: str = "2GB",
+        parallel_workers: int = 4
+    ):
+        """
+        Drop and rebuild the ANN index on chunks.embedding from the current data.
+
+        Args:
+            index_type: 'hnsw' or 'ivfflat'
+            m: HNSW max connections per node
+            ef_construction: HNSW candidate list size while building
+            lists: IVFFlat number of lists
+            maintenance_work_mem: Memory for the build (graph fits in memory = much faster)
+            parallel_workers: Parallel maintenance workers for the build
+        """
+        if index_type == "hnsw":
+            params = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+        elif index_type == "ivfflat":
+            params = f"lists = {int(lists)}"
+        else:
+            raise ValueError(f"Unknown index type: {index_type}")
+
+        ops = vector_index_ops(self.embedding_storage, self.distance)
+
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("SELECT set_config('maintenance_work_mem', :mem, false)"), {"mem": maintenance_work_mem})
+            conn.execute(text("SELECT set_config('max_parallel_maintenance_workers', :workers, false)"),
+                         {"workers": str(int(parallel_workers))})
+            conn.execute(text(f"DROP INDEX IF EXISTS {VECTOR_INDEX_NAME}"))
+            conn.execute(text(
+                f"CREATE INDEX {VECTOR_INDEX_NAME} ON chunks "
+                f"USING {index_type} (embedding {ops}) WITH ({params})"
+            ))
+
+        if self.debug:
+            self.logger.info(f"Rebuilt vector index {VECTOR_INDEX_NAME} ({index_type})")
+
+    def rebuild_binary_index(
+        self,
+        m: int = 16,
+        ef_construction: int = 64,
+        maintenance_work_mem: str = "2GB"
+    ):
+        """
+        Drop and rebuild the HNSW index on the 1-bit codes of chunks.embedding.
+
+        search_rescored() scans this index instead of the full-precision one:
+        binary_quantize() keeps the sign of each dimension, so the index reads
+        1 bit per dimension instead of 32 (16 with halfvec). Requires
+        pgvector >= 0.7.
+
+        Args:
+            m: HNSW max connections per node
+            ef_construction: HNSW candidate list size while building
+            maintenance_work_mem: Memory for the build
+        """
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("SELECT set_config('maintenance_work_mem', :mem, false)"), {"mem": maintenance_work_mem})
+            conn.execute(text(f"DROP INDEX IF EXISTS {BINARY_INDEX_NAME}"))
+            conn.execute(text(
+                f"CREATE INDEX {BINARY_INDEX_NAME} ON chunks "
+                f"USING hnsw ((binary_quantize(embedding)::bit({self.embedding_dim})) bit_hamming_ops) "
+                f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+            ))
+
+        if self.debug:
+            self.logger.info(f"Rebuilt binary index {BINARY_INDEX_NAME}")
+
     def insert_document(
         self,
         filename: str,
@@ -135,29 +346,40 @@ class PgVectorStore(BaseVectorStore):
         Returns:
             List of chunk IDs (UUIDs as strings)
         """
+        doc_uuid = uuid.UUID(document_id)
+        now = datetime.utcnow()
+        # IDs generated here (the column default only runs at INSERT time)
+        chunk_uuids = [uuid.uuid4() for _ in chunks]
+
         session = self.SessionLocal()
         try:
-            chunk_ids = []
-
-            for i, chunk_data in enumerate(chunks):
-                chunk = Chunk(
-                    document_id=uuid.UUID(document_id),
-                    chunk_index=i,
-                    text=chunk_data['text'],
-                    embedding=chunk_data['embedding'],
-                    chunk_metadata=chunk_data.get('metadata', {})
-                )
-                session.add(chunk)
-                chunk_ids.append(str(chunk.id))
-
-            # Update document chunk count
-            document = session.query(Document).filter_by(id=uuid.UUID(document_id)).first()
-            if document:
-                document.chunk_count = len(chunks)
-                document.updated_at = datetime.utcnow()
+            if chunks:
+                # One executemany: SQLAlchemy sends it as multi-row INSERTs
+                # ("insertmanyvalues"), not one round trip per chunk
+                session.execute(insert(Chunk), [
+                    {
+                        'id': chunk_uuid,
+                        'document_id': doc_uuid,
+                        'chunk_index': i,
+                        'text': chunk_data['text'],
+                        'embedding': chunk_data['embedding'],
+                        'chunk_metadata': chunk_data.get('metadata', {}),
+                        'created_at': now
+                    }
+                    for i, (chunk_uuid, chunk_data) in enumerate(zip(chunk_uuids, chunks))
+                ])
+
+            # Update document chunk count (no SELECT of the document first)
+            session.execute(
+                update(Document)
+                .where(Document.id == doc_uuid)
+                .values(chunk_count=len(chunks), updated_at=now)
+            )
 
             session.commit()
 
+            chunk_ids = [str(chunk_uuid) for chunk_uuid in chunk_uuids]
+
             if self.debug:
                 self.logger.info(f"Inserted {len(chunks)} chunks for document {document_id}")
 
@@ -170,52 +392,346 @@ class PgVectorStore(BaseVectorStore):
         finally:
             session.close()
 
+    def copy_chunks(
+        self,
+        document_id: str,
+        chunks: List[Dict[str, Any]],
+        embeddings: Optional[np.ndarray] = None
+    ) -> List[str]:
+        """
+        Bulk-insert chunks for a document with COPY ... FROM STDIN.
+
+        Same input and effect as insert_chunks(), but all rows are streamed
+        in one COPY statement instead of one INSERT per chunk, which is much
+        faster for large documents and bulk reprocessing.
+
+        Args:
+            document_id: UUID of the parent document
+            chunks: List of chunk dicts with 'text', 'metadata' and (unless
+                embeddings is given) 'embedding'
+            embeddings: Optional (len(chunks), dim) float32 matrix, e.g. from
+                SentenceTransformerEmbedder.embed_batch_array(); row i is
+                chunk i's embedding
+
+        Returns:
+            List of chunk IDs (UUIDs as strings)
+        """
+        doc_uuid = str(uuid.UUID(document_id))
+        now = datetime.utcnow().isoformat()
+
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            chunk_ids = self._copy_chunk_rows(cursor, doc_uuid, chunks, embeddings, now)
+
+            # Update document chunk count
+            cursor.execute(
+                "UPDATE documents SET chunk_count = %s, updated_at = %s WHERE id = %s",
+                (len(chunks), now, doc_uuid)
+            )
+            cursor.close()
+            raw_conn.commit()
+
+            if self.debug:
+                self.logger.info(f"Copied {len(chunks)} chunks for document {document_id}")
+
+            return chunk_ids
+
+        except Exception as e:
+            raw_conn.rollback()
+            self.logger.error(f"Failed to copy chunks: {e}")
+            raise
+        finally:
+            raw_conn.close()
+
+    def insert_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert several documents with their chunks in one transaction.
+
+        Equivalent to insert_document() + copy_chunks() per document, but
+        with a single commit (one WAL flush) for the whole batch instead of
+        two per document. If any document fails, none are stored.
+
+        Args:
+            documents: Dicts with 'filename', 'page_count', 'metadata',
+                'chunks' and optionally 'embeddings' (see copy_chunks())
+
+        Returns:
+            Document IDs (UUIDs as strings), in input order
+        """
+        now = datetime.utcnow().isoformat()
+        doc_ids = [str(uuid.uuid4()) for _ in documents]
+
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            for doc_id, doc in zip(doc_ids, documents):
+                cursor.execute(
+                    "INSERT INTO documents "
+                    "(id, filename, upload_date, page_count, chunk_count, doc_metadata, created_at, updated_at) "
+                    "VALUES (%s, %s, %s, %s, %s, %s::jsonb, %s, %s)",
+                    (
+                        doc_id, doc['filename'], now, doc.get('page_count'), len(doc['chunks']),
+                        json.dumps(doc.get('metadata') or {}), now, now
+                    )
+                )
+                self._copy_chunk_rows(cursor, doc_id, doc['chunks'], doc.get('embeddings'), now)
+            cursor.close()
+            raw_conn.commit()
+
+            if self.debug:
+                self.logger.info(f"Inserted {len(documents)} documents in one transaction")
+
+            return doc_ids
+
+        except Exception as e:
+            raw_conn.rollback()
+            self.logger.error(f"Failed to insert documents: {e}")
+            raise
+        finally:
+            raw_conn.close()
+
+    @staticmethod
+    def _copy_chunk_rows(
+        cursor,
+        doc_uuid: str,
+        chunks: List[Dict[str, Any]],
+        embeddings: Optional[np.ndarray],
+        now: str
+    ) -> List[str]:
+        """COPY a document's chunks on a raw (psycopg2) cursor; the caller commits"""
+        chunk_ids = [str(uuid.uuid4()) for _ in chunks]
+
+        if embeddings is None:
+            embeddings = np.asarray([chunk['embedding'] for chunk in chunks], dtype=np.float32)
+        vectors = _vector_literals(embeddings)
+
+        # Quote every string so an empty text stays '' (unquoted empty = NULL in CSV COPY)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        for i, (chunk_id, chunk_data, vector) in enumerate(zip(chunk_ids, chunks, vectors)):
+            writer.writerow((
+                chunk_id,
+                doc_uuid,
+                i,
+                chunk_data['text'],
+                vector,
+                json.dumps(chunk_data.get('metadata', {})),
+                now
+            ))
+        buffer.seek(0)
+
+        cursor.copy_expert(
+            "COPY chunks (id, document_id, chunk_index, text, embedding, chunk_metadata, created_at) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+        return chunk_ids
+
+    def _query_vector(self, query_vector: List[float]):
+        """
+        Bind a query vector with the same type as the stored embeddings.
+
+        With halfvec storage the query is cast to halfvec on the server so
+        the distance operator (and index) work on FP16 values.
+        """
+        vector_type = HALFVEC(self.embedding_dim) if self.embedding_storage == 'halfvec' else Vector(self.embedding_dim)
+        return cast(literal(_query_vector_literal(query_vector)), vector_type)
+
+    def _distance_sql(self, query_param: str) -> Tuple[str, str]:
+        """
+        SQL for the distance of chunk c to a query parameter.
+
+        Returns:
+            (distance select expression, ORDER BY expression). The reported
+            distance is cosine distance for both metrics (for unit vectors
+            1 - cos = 1 + (negative inner product)); ordering uses the bare
+            operator so the index applies.
+        """
+        if self.distance == "inner_product":
+            return f"1 + (c.embedding <#> {query_param})", f"c.embedding <#> {query_param}"
+        return f"c.embedding <=> {query_param}", "distance"
+
+    def _distance_expr(self, column, query_vector):
+        """(distance, ORDER BY) SQLAlchemy expressions, see _distance_sql()"""
+        if self.distance == "inner_product":
+            inner_product = column.max_inner_product(query_vector)
+            return 1 + inner_product, inner_product
+        distance = column.cosine_distance(query_vector)
+        return distance, distance
+
+    def _set_ef_search(self, session: Session, top_k: int, ef_search: Optional[int]):
+        """
+        Set hnsw.ef_search for the current transaction only (SET LOCAL).
+
+        Skipped when the value equals pgvector's default, saving a round trip.
+        """
+        ef_search = ef_search or default_ef_search(top_k)
+        if ef_search != DEFAULT_EF_SEARCH:
+            session.execute(
+                text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+                {"ef": str(int(ef_search))}
+            )
+
+    def _execute_prepared(
+        self,
+        session: Session,
+        name: str,
+        param_types: str,
+        sql: str,
+        params: Dict[str, Any]
+    ):
+        """
+        EXECUTE a named prepared statement, PREPAREing it on first use.
+
+        Prepared statements live per connection, so the names already
+        prepared are remembered in the pooled connection's info dict.
+        Parse and plan then happen once per connection instead of per call.
+        """
+        self._prepare(session.connection(), name, param_types, sql)
+
+        statement = text(f"EXECUTE {name}({', '.join(':' + key for key in params)})")
+        return session.execute(statement, params)
+
+    @staticmethod
+    def _prepare(conn, name: str, param_types: str, sql: str):
+        """PREPARE a statement on a connection unless it already has it"""
+        prepared = conn.info.setdefault('prepared_statements', set())
+        if name not in prepared:
+            conn.exec_driver_sql(f"PREPARE {name} ({param_types}) AS {sql}")
+            prepared.add(name)
+
+    def _search_statement(self, filtered: bool) -> Tuple[str, str, str]:
+        """(name, parameter types, SQL) of the prepared search, with or without the document filter"""
+        name = f"pgvs_search_{self.embedding_storage}_{self.distance}"
+        param_types = f"{self.embedding_storage}, int"
+        where = ""
+
+        if filtered:
+            name += "_document"
+            param_types += ", uuid"
+            where = "WHERE c.document_id = $3"
+
+        distance, order_by = self._distance_sql("$1")
+        return name, param_types, SEARCH_SQL.format(distance=distance, order_by=order_by, where=where)
+
+    def prepare_search_statements(self, connections: int = 1):
+        """
+        PREPARE both search variants on pooled connections ahead of traffic.
+
+        Statements are otherwise prepared on first use per connection, so
+        the first few searches after startup each pay for parse and plan.
+        Up to `connections` connections are checked out at once (so they are
+        distinct) and given both statements.
+
+        Args:
+            connections: Number of pooled connections to prepare
+        """
+        if not self.use_prepared_statements:
+            return
+
+        statements = [self._search_statement(filtered) for filtered in (False, True)]
+        checked_out = []
+        try:
+            for _ in range(max(1, connections)):
+                conn = self.engine.connect()
+                checked_out.append(conn)
+                for name, param_types, sql in statements:
+                    self._prepare(conn, name, param_types, sql)
+        finally:
+            for conn in checked_out:
+                conn.close()
+
+    @staticmethod
+    def _search_row_to_result(row) -> Dict[str, Any]:
+        """Build a search result dict from a (chunk columns, distance, filename, relative_path) row"""
+        (chunk_id, document_id, chunk_index, chunk_text, metadata,
+         created_at, distance, filename, relative_path) = row
+        return {
+            'id': str(chunk_id),
+            'document_id': str(document_id),
+            'chunk_index': chunk_index,
+            'text': chunk_text,
+            'metadata': metadata,
+            'created_at': created_at.isoformat() if created_at else None,
+            'similarity': 1 - distance,  # Convert distance to similarity score
+            'distance': distance,
+            'document_name': filename,
+            'relative_path': relative_path or filename
+        }
+
+    def _search_prepared(
+        self,
+        session: Session,
+        query_vector: List[float],
+        top_k: int,
+        document_id: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Run search() through the prepared statement for this storage type"""
+        name, param_types, sql = self._search_statement(filtered=bool(document_id))
+        params = {'embedding': _query_vector_literal(query_vector), 'top_k': top_k}
+        if document_id:
+            params['document_id'] = str(uuid.UUID(document_id))
+
+        rows = self._execute_prepared(session, name, param_types, sql, params)
+        return [self._search_row_to_result(row) for row in rows]
+
     def search(
         self,
         query_vector: List[float],
         top_k: int = 10,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
-        Search for similar chunks using cosine similarity.
+        Search for similar chunks (cosine or inner product, see __init__).
+
+        The document filename and relative path are joined in the same query,
+        so results need no further document lookups.
 
         Args:
             query_vector: Query embedding vector
             top_k: Number of results to return
             filters: Optional filters (e.g., {'document_id': 'uuid'})
+            ef_search: HNSW recall/latency knob for this query (default
+                       depends on top_k, see default_ef_search())
 
         Returns:
-            List of chunk dicts with similarity scores
+            List of chunk dicts with similarity scores and document_name/relative_path
         """
         session = self.SessionLocal()
         try:
-            # Build base query
-            query = session.query(
-                Chunk,
-                Chunk.embedding.cosine_distance(query_vector).label('distance')
-            )
+            self._set_ef_search(session, top_k, ef_search)
 
-            # Apply filters
-            if filters:
-                if 'document_id' in filters:
-                    query = query.filter(Chunk.document_id == uuid.UUID(filters['document_id']))
+            document_id = filters.get('document_id') if filters else None
 
-            # Order by similarity (lower distance = more similar)
-            query = query.order_by('distance')
+            if self.use_prepared_statements:
+                formatted_results = self._search_prepared(session, query_vector, top_k, document_id)
+            else:
+                distance, order_by = self._distance_expr(Chunk.embedding, self._query_vector(query_vector))
 
-            # Limit results
-            query = query.limit(top_k)
+                # Build base query (join documents for the filename)
+                query = session.query(
+                    Chunk.id,
+                    Chunk.document_id,
+                    Chunk.chunk_index,
+                    Chunk.text,
+                    Chunk.chunk_metadata,
+                    Chunk.created_at,
+                    distance.label('distance'),
+                    Document.filename,
+                    Document.doc_metadata['relative_path'].astext
+                ).join(Document, Chunk.document_id == Document.id)
 
-            # Execute query
-            results = query.all()
+                # Apply filters
+                if document_id:
+                    query = query.filter(Chunk.document_id == uuid.UUID(document_id))
 
-            # Format results
-            formatted_results = []
-            for chunk, distance in results:
-                result = chunk.to_dict(include_embedding=False)
-                result['similarity'] = 1 - distance  # Convert distance to similarity score
-                result['distance'] = distance
-                formatted_results.append(result)
+                # Order by similarity (lower distance = more similar), limit results
+                query = query.order_by(order_by).limit(top_k)
+
+                formatted_results = [self._search_row_to_result(row) for row in query.all()]
 
             if self.debug:
                 self.logger.info(f"Search returned {len(formatted_results)} results")
@@ -228,6 +744,232 @@ class PgVectorStore(BaseVectorStore):
         finally:
             session.close()
 
+    def search_rescored(
+        self,
+        query_vector: List[float],
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        oversample: int = 4,
+        ef_search: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Two-stage search: binary-quantized candidates, rescored at full precision.
+
+        top_k * oversample candidates are taken from the binary index (see
+        rebuild_binary_index()) and reordered by exact distance to the
+        stored embeddings, all in one statement. Without that index the first
+        stage is a sequential scan - use search() instead.
+
+        Args:
+            query_vector: Query embedding vector
+            top_k: Number of results to return
+            filters: Optional filters (e.g., {'document_id': 'uuid'})
+            oversample: Candidates per result for the rescoring stage
+            ef_search: HNSW recall/latency knob for the candidate scan (default
+                       depends on the candidate count, see default_ef_search())
+
+        Returns:
+            List of chunk dicts with similarity scores and document_name/relative_path
+            (same shape as search())
+        """
+        candidates = top_k * max(1, oversample)
+        params = {'embedding': _query_vector_literal(query_vector), 'top_k': top_k, 'candidates': candidates}
+        where = ""
+
+        document_id = filters.get('document_id') if filters else None
+        if document_id:
+            params['document_id'] = uuid.UUID(document_id)
+            where = "WHERE document_id = :document_id"
+
+        distance, order_by = self._distance_sql(":embedding")
+        statement = text(RESCORE_SEARCH_SQL.format(
+            distance=distance, order_by=order_by, where=where,
+            dim=self.embedding_dim, storage=self.embedding_storage
+        ))
+
+        session = self.SessionLocal()
+        try:
+            self._set_ef_search(session, candidates, ef_search)
+
+            formatted_results = [
+                self._search_row_to_result(row)
+                for row in session.execute(statement, params)
+            ]
+
+            if self.debug:
+                self.logger.info(f"Rescored search returned {len(formatted_results)} results")
+
+            return formatted_results
+
+        except Exception as e:
+            self.logger.error(f"Search failed: {e}")
+            raise
+        finally:
+            session.close()
+
+    def search_batch(
+        self,
+        query_vectors: List[List[float]],
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several query vectors in a single SQL statement.
+
+        The query vectors are sent as one derived table and each runs its own
+        ANN lookup through a LATERAL subquery, so N queries cost one round trip.
+
+        Args:
+            query_vectors: Query embedding vectors
+            top_k: Number of results to return per query
+            filters: Optional filters (e.g., {'document_id': 'uuid'})
+            ef_search: HNSW recall/latency knob (see search())
+
+        Returns:
+            One result list per query vector (same shape as search())
+        """
+        if not query_vectors:
+            return []
+
+        queries = union_all(*[
+            select(
+                literal(i, Integer).label('qid'),
+                self._query_vector(vector).label('v')
+            )
+            for i, vector in enumerate(query_vectors)
+        ]).subquery('q')
+
+        distance, order_by = self._distance_expr(Chunk.embedding, queries.c.v)
+        nearest = select(
+            Chunk.id,
+            Chunk.document_id,
+            Chunk.chunk_index,
+            Chunk.text,
+            Chunk.chunk_metadata,
+            Chunk.created_at,
+            distance.label('distance')
+        )
+
+        # Apply filters
+        if filters:
+            if 'document_id' in filters:
+                nearest = nearest.where(Chunk.document_id == uuid.UUID(filters['document_id']))
+
+        nearest = nearest.order_by(order_by).limit(top_k).lateral('c')
+
+        statement = select(
+            queries.c.qid,
+            nearest,
+            Document.filename,
+            Document.doc_metadata['relative_path'].astext
+        ).select_from(
+            queries.join(nearest, true()).join(Document, Document.id == nearest.c.document_id)
+        ).order_by(queries.c.qid, nearest.c.distance)
+
+        session = self.SessionLocal()
+        try:
+            self._set_ef_search(session, top_k, ef_search)
+
+            results = [[] for _ in query_vectors]
+            for row in session.execute(statement):
+                results[row[0]].append(self._search_row_to_result(row[1:]))
+
+            if self.debug:
+                self.logger.info(f"Batch search of {len(query_vectors)} queries returned "
+                                 f"{sum(len(r) for r in results)} results")
+
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Batch search failed: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_chunk_vectors(
+        self,
+        document_ids: Optional[List[str]] = None
+    ) -> Tuple[List[str], List[str], np.ndarray]:
+        """
+        Read chunk embeddings, e.g. to build an in-process index (see MemoryVectorIndex).
+
+        Args:
+            document_ids: Only chunks of these documents (all chunks if not provided)
+
+        Returns:
+            (chunk IDs, document ID per chunk, float32 matrix with one embedding row per chunk)
+        """
+        # halfvec columns are read back as vector, so both storages give numpy rows
+        statement = select(
+            Chunk.id,
+            Chunk.document_id,
+            cast(Chunk.embedding, Vector(self.embedding_dim))
+        )
+        if document_ids is not None:
+            statement = statement.where(Chunk.document_id.in_([uuid.UUID(d) for d in document_ids]))
+
+        session = self.SessionLocal()
+        try:
+            chunk_ids, chunk_document_ids, vectors = [], [], []
+            for chunk_id, document_id, embedding in session.execute(
+                statement.execution_options(yield_per=5000)
+            ):
+                chunk_ids.append(str(chunk_id))
+                chunk_document_ids.append(str(document_id))
+                vectors.append(embedding)
+
+            matrix = np.array(vectors, dtype=np.float32).reshape(-1, self.embedding_dim)
+            return chunk_ids, chunk_document_ids, matrix
+
+        except Exception as e:
+            self.logger.error(f"Failed to get chunk vectors: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_search_results(self, hits: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+        """
+        Build search results for chunks found by an external index.
+
+        Args:
+            hits: (chunk ID, distance) pairs, nearest first
+
+        Returns:
+            Chunk dicts in hit order (same shape as search()); chunks no longer
+            in the database are skipped
+        """
+        if not hits:
+            return []
+
+        session = self.SessionLocal()
+        try:
+            rows = session.query(
+                Chunk.id,
+                Chunk.document_id,
+                Chunk.chunk_index,
+                Chunk.text,
+                Chunk.chunk_metadata,
+                Chunk.created_at,
+                Document.filename,
+                Document.doc_metadata['relative_path'].astext
+            ).join(Document, Chunk.document_id == Document.id).filter(
+                Chunk.id.in_([uuid.UUID(chunk_id) for chunk_id, _ in hits])
+            ).all()
+
+            by_id = {str(row[0]): row for row in rows}
+            return [
+                self._search_row_to_result((*by_id[chunk_id][:6], distance, *by_id[chunk_id][6:]))
+                for chunk_id, distance in hits
+                if chunk_id in by_id
+            ]
+
+        except Exception as e:
+            self.logger.error(f"Failed to get search results: {e}")
+            raise
+        finally:
+            session.close()
+
     def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
         """
         Get document by ID.
@@ -240,6 +982,25 @@ class PgVectorStore(BaseVectorStore):
         """
         session = self.SessionLocal()
         try:
+            if self.use_prepared_statements:
+                row = self._execute_prepared(
+                    session, "pgvs_get_document", "uuid", GET_DOCUMENT_SQL,
+                    {'document_id': str(uuid.UUID(document_id))}
+                ).first()
+                if row is None:
+                    return None
+
+                doc_id, filename, upload_date, page_count, chunk_count, metadata, created_at = row
+                return {
+                    "id": str(doc_id),
+                    "filename": filename,
+                    "upload_date": upload_date.isoformat() if upload_date else None,
+                    "page_count": page_count,
+                    "chunk_count": chunk_count,
+                    "metadata": metadata,
+                    "created_at": created_at.isoformat() if created_at else None
+                }
+
             document = session.query(Document).filter_by(id=uuid.UUID(document_id)).first()
 
             if document:
@@ -253,10 +1014,37 @@ class PgVectorStore(BaseVectorStore):
         finally:
             session.close()
 
+    def get_documents_by_ids(self, document_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several documents by ID in a single query.
+
+        Args:
+            document_ids: Document UUIDs (duplicates are ignored)
+
+        Returns:
+            Dict mapping document ID to document dict (missing IDs are omitted)
+        """
+        ids = {uuid.UUID(document_id) for document_id in document_ids}
+        if not ids:
+            return {}
+
+        session = self.SessionLocal()
+        try:
+            documents = session.query(Document).filter(Document.id.in_(ids)).all()
+
+            return {str(document.id): document.to_dict() for document in documents}
+
+        except Exception as e:
+            self.logger.error(f"Failed to get documents: {e}")
+            raise
+        finally:
+            session.close()
+
     def get_document_chunks(
         self,
         document_id: str,
-        include_embeddings: bool = False
+        include_embeddings: bool = False,
+        text_limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Get all chunks for a document.
@@ -264,17 +1052,48 @@ class PgVectorStore(BaseVectorStore):
         Args:
             document_id: Document UUID
             include_embeddings: Whether to include embedding vectors
+            text_limit: If set, return only the first text_limit characters of
+                        each chunk's text (truncated in SQL, e.g. for previews)
 
         Returns:
             List of chunk dicts
         """
         session = self.SessionLocal()
         try:
-            chunks = session.query(Chunk).filter_by(
-                document_id=uuid.UUID(document_id)
+            if text_limit is None or include_embeddings:
+                chunks = session.query(Chunk).filter_by(
+                    document_id=uuid.UUID(document_id)
+                ).order_by(Chunk.chunk_index).all()
+
+                results = [chunk.to_dict(include_embedding=include_embeddings) for chunk in chunks]
+                if text_limit is not None:
+                    for result in results:
+                        result['text'] = result['text'][:text_limit]
+                return results
+
+            # Project only the needed columns with the text cut server-side
+            rows = session.query(
+                Chunk.id,
+                Chunk.document_id,
+                Chunk.chunk_index,
+                func.substr(Chunk.text, 1, text_limit),
+                Chunk.chunk_metadata,
+                Chunk.created_at
+            ).filter(
+                Chunk.document_id == uuid.UUID(document_id)
             ).order_by(Chunk.chunk_index).all()
 
-            return [chunk.to_dict(include_embedding=include_embeddings) for chunk in chunks]
+            return [
+                {
+                    "id": str(chunk_id),
+                    "document_id": str(chunk_document_id),
+                    "chunk_index": chunk_index,
+                    "text": chunk_text,
+                    "metadata": metadata,
+                    "created_at": created_at.isoformat() if created_at else None
+                }
+                for chunk_id, chunk_document_id, chunk_index, chunk_text, metadata, created_at in rows
+            ]
 
         except Exception as e:
             self.logger.error(f"Failed to get document chunks: {e}")
@@ -315,6 +1134,41 @@ class PgVectorStore(BaseVectorStore):
         finally:
             session.close()
 
+    def truncate_all(self) -> Tuple[int, int]:
+        """
+        Delete all documents and chunks with a single TRUNCATE.
+
+        One statement instead of a DELETE (and commit) per document; no
+        per-row WAL and the space is reclaimed immediately.
+
+        Returns:
+            (document_count, chunk_count) removed
+        """
+        session = self.SessionLocal()
+        try:
+            # Lock first so the counts match what TRUNCATE removes
+            session.execute(text("LOCK TABLE documents, chunks IN ACCESS EXCLUSIVE MODE"))
+
+            document_count, chunk_count = session.query(
+                select(func.count()).select_from(Document).scalar_subquery(),
+                select(func.count()).select_from(Chunk).scalar_subquery()
+            ).one()
+
+            session.execute(text("TRUNCATE TABLE chunks, documents RESTART IDENTITY CASCADE"))
+            session.commit()
+
+            if self.debug:
+                self.logger.info(f"Truncated {document_count} documents and {chunk_count} chunks")
+
+            return document_count, chunk_count
+
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"Failed to truncate tables: {e}")
+            raise
+        finally:
+            session.close()
+
     def delete_chunks(self, chunk_ids: List[str]) -> int:
         """
         Delete specific chunks by ID.
@@ -376,6 +1230,34 @@ class PgVectorStore(BaseVectorStore):
         finally:
             session.close()
 
+    def iter_documents(self, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all documents, newest first, without loading them all.
+
+        Rows are fetched through a server-side cursor in batches of
+        batch_size, so memory use does not grow with the number of documents.
+
+        Args:
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            Document dicts
+        """
+        session = self.SessionLocal()
+        try:
+            query = session.query(Document).order_by(
+                Document.upload_date.desc()
+            ).execution_options(yield_per=batch_size)
+
+            for document in query:
+                yield document.to_dict()
+
+        except Exception as e:
+            self.logger.error(f"Failed to iterate documents: {e}")
+            raise
+        finally:
+            session.close()
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get database statistics.
@@ -385,8 +1267,11 @@ class PgVectorStore(BaseVectorStore):
         """
         session = self.SessionLocal()
         try:
-            document_count = session.query(Document).count()
-            chunk_count = session.query(Chunk).count()
+            # Both counts in a single round trip
+            document_count, chunk_count = session.query(
+                select(func.count()).select_from(Document).scalar_subquery(),
+                select(func.count()).select_from(Chunk).scalar_subquery()
+            ).one()
 
             return {
                 "document_count": document_count,
@@ -401,8 +1286,8 @@ class PgVectorStore(BaseVectorStore):
             session.close()
 
     def close(self):
-        """Close database connections"""
-        if self.engine:
+        """Close database connections (a shared engine is left open)"""
+        if self.engine and self._owns_engine:
             self.engine.dispose()
             if self.debug:
                 self.logger.info("Database connections closed")
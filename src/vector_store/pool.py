@@ -0,0 +1,52 @@
+"""
+Process-wide SQLAlchemy engine (connection pool) for PostgreSQL.
+
+Creating an engine per store means every caller pays for new connections
+(TCP + auth). get_engine() returns one pooled engine per connection string
+that is shared for the lifetime of the process.
+"""
+
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from config.settings import settings
+
+_engines: Dict[str, Engine] = {}
+_lock = threading.Lock()
+
+
+def get_engine(connection_string: Optional[str] = None) -> Engine:
+    """
+    Get the shared engine for a database, creating it on first use.
+
+    Args:
+        connection_string: PostgreSQL connection string (uses settings if not provided)
+
+    Returns:
+        QueuePool-backed SQLAlchemy Engine
+    """
+    url = connection_string or settings.database_url
+
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(
+                url,
+                echo=settings.db_echo,
+                pool_size=settings.db_pool_size,
+                pool_pre_ping=True  # Verify connections before using
+            )
+            _engines[url] = engine
+
+        return engine
+
+
+def dispose_engines():
+    """Close all pooled connections (e.g. on application shutdown)"""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
@@ -13,6 +13,8 @@ from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import declarative_base, relationship
 from pgvector.sqlalchemy import Vector
 
+from config.settings import settings
+
 Base = declarative_base()
 
 
@@ -74,7 +76,10 @@ class Chunk(Base):
     # Indexes for efficient querying
     __table_args__ = (
         Index("ix_chunks_document_id", "document_id"),
-        Index("ix_chunks_embedding_cosine", "embedding", postgresql_using="ivfflat", postgresql_ops={"embedding": "vector_cosine_ops"}),
+        # Name kept for both metrics (drop/rebuild refer to it); ops follow settings.embedding_distance
+        Index("ix_chunks_embedding_cosine", "embedding", postgresql_using="ivfflat", postgresql_ops={
+            "embedding": "vector_ip_ops" if settings.embedding_distance == "inner_product" else "vector_cosine_ops"
+        }),
     )
 
     def __repr__(self):
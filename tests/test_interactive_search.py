@@ -182,13 +182,7 @@ class InteractiveTester:
         if self.verbose:
             print(f"  Generating embeddings for {len(chunks)} chunks...")
         texts = [chunk['text'] for chunk in chunks]
-        embeddings = self.embedder.embed_batch(texts)
-
-        # Add embeddings to chunks
-        chunks_with_embeddings = []
-        for chunk, embedding in zip(chunks, embeddings):
-            chunk['embedding'] = embedding
-            chunks_with_embeddings.append(chunk)
+        embeddings = self.embedder.embed_batch_array(texts)  # float32 matrix, one row per chunk
 
         # 5. Store
         if self.verbose:
@@ -210,15 +204,21 @@ class InteractiveTester:
             'cleaning_warnings': len(warnings)
         }
 
-        document_id = self.store.insert_document(filename, page_count, metadata)
-        self.store.insert_chunks(document_id, chunks_with_embeddings)
+        # Document + chunks in one transaction; chunk rows are COPYed straight from the matrix
+        [document_id] = self.store.insert_documents([{
+            'filename': filename,
+            'page_count': page_count,
+            'metadata': metadata,
+            'chunks': chunks,
+            'embeddings': embeddings
+        }])
 
         return {
             'document_id': document_id,
             'filename': filename,
             'relative_path': relative_path,
             'page_count': page_count,
-            'chunk_count': len(chunks_with_embeddings)
+            'chunk_count': len(chunks)
         }
 
     def search(self, query: str, top_k: int = 3) -> List[Dict[str, Any]]:
@@ -241,9 +241,10 @@ class InteractiveTester:
             top_k=top_k
         )
 
-        # Enrich with document details
+        # Enrich with document details (one query for all hits)
+        documents = self.store.get_documents_by_ids([result['document_id'] for result in results])
         for result in results:
-            doc = self.store.get_document(result['document_id'])
+            doc = documents[result['document_id']]
             result['document_name'] = doc['filename']
             result['document_metadata'] = doc.get('metadata', {})
 
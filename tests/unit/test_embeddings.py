@@ -86,6 +86,25 @@ class TestSentenceTransformerEmbedder:
         except ImportError:
             pytest.skip("sentence-transformers not installed")
 
+    def test_embed_batch_array(self):
+        """Test batch embedding into a float32 matrix matches embed_batch"""
+        try:
+            import numpy as np
+            from src.embeddings import SentenceTransformerEmbedder
+
+            embedder = SentenceTransformerEmbedder(debug=False)
+
+            texts = ["Vacation policy details", "", "Health insurance benefits"]
+
+            matrix = embedder.embed_batch_array(texts)
+
+            assert matrix.dtype == np.float32
+            assert matrix.shape == (len(texts), embedder.embedding_dim)
+            assert not matrix[1].any()
+            assert np.allclose(matrix, embedder.embed_batch(texts), atol=1e-6)
+        except ImportError:
+            pytest.skip("sentence-transformers not installed")
+
     def test_batch_with_empty_texts(self):
         """Test batch embedding with some empty texts"""
         try:
@@ -194,6 +213,20 @@ class TestSentenceTransformerEmbedder:
             assert 'embedding_dimension' in info
             assert 'device' in info
             assert 'normalize' in info
+            assert info['precision'] in ('fp32', 'fp16', 'int8')
+        except ImportError:
+            pytest.skip("sentence-transformers not installed")
+
+    def test_get_embedder_is_cached(self):
+        """Test that get_embedder loads each model once per process"""
+        try:
+            from src.embeddings import get_embedder
+
+            embedder1 = get_embedder(device="cpu")
+            embedder2 = get_embedder(device="cpu")
+
+            assert embedder1 is embedder2
+            assert embedder1.embedding_dim > 0
         except ImportError:
             pytest.skip("sentence-transformers not installed")
 
@@ -217,6 +250,154 @@ class TestSentenceTransformerEmbedder:
         except ImportError:
             pytest.skip("sentence-transformers not installed")
 
+    def test_max_seq_length_only_lowers_limit(self):
+        """Test that max_seq_length caps the model limit but never raises it"""
+        try:
+            from src.embeddings import SentenceTransformerEmbedder, max_tokens_for_chunks
+
+            default_limit = SentenceTransformerEmbedder().model.max_seq_length
+
+            capped = SentenceTransformerEmbedder(max_seq_length=64)
+            assert capped.model.max_seq_length == min(64, default_limit)
+
+            raised = SentenceTransformerEmbedder(max_seq_length=100000)
+            assert raised.model.max_seq_length == default_limit
+
+            assert max_tokens_for_chunks(1000) == 333
+            assert max_tokens_for_chunks(100000) == 512
+        except ImportError:
+            pytest.skip("sentence-transformers not installed")
+
+    def test_onnx_int8_backend(self):
+        """Test the int8 ONNX backend stays close to the PyTorch FP32 embeddings"""
+        pytest.importorskip("optimum.onnxruntime")
+        from src.embeddings import SentenceTransformerEmbedder
+
+        texts = ["Employees receive 15 days of paid vacation.", "Health insurance starts after 30 days."]
+
+        torch_embeddings = SentenceTransformerEmbedder().embed_batch_array(texts)
+        onnx_embedder = SentenceTransformerEmbedder(backend="onnx_int8")
+        onnx_embeddings = onnx_embedder.embed_batch_array(texts)
+
+        assert onnx_embedder.get_model_info()["backend"] == "onnx_int8"
+        assert onnx_embeddings.shape == torch_embeddings.shape
+        # Both normalized: row-wise dot product is the cosine similarity
+        assert (np.sum(onnx_embeddings * torch_embeddings, axis=1) > 0.95).all()
+
+    def test_unknown_backend(self):
+        """Test an unknown backend is rejected before loading a model"""
+        try:
+            from src.embeddings import SentenceTransformerEmbedder
+
+            with pytest.raises(ValueError):
+                SentenceTransformerEmbedder(backend="tensorrt")
+        except ImportError:
+            pytest.skip("sentence-transformers not installed")
+
+
+class TestQueryEmbeddingCache:
+    """Test the on-disk query embedding cache"""
+
+    def test_cache_roundtrip(self, tmp_path):
+        """Test cached vectors are returned for the same model and query"""
+        from src.embeddings import QueryEmbeddingCache
+
+        cache = QueryEmbeddingCache(path=str(tmp_path / "cache.sqlite"), model_name="model-a", normalize=True)
+        cache.put_many(["vacation policy", "health insurance"], [[0.5, 0.25], [1.0, -1.0]])
+
+        assert cache.get_many(["health insurance", "unknown", "vacation  policy"]) == [
+            [1.0, -1.0], None, [0.5, 0.25]
+        ]
+        cache.close()
+
+    def test_cache_keyed_by_model(self, tmp_path):
+        """Test vectors from one model are not served for another"""
+        from src.embeddings import QueryEmbeddingCache
+
+        path = str(tmp_path / "cache.sqlite")
+        cache_a = QueryEmbeddingCache(path=path, model_name="model-a", normalize=True)
+        cache_a.put("vacation policy", [0.5, 0.25])
+        cache_a.close()
+
+        cache_b = QueryEmbeddingCache(path=path, model_name="model-b", normalize=True)
+        assert cache_b.get("vacation policy") is None
+        cache_b.close()
+
+    def test_cache_keyed_by_backend(self, tmp_path):
+        """Test vectors from one embedder backend are not served for another"""
+        from src.embeddings import QueryEmbeddingCache
+
+        path = str(tmp_path / "cache.sqlite")
+        cache_torch = QueryEmbeddingCache(path=path, model_name="model-a", backend="torch", normalize=True)
+        cache_torch.put("vacation policy", [0.5, 0.25])
+        cache_torch.close()
+
+        cache_onnx = QueryEmbeddingCache(path=path, model_name="model-a", backend="onnx_int8", normalize=True)
+        assert cache_onnx.get("vacation policy") is None
+        cache_onnx.close()
+
+    def test_cache_keyed_by_onnx_file(self, tmp_path):
+        """Test vectors from one ONNX export are not served for another"""
+        from src.embeddings import QueryEmbeddingCache
+
+        path = str(tmp_path / "cache.sqlite")
+        cache_avx2 = QueryEmbeddingCache(
+            path=path, model_name="model-a", backend="onnx_int8",
+            onnx_file="onnx/model_quint8_avx2.onnx", normalize=True
+        )
+        cache_avx2.put("vacation policy", [0.5, 0.25])
+        cache_avx2.close()
+
+        cache_vnni = QueryEmbeddingCache(
+            path=path, model_name="model-a", backend="onnx_int8",
+            onnx_file="onnx/model_qint8_avx512_vnni.onnx", normalize=True
+        )
+        assert cache_vnni.get("vacation policy") is None
+        cache_vnni.close()
+
+
+class TestChunkEmbeddingCache:
+    """Test the on-disk chunk embedding cache"""
+
+    def test_cache_evicts_least_recently_used(self, tmp_path):
+        """Test hits are returned and the least recently used entries are evicted"""
+        from src.embeddings import ChunkEmbeddingCache
+
+        cache = ChunkEmbeddingCache(
+            path=str(tmp_path / "chunks.sqlite"), model_name="model-a",
+            backend="torch", normalize=True, max_entries=2
+        )
+        cache.put_many(["confidential", "page 1"], np.array([[0.5, 0.25], [1.0, -1.0]]))
+        assert cache.get_many(["confidential"])[0].tolist() == [0.5, 0.25]  # now most recently used
+
+        cache.put_many(["signature block"], np.array([[2.0, 0.0]]))
+
+        assert len(cache) == 2
+        hits = cache.get_many(["page 1", "confidential", "signature block"])
+        assert hits[0] is None
+        assert hits[1].tolist() == [0.5, 0.25]
+        assert hits[2].tolist() == [2.0, 0.0]
+        cache.close()
+
+    def test_cache_keyed_by_onnx_file(self, tmp_path):
+        """Test vectors from one ONNX export are not served for another"""
+        from src.embeddings import ChunkEmbeddingCache
+
+        path = str(tmp_path / "chunks.sqlite")
+        cache_avx2 = ChunkEmbeddingCache(
+            path=path, model_name="model-a", backend="onnx_int8",
+            onnx_file="onnx/model_quint8_avx2.onnx", normalize=True
+        )
+        cache_avx2.put_many(["confidential"], np.array([[0.5, 0.25]]))
+        cache_avx2.close()
+
+        cache_vnni = ChunkEmbeddingCache(
+            path=path, model_name="model-a", backend="onnx_int8",
+            onnx_file="onnx/model_qint8_avx512_vnni.onnx", normalize=True
+        )
+        assert cache_vnni.get_many(["confidential"]) == [None]
+        cache_vnni.close()
+
 
 class TestEmbeddingIntegration:
     """Test embedding integration with chunking"""
@@ -0,0 +1,95 @@
+"""
+Tests for the in-process vector index (pure numpy, no database needed).
+"""
+
+import numpy as np
+import pytest
+
+from src.vector_store.memory_index import MemoryVectorIndex
+
+
+@pytest.fixture
+def index():
+    """Index of five 2-d chunks over two documents"""
+    index = MemoryVectorIndex(embedding_dim=2)
+    index.add(
+        ["c0", "c1", "c2", "c3", "c4"],
+        ["doc-a", "doc-a", "doc-b", "doc-b", "doc-a"],
+        np.array([
+            [1.0, 0.0],   # angle 0
+            [3.0, 1.0],   # ~18 degrees (norm != 1, normalized on add)
+            [1.0, 1.0],   # 45 degrees
+            [0.0, 2.0],   # 90 degrees
+            [-1.0, 0.0],  # 180 degrees
+        ])
+    )
+    return index
+
+
+class TestMemoryVectorIndex:
+    """Test exact cosine search over the in-memory rows"""
+
+    @pytest.mark.parametrize("top_k", [2, 3, 5, 10])
+    def test_search_orders_by_distance(self, index, top_k):
+        """Test results are nearest first and cut at top_k (argpartition and full-sort paths)"""
+        hits = index.search([2.0, 0.0], top_k=top_k)
+
+        assert [chunk_id for chunk_id, _ in hits] == ["c0", "c1", "c2", "c3", "c4"][:top_k]
+        distances = [distance for _, distance in hits]
+        assert distances == sorted(distances)
+        assert distances[0] == pytest.approx(0.0, abs=1e-6)
+        if top_k >= 4:
+            assert distances[3] == pytest.approx(1.0, abs=1e-6)
+
+    def test_search_matches_cosine_distance(self, index):
+        """Test distances are 1 - cosine similarity"""
+        query = np.array([0.3, 0.7])
+        hits = dict(index.search(query, top_k=5))
+
+        assert hits["c1"] == pytest.approx(
+            1 - np.dot([3.0, 1.0], query) / (np.linalg.norm([3.0, 1.0]) * np.linalg.norm(query)),
+            abs=1e-6
+        )
+
+    def test_search_document_filter(self, index):
+        """Test document_id restricts results to that document's chunks"""
+        hits = index.search([2.0, 0.0], top_k=10, document_id="doc-b")
+        assert [chunk_id for chunk_id, _ in hits] == ["c2", "c3"]
+
+        assert index.search([2.0, 0.0], top_k=10, document_id="doc-missing") == []
+
+    def test_remove_document(self, index):
+        """Test remove_document drops a document's chunks and returns how many"""
+        assert index.remove_document("doc-a") == 3
+        assert len(index) == 2
+        assert [chunk_id for chunk_id, _ in index.search([1.0, 0.0], top_k=10)] == ["c2", "c3"]
+
+        assert index.remove_document("doc-a") == 0
+        assert len(index) == 2
+
+    def test_empty_index(self):
+        """Test an empty (or cleared) index returns no results"""
+        index = MemoryVectorIndex(embedding_dim=2)
+        assert len(index) == 0
+        assert index.search([1.0, 0.0], top_k=5) == []
+        assert index.remove_document("doc-a") == 0
+
+        index.add(["c0"], ["doc-a"], np.array([[1.0, 0.0]]))
+        index.clear()
+        assert index.search([1.0, 0.0], top_k=5) == []
+
+    def test_zero_top_k(self, index):
+        """Test top_k <= 0 returns no results"""
+        assert index.search([1.0, 0.0], top_k=0) == []
+
+    def test_zero_norm_vectors(self):
+        """Test zero vectors don't produce NaN distances"""
+        index = MemoryVectorIndex(embedding_dim=2)
+        index.add(["zero", "unit"], ["doc-a", "doc-a"], np.array([[0.0, 0.0], [0.0, 1.0]]))
+
+        hits = index.search([0.0, 1.0], top_k=2)
+        assert [chunk_id for chunk_id, _ in hits] == ["unit", "zero"]
+        assert hits[1][1] == pytest.approx(1.0)
+
+        hits = index.search([0.0, 0.0], top_k=2)
+        assert all(distance == pytest.approx(1.0) for _, distance in hits)
@@ -0,0 +1,152 @@
+"""
+Tests for the background upload queue.
+
+The RAG service is replaced by a stub, so no database or model is needed.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from src.api.services import upload_queue as upload_queue_module
+from src.api.services.upload_queue import UploadQueue
+
+
+class StubRAGService:
+    """Stands in for RAGService.process_pdfs_sync"""
+
+    def __init__(self, queue: UploadQueue, results=None, error: Exception = None):
+        self.queue = queue
+        self.results = results
+        self.error = error
+        self.calls = []
+
+    def process_pdfs_sync(self, items):
+        # Job statuses and files as seen while the batch is being processed
+        self.calls.append({
+            'filenames': [item['original_filename'] for item in items],
+            'statuses': [job['status'] for job in self.queue.jobs.values()],
+            'files_exist': [os.path.exists(item['file_path']) for item in items]
+        })
+        if self.error:
+            raise self.error
+        if self.results is not None:
+            return self.results
+        return [{'document_id': f"doc-{i}", 'status': 'completed'} for i in range(len(items))]
+
+
+@pytest.fixture
+def pdf_files(tmp_path):
+    """Two saved uploads"""
+    paths = []
+    for name in ("first.pdf", "second.pdf"):
+        path = tmp_path / name
+        path.write_bytes(b"%PDF-1.4")
+        paths.append(str(path))
+    return paths
+
+
+def run_jobs(queue: UploadQueue, pdf_files):
+    """Submit the files, wait until the workers are done with them and stop the queue"""
+    async def run():
+        jobs = [queue.submit(path, os.path.basename(path)) for path in pdf_files]
+        statuses = [job['status'] for job in jobs]
+        await queue._queue.join()
+        await queue.stop()
+        return jobs, statuses
+
+    return asyncio.run(run())
+
+
+class TestUploadQueue:
+    """Test the upload job lifecycle"""
+
+    def test_jobs_complete(self, monkeypatch, pdf_files):
+        """Test jobs go from queued through processing to completed"""
+        queue = UploadQueue(max_concurrency=1, batch_size=4)
+        service = StubRAGService(queue)
+        monkeypatch.setattr(upload_queue_module, "get_rag_service", lambda: service)
+
+        jobs, submitted_statuses = run_jobs(queue, pdf_files)
+
+        assert submitted_statuses == ['queued', 'queued']
+        # Both uploads were waiting, so one worker took them as one batch
+        assert service.calls == [{
+            'filenames': ['first.pdf', 'second.pdf'],
+            'statuses': ['processing', 'processing'],
+            'files_exist': [True, True]
+        }]
+        assert [job['status'] for job in jobs] == ['completed', 'completed']
+        assert [job['result']['document_id'] for job in jobs] == ['doc-0', 'doc-1']
+        assert all(job['error'] is None for job in jobs)
+        assert queue.get(jobs[0]['job_id']) is jobs[0]
+
+    def test_failed_result_sets_error(self, monkeypatch, pdf_files):
+        """Test an exception returned for one PDF fails only that job"""
+        queue = UploadQueue(max_concurrency=1, batch_size=4)
+        service = StubRAGService(queue, results=[ValueError("No text extracted"), {'document_id': 'doc-1'}])
+        monkeypatch.setattr(upload_queue_module, "get_rag_service", lambda: service)
+
+        jobs, _ = run_jobs(queue, pdf_files)
+
+        assert jobs[0]['status'] == 'failed'
+        assert jobs[0]['error'] == "No text extracted"
+        assert jobs[0]['result'] is None
+        assert jobs[1]['status'] == 'completed'
+        assert jobs[1]['result'] == {'document_id': 'doc-1'}
+
+    def test_service_error_fails_batch(self, monkeypatch, pdf_files):
+        """Test an exception raised by the service fails every job in the batch"""
+        queue = UploadQueue(max_concurrency=1, batch_size=4)
+        service = StubRAGService(queue, error=RuntimeError("Database unavailable"))
+        monkeypatch.setattr(upload_queue_module, "get_rag_service", lambda: service)
+
+        jobs, _ = run_jobs(queue, pdf_files)
+
+        assert [job['status'] for job in jobs] == ['failed', 'failed']
+        assert [job['error'] for job in jobs] == ["Database unavailable"] * 2
+
+    @pytest.mark.parametrize("error", [None, RuntimeError("Database unavailable")])
+    def test_temp_files_removed(self, monkeypatch, pdf_files, error):
+        """Test saved uploads are deleted once their job has run, whether or not it succeeded"""
+        queue = UploadQueue(max_concurrency=1, batch_size=4)
+        service = StubRAGService(queue, error=error)
+        monkeypatch.setattr(upload_queue_module, "get_rag_service", lambda: service)
+
+        run_jobs(queue, pdf_files)
+
+        assert service.calls[0]['files_exist'] == [True, True]
+        assert not any(os.path.exists(path) for path in pdf_files)
+
+    def test_stop_fails_jobs_that_never_ran(self, monkeypatch, pdf_files):
+        """Test stop() fails queued jobs and deletes their files"""
+        queue = UploadQueue(max_concurrency=1, batch_size=4)
+        service = StubRAGService(queue)
+        monkeypatch.setattr(upload_queue_module, "get_rag_service", lambda: service)
+
+        async def run():
+            # The workers don't get to run before stop() cancels them
+            jobs = [queue.submit(path, os.path.basename(path)) for path in pdf_files]
+            await queue.stop()
+            return jobs
+
+        jobs = asyncio.run(run())
+
+        assert service.calls == []
+        assert [job['status'] for job in jobs] == ['failed', 'failed']
+        assert all(job['error'] == 'Server shut down before processing' for job in jobs)
+        assert not any(os.path.exists(path) for path in pdf_files)
+
+    def test_forget_old_jobs(self, monkeypatch):
+        """Test only the newest MAX_FINISHED_JOBS finished jobs are kept"""
+        monkeypatch.setattr(upload_queue_module, "MAX_FINISHED_JOBS", 2)
+        queue = UploadQueue(max_concurrency=1, batch_size=1)
+        statuses = ['completed', 'failed', 'queued', 'completed', 'processing', 'failed']
+        for i, status in enumerate(statuses):
+            queue.jobs[f"job-{i}"] = {'job_id': f"job-{i}", 'status': status}
+
+        queue._forget_old_jobs()
+
+        # The two newest finished jobs, plus every unfinished one
+        assert list(queue.jobs) == ['job-2', 'job-3', 'job-4', 'job-5']
@@ -11,6 +11,7 @@ Set DATABASE_URL environment variable for tests:
 """
 
 import pytest
+import numpy as np
 import os
 from typing import List
 import uuid
@@ -117,6 +118,31 @@ class TestDatabaseInitialization:
         assert isinstance(stats["document_count"], int)
         assert isinstance(stats["chunk_count"], int)
 
+    def test_rebuild_vector_index(self, vector_store):
+        """Test the vector index can be dropped and rebuilt"""
+        vector_store.drop_vector_index()
+        assert vector_store.vector_index_type() is None
+        vector_store.rebuild_vector_index(index_type="hnsw")
+        assert vector_store.vector_index_type() == "hnsw"
+
+        stats = vector_store.get_stats()
+        assert isinstance(stats["chunk_count"], int)
+
+    def test_shared_engine(self):
+        """Test stores can share the pooled engine without closing it"""
+        from src.vector_store.pool import get_engine
+
+        engine = get_engine(os.getenv("DATABASE_URL"))
+        assert get_engine(os.getenv("DATABASE_URL")) is engine
+
+        store = PgVectorStore(embedding_dim=384, engine=engine)
+        store.get_stats()
+        store.close()
+
+        # Engine is still usable after the store is closed
+        other = PgVectorStore(embedding_dim=384, engine=engine)
+        assert isinstance(other.get_stats()["document_count"], int)
+
 
 class TestDocumentOperations:
     """Test document CRUD operations"""
@@ -146,6 +172,15 @@ class TestDocumentOperations:
         assert doc["metadata"]["test"] is True
         assert "upload_date" in doc
 
+    def test_get_documents_by_ids(self, vector_store, sample_document):
+        """Test retrieving several documents in one call"""
+        fake_id = str(uuid.uuid4())
+        docs = vector_store.get_documents_by_ids([sample_document, sample_document, fake_id])
+
+        assert list(docs) == [sample_document]
+        assert docs[sample_document]["filename"] == "test_document.pdf"
+        assert vector_store.get_documents_by_ids([]) == {}
+
     def test_get_nonexistent_document(self, vector_store):
         """Test getting document that doesn't exist"""
         fake_id = str(uuid.uuid4())
@@ -192,6 +227,23 @@ class TestDocumentOperations:
         assert test_doc is not None
         assert test_doc["filename"] == "test_document.pdf"
 
+    def test_iter_documents(self, vector_store, sample_document):
+        """Test streaming all documents in small batches"""
+        docs = list(vector_store.iter_documents(batch_size=2))
+
+        assert len(docs) == vector_store.get_stats()["document_count"]
+        assert any(d["id"] == sample_document for d in docs)
+
+    def test_truncate_all(self, vector_store, sample_document, sample_chunks):
+        """Test deleting everything with one TRUNCATE"""
+        stats = vector_store.get_stats()
+
+        deleted = vector_store.truncate_all()
+
+        assert deleted == (stats["document_count"], stats["chunk_count"])
+        assert vector_store.get_stats()["document_count"] == 0
+        assert vector_store.get_stats()["chunk_count"] == 0
+
 
 class TestChunkOperations:
     """Test chunk CRUD operations"""
@@ -211,6 +263,75 @@ class TestChunkOperations:
         assert len(chunk_ids) == 2
         assert all(len(cid) == 36 for cid in chunk_ids)  # UUID format
 
+        stored = vector_store.get_document_chunks(sample_document)
+        assert [c["id"] for c in stored] == chunk_ids
+        assert vector_store.get_document(sample_document)["chunk_count"] == 2
+
+    def test_copy_chunks(self, vector_store, sample_document, embedder):
+        """Test COPY-based bulk insert stores the same data as insert_chunks"""
+        texts = ["First chunk, with \"quotes\"", "Second chunk\nover two lines", ""]
+        chunks = [
+            {"text": text, "embedding": embedding, "metadata": {"index": i}}
+            for i, (text, embedding) in enumerate(zip(texts, embedder.embed_batch(texts)))
+        ]
+
+        chunk_ids = vector_store.copy_chunks(sample_document, chunks)
+        assert len(chunk_ids) == 3
+
+        stored = vector_store.get_document_chunks(sample_document, include_embeddings=True)
+        assert [c["text"] for c in stored] == texts
+        assert [c["metadata"] for c in stored] == [{"index": 0}, {"index": 1}, {"index": 2}]
+        assert np.allclose(stored[0]["embedding"], chunks[0]["embedding"], atol=1e-6)
+
+        doc = vector_store.get_document(sample_document)
+        assert doc["chunk_count"] == 3
+
+    def test_copy_chunks_with_matrix(self, vector_store, sample_document, embedder):
+        """Test COPY-based insert with embeddings passed as a float32 matrix"""
+        texts = ["Matrix row one", "Matrix row two"]
+        matrix = embedder.embed_batch_array(texts)
+        chunks = [{"text": text, "metadata": {}} for text in texts]
+
+        vector_store.copy_chunks(sample_document, chunks, matrix)
+
+        stored = vector_store.get_document_chunks(sample_document, include_embeddings=True)
+        # '%.9g' round-trips float32 exactly
+        assert np.array_equal(np.asarray([c["embedding"] for c in stored], dtype=np.float32), matrix)
+
+    def test_insert_documents(self, vector_store, embedder):
+        """Test inserting several documents with chunks in one transaction"""
+        texts = ["Batch chunk one", "Batch chunk two"]
+        matrix = embedder.embed_batch_array(texts)
+        chunks = [{"text": text, "metadata": {"i": i}} for i, text in enumerate(texts)]
+
+        doc_ids = vector_store.insert_documents([
+            {"filename": "batch_a.pdf", "page_count": 1, "metadata": {"test": True},
+             "chunks": chunks, "embeddings": matrix},
+            {"filename": "batch_b.pdf", "page_count": 2, "metadata": None,
+             "chunks": chunks[:1], "embeddings": matrix[:1]}
+        ])
+
+        try:
+            docs = vector_store.get_documents_by_ids(doc_ids)
+            assert docs[doc_ids[0]]["chunk_count"] == 2
+            assert docs[doc_ids[1]]["chunk_count"] == 1
+            assert [c["text"] for c in vector_store.get_document_chunks(doc_ids[0])] == texts
+        finally:
+            for doc_id in doc_ids:
+                vector_store.delete_document(doc_id)
+
+    def test_insert_documents_is_atomic(self, vector_store):
+        """Test that a failing document rolls back the whole batch"""
+        before = vector_store.get_stats()["document_count"]
+
+        with pytest.raises(Exception):
+            vector_store.insert_documents([
+                {"filename": "ok.pdf", "chunks": []},
+                {"filename": "bad.pdf", "chunks": [{"text": "x", "embedding": [0.0] * 3}]}  # wrong dimension
+            ])
+
+        assert vector_store.get_stats()["document_count"] == before
+
     def test_get_document_chunks(self, vector_store, sample_document, sample_chunks):
         """Test retrieving all chunks for a document"""
         chunks = vector_store.get_document_chunks(sample_document)
@@ -224,6 +345,17 @@ class TestChunkOperations:
         for i, chunk in enumerate(chunks):
             assert chunk["chunk_index"] == i
 
+    def test_get_chunks_with_text_limit(self, vector_store, sample_document, sample_chunks):
+        """Test retrieving chunk text previews truncated in SQL"""
+        full = vector_store.get_document_chunks(sample_document)
+        previews = vector_store.get_document_chunks(sample_document, text_limit=10)
+
+        assert len(previews) == len(full)
+        for chunk, preview in zip(full, previews):
+            assert preview["text"] == chunk["text"][:10]
+            assert preview["chunk_index"] == chunk["chunk_index"]
+            assert preview["metadata"] == chunk["metadata"]
+
     def test_get_chunks_with_embeddings(self, vector_store, sample_document, sample_chunks):
         """Test retrieving chunks with embeddings included"""
         chunks = vector_store.get_document_chunks(
@@ -296,6 +428,8 @@ class TestVectorSearch:
             assert "distance" in result
             assert "chunk_index" in result
             assert "document_id" in result
+            assert "document_name" in result
+            assert "relative_path" in result
 
             # Similarity should be between 0 and 1
             assert 0 <= result["similarity"] <= 1
@@ -325,6 +459,102 @@ class TestVectorSearch:
 
         # All results should be from the specified document
         assert all(r["document_id"] == sample_document for r in results)
+        assert all(r["document_name"] == "test_document.pdf" for r in results)
+
+    def test_search_batch_matches_search(self, vector_store, sample_document, sample_chunks, embedder):
+        """Test batch search returns the same hits as individual searches"""
+        queries = ["vacation and time off", "health insurance", "performance reviews"]
+        query_vectors = embedder.embed_batch(queries)
+
+        batch_results = vector_store.search_batch(query_vectors, top_k=2)
+
+        assert len(batch_results) == len(queries)
+        for query_vector, results in zip(query_vectors, batch_results):
+            single = vector_store.search(query_vector, top_k=2)
+            assert [r["id"] for r in results] == [r["id"] for r in single]
+            assert all("document_name" in r for r in results)
+
+    def test_prepared_search_matches_orm(self, vector_store, sample_document, sample_chunks, embedder):
+        """Test prepared-statement search returns the same results as the ORM query"""
+        query_vector = embedder.embed("vacation and time off")
+
+        prepared = vector_store.search(query_vector, top_k=3)
+        prepared_again = vector_store.search(query_vector, top_k=3)  # reuses the PREPAREd statement
+
+        vector_store.use_prepared_statements = False
+        try:
+            orm = vector_store.search(query_vector, top_k=3)
+            orm_document = vector_store.get_document(sample_document)
+        finally:
+            vector_store.use_prepared_statements = True
+
+        assert [r["id"] for r in prepared] == [r["id"] for r in orm]
+        assert [r["id"] for r in prepared_again] == [r["id"] for r in orm]
+        assert vector_store.get_document(sample_document) == orm_document
+
+    def test_memory_index_matches_search(self, vector_store, sample_document, sample_chunks, embedder):
+        """Test exact search over the in-memory mirror returns the same chunks as pgvector"""
+        from src.vector_store.memory_index import MemoryVectorIndex
+
+        index = MemoryVectorIndex(384)
+        index.add(*vector_store.get_chunk_vectors([sample_document]))
+        assert len(index) == len(sample_chunks)
+
+        query_vector = embedder.embed("vacation and time off")
+        expected = vector_store.search(query_vector, top_k=3, filters={'document_id': sample_document})
+        results = vector_store.get_search_results(index.search(query_vector, top_k=3, document_id=sample_document))
+
+        assert [r["id"] for r in results] == [r["id"] for r in expected]
+        assert results[0]["distance"] == pytest.approx(expected[0]["distance"], abs=1e-5)
+        assert results[0]["document_name"] == expected[0]["document_name"]
+
+        assert index.remove_document(sample_document) == len(sample_chunks)
+        assert index.search(query_vector, top_k=3) == []
+
+    def test_prepare_search_statements(self, vector_store, sample_document, sample_chunks, embedder):
+        """Test search statements prepared at startup are reused by search()"""
+        vector_store.prepare_search_statements(connections=2)
+
+        with vector_store.engine.connect() as conn:
+            names = {row[0] for row in conn.exec_driver_sql("SELECT name FROM pg_prepared_statements")}
+        assert any(name.startswith("pgvs_search_") and name.endswith("_document") for name in names)
+
+        query_vector = embedder.embed("vacation and time off")
+        assert len(vector_store.search(query_vector, top_k=3)) > 0
+        assert len(vector_store.search(query_vector, top_k=3, filters={'document_id': sample_document})) > 0
+
+    def test_search_rescored_matches_search(self, vector_store, sample_document, sample_chunks, embedder):
+        """Test two-stage search over the binary index reorders by exact distance"""
+        vector_store.rebuild_binary_index()
+        query_vector = embedder.embed("vacation and time off")
+
+        # Oversampling past the chunk count makes the candidate set complete
+        rescored = vector_store.search_rescored(query_vector, top_k=2, oversample=10)
+        exact = vector_store.search(query_vector, top_k=2)
+
+        assert [r["id"] for r in rescored] == [r["id"] for r in exact]
+        assert rescored[0]["similarity"] == pytest.approx(exact[0]["similarity"])
+
+        filtered = vector_store.search_rescored(
+            query_vector, top_k=10, filters={"document_id": sample_document}
+        )
+        assert all(r["document_id"] == sample_document for r in filtered)
+
+    def test_inner_product_matches_cosine(self, vector_store, sample_document, sample_chunks, embedder):
+        """Test inner-product search ranks and scores normalized embeddings like cosine"""
+        ip_store = PgVectorStore(embedding_dim=384, engine=vector_store.engine, distance="inner_product")
+        query_vector = embedder.embed("vacation and time off")
+
+        cosine = vector_store.search(query_vector, top_k=3)
+        for use_prepared in (True, False):
+            ip_store.use_prepared_statements = use_prepared
+            inner_product = ip_store.search(query_vector, top_k=3)
+
+            assert [r["id"] for r in inner_product] == [r["id"] for r in cosine]
+            assert inner_product[0]["similarity"] == pytest.approx(cosine[0]["similarity"], abs=1e-5)
+
+        [batch] = ip_store.search_batch([query_vector], top_k=3)
+        assert [r["id"] for r in batch] == [r["id"] for r in cosine]
 
     def test_search_top_k_limit(self, vector_store, sample_document, sample_chunks, embedder):
         """Test that top_k parameter limits results"""